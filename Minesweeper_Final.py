@@ -6,234 +6,33 @@ Created on Mon Jan  9 10:03:44 2023
 """
 
 
-import random
+import argparse
 import sys
-from functools import partial
 
-from PyQt5 import QtWidgets, uic
+from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
-
-
-
-
-
-"""
-
-Data-class for a field in the minefield. Holds essential data for the field.
-
-"""
-class Field:
-    def __init__(self, i, j, is_mine = False, is_flagged = False, is_open = False):
-        self.is_mine = is_mine
-        self.is_flagged = is_flagged
-        self.is_open = is_open              # if the player has opened this field
-        
-        self.neighbors = []                 # list of neighbors of the field, including fields with mines
-        self.num_neighbouring_mines = 0     # number of neighbors with mines
-        
-        self.coordinates = (i, j)
-
-
-
+from boardgenerator import BoardGenerator
+from boardview import BoardView
+from gameclock import GameClock
+import instrumentation
+from gamefield import ArrayGamefield, EVENT_FIELDS_OPENED, EVENT_GAME_WON, EVENT_MINE_HIT, EVENT_RESET, FIRST_CLICK_NO_GUESS, FIRST_CLICK_SAFE_AREA, \
+                      MOVE_OPEN
+from movelog import MoveLog, apply_move
+from noguess import NoGuessPool
+from performanceoverlay import PerformanceOverlay
+from pixmapcache import PixmapCache
+import savegame
+from ui_gamefieldsizedialog import Ui_Dialog
+from ui_mainwindow import Ui_MainWindow
 
 
 
 
 
 
-"""
-
-Class for a minefield. Holds and alters the game state. Does not handle the GUI.
-
-"""
-class Gamefield:
-    def __init__(self, width = 10, height = 10, num_mines = 10):
-        self._field = [[]]              # 2-dimensional array with fields (instances of Field-class) in it
-        self._num_mines = num_mines     # number of mines in the minefield
-        self._num_flagged_fields = 0
-        self._num_correct_flags = 0
-        self._num_opened_fields = 0
-        
-        self._height = height
-        self._width = width
-        
-        self.reset()
-        
-    # recursively opens all neighbors with zero mines and also adjacent fields to fields with zero mines
-    def _rec_open_free_fields(self, field):
-        if not field.is_open:
-            self._num_opened_fields += 1
-        field.is_open = True
-        
-        for neighbor in field.neighbors:
-            if neighbor.num_neighbouring_mines > 0:
-                if not neighbor.is_open:
-                    self._num_opened_fields += 1
-                neighbor.is_open = True
-            elif not neighbor.is_open:
-                self._rec_open_free_fields(neighbor)
-        
-    # opens a field. Returns False if field was a mine. Also, if the field has zero mines, opens
-    # all neighbors of the field with zero mines and also adjacent fields to fields with zero mines
-    def open_field(self, i, j):
-        field = self._field[i][j]
-        
-        if field.is_mine:
-            return False
-        
-        if not field.is_open:
-            self._num_opened_fields += 1
-        field.is_open = True
-        
-        # recursively open all fields with zero mines
-        if field.num_neighbouring_mines == 0:
-            self._rec_open_free_fields(field)
-        
-        return True
-    
-    def set_flag(self, i, j):
-        if not self._field[i][j].is_flagged:
-            self._num_flagged_fields += 1
-            if self._field[i][j].is_mine:
-                self._num_correct_flags += 1
-            
-        self._field[i][j].is_flagged = True
-        
-    def remove_flag(self, i, j):
-        if self._field[i][j].is_flagged:
-            self._num_flagged_fields -= 1
-            if self._field[i][j].is_mine:
-                self._num_correct_flags -= 1
-            
-        self._field[i][j].is_flagged = False
-        
-    def is_flagged(self, i, j):
-        return self._field[i][j].is_flagged
-    
-    def is_open(self, i, j):
-        return self._field[i][j].is_open
-    
-    def is_mine(self, i, j):
-        return self._field[i][j].is_mine
-    
-    def get_num_neighbouring_mines(self, i, j):
-        return self._field[i][j].num_neighbouring_mines
-    
-    def get_num_flagged_fields(self):
-        return self._num_flagged_fields
-    
-    def get_num_correct_flags(self):
-        return self._num_correct_flags
-    
-    def get_num_opened_fields(self):
-        return self._num_opened_fields
-    
-    def get_field(self, i, j):
-        return self._field[i][j]
-    
-    def is_game_won(self):
-        return self._num_correct_flags + self._num_opened_fields == self._width * self._height
-
-    # closes all fields, removes mines, redistributes mines randomly
-    def reset(self):
-        self._num_flagged_fields = 0
-        self._num_correct_flags = 0
-        self._num_opened_fields = 0
-        
-        self._field = [[Field(i, j) for j in range(self._width)] for i in range(self._height)]
-        
-        # distribute random mines. Make an array of all possible fields in the minefield,
-        # then get one after another field from this array and place a mine there
-        all_possible_fields = [(i,j) for j in range(self._width) for i in range(self._height)]
-        for n in range(self._num_mines):
-            rand_index = random.randint(0, len(all_possible_fields)-1)
-            
-            i = all_possible_fields[rand_index][0]
-            j = all_possible_fields[rand_index][1]
-            
-            self._field[i][j].is_mine = True
-            del all_possible_fields[rand_index]
-            
-        # get neighbors of each field and number of neighbouring mines
-        for i in range(self._height):
-            for j in range(self._width):
-                neighbors = []
-                if i < self._height - 1:
-                    neighbors.append(self._field[i+1][j])
-                if i > 0:
-                    neighbors.append(self._field[i-1][j])
-                if j < self._width - 1:
-                    neighbors.append(self._field[i][j+1])
-                if j > 0:
-                    neighbors.append(self._field[i][j-1])
-                if i < self._height - 1 and j < self._width - 1:
-                    neighbors.append(self._field[i+1][j+1])
-                if i > 0 and j < self._width - 1:
-                    neighbors.append(self._field[i-1][j+1])
-                if i > 0 and j > 0:
-                    neighbors.append(self._field[i-1][j-1])
-                if i < self._height - 1 and j > 0:
-                    neighbors.append(self._field[i+1][j-1])
-                    
-                self._field[i][j].neighbors = neighbors
-                
-                # count neighbouring mines
-                num_neighbouring_mines = 0
-                for neighbor in self._field[i][j].neighbors:
-                    if neighbor.is_mine:
-                        num_neighbouring_mines += 1
-                        
-                self._field[i][j].num_neighbouring_mines = num_neighbouring_mines
-                    
-    @property
-    def num_mines(self):
-        return self._num_mines
-    
-    @num_mines.setter
-    def num_mines(self, a):
-        if type(a) != int:
-            raise TypeError("The number of mines must be an integer.")
-        if a >= self._height * self._width:
-            raise ValueError("There cannot be more mines than fields.")
-            
-        self._num_mines = a
-        self.reset()
-        
-    @property
-    def height(self):
-        return self._height
-    
-    @height.setter
-    def height(self, a):
-        if type(a) != int:
-            raise TypeError("The height and width of the minefield must be an integer.")
-            
-        self._height = a
-        self.reset()
-        
-    @property
-    def width(self):
-        return self._width
-    
-    @width.setter
-    def width(self, a):
-        if type(a) != int:
-            raise TypeError("The height and width of the minefield must be an integer.")
-            
-        self._width = a
-        self.reset()
-        
-        
-        
-    
-        
-    
-    
-    
-        
 """
 
 Class for constants
@@ -262,36 +61,37 @@ class CONSTANTS:
     IMG_SMILEY_TENSE_PATH = "img/smiley_tense.png"
     IMG_SMILEY_SUNGLASSES_PATH = "img/smiley_sunglasses.png"
     
+    SAVEGAME_FILTER = "Minesweeper-Spielstand (*.msw)"
+    MOVE_LOG_FILTER = "Minesweeper-Aufzeichnung (*.log)"
     
+    # the first click of a new game is always safe and opens at least the 3x3 area around it
+    FIRST_CLICK = FIRST_CLICK_SAFE_AREA
     
+    # size of the minefield at startup
+    INITIAL_WIDTH = 20
+    INITIAL_HEIGHT = 20
+    INITIAL_NUM_MINES = 50
     
+    # minefields with at least this number of fields are generated on a worker thread, see BoardGenerator
+    ASYNC_MIN_FIELDS = 250000
     
+    # seconds a new game without guessing waits for its minefield if the NoGuessPool has none, and
+    # milliseconds between two looks into the pool
+    NO_GUESS_TIME_BUDGET = 10.0
+    NO_GUESS_POLL_INTERVAL = 50
     
+    # factor by which replays in the GUI are faster than the recorded game
+    REPLAY_SPEED = 1.0
     
+    # largest size of the visible part of the minefield, larger minefields can be scrolled
+    MAX_BOARD_VIEW_WIDTH = 780
+    MAX_BOARD_VIEW_HEIGHT = 780
+    
+    # all images of the minefield and the smiley, e.g. to preload them
+    IMG_PATHS = [IMG_CLOSED_PATH, IMG_MINE_PATH, IMG_MINE_RED_PATH, IMG_FLAG_PATH] + IMG_NUM_MINES + \
+                [IMG_SMILEY_HAPPY_PATH, IMG_SMILEY_DEAD_PATH, IMG_SMILEY_TENSE_PATH, IMG_SMILEY_SUNGLASSES_PATH]
     
     
-"""
-
-Class for a clickable QLabel. Used for fields in the minefield with an image on it.
-
-"""
-class QLabel_clickable(QLabel):
-    clicked = pyqtSignal()
-    rightClicked = pyqtSignal()
-    mouseReleased = pyqtSignal()
-    mouseDown = pyqtSignal()
-    
-    def mousePressEvent(self, ev):
-        self.mouseDown.emit()
-        
-        if ev.button() == Qt.LeftButton:
-            self.clicked.emit()
-        elif ev.button() == Qt.RightButton:
-            self.rightClicked.emit()
-            
-    def mouseReleaseEvent(self, ev):
-        self.mouseReleased.emit()
-        
     
     
     
@@ -301,14 +101,16 @@ class QLabel_clickable(QLabel):
     
 """
 
-Gamefield-size dialog
+Gamefield-size dialog. The widgets are built by Ui_Dialog, which pyuic5 generates from
+GamefieldsizeDialog.ui. The dialog is created once and shows the size of the current minefield
+whenever it is opened
 
 """
-class GamefieldsizeDialog(QtWidgets.QDialog):
+class GamefieldsizeDialog(QtWidgets.QDialog, Ui_Dialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        self.ui = uic.loadUi("GamefieldsizeDialog.ui", self)
+        self.setupUi(self)
     
         self.cancelButton.clicked.connect(self.close)
         self.applyButton.clicked.connect(self._on_applyButton_clicked)
@@ -317,10 +119,13 @@ class GamefieldsizeDialog(QtWidgets.QDialog):
         
         self.minesSpinBox.setMaximum(self.widthSpinBox.value() * self.heightSpinBox.value() - 1)
         
-        self.widthSpinBox.setValue(parent._gamefield.width)
-        self.heightSpinBox.setValue(parent._gamefield.height)
-        self.minesSpinBox.setValue(parent._gamefield.num_mines)
+    def showEvent(self, ev):
+        super().showEvent(ev)
         
+        gamefield = self.parent()._gamefield
+        self.widthSpinBox.setValue(gamefield.width)
+        self.heightSpinBox.setValue(gamefield.height)
+        self.minesSpinBox.setValue(gamefield.num_mines)
         
     def _on_widthSpinBox_valueChanged(self, val):
         self.minesSpinBox.setMaximum(self.widthSpinBox.value() * self.heightSpinBox.value() - 1)
@@ -329,12 +134,7 @@ class GamefieldsizeDialog(QtWidgets.QDialog):
         self.minesSpinBox.setMaximum(self.widthSpinBox.value() * self.heightSpinBox.value() - 1)
         
     def _on_applyButton_clicked(self):
-        self.parent()._gamefield._width = self.widthSpinBox.value()
-        self.parent()._gamefield._height = self.heightSpinBox.value()
-        self.parent()._gamefield._num_mines = self.minesSpinBox.value()
-        self.parent()._gamefield.reset()
-        
-        self.parent().reset_gamefield()
+        self.parent().reset_gamefield(self.widthSpinBox.value(), self.heightSpinBox.value(), self.minesSpinBox.value())
         self.close()
 
 
@@ -344,87 +144,270 @@ class GamefieldsizeDialog(QtWidgets.QDialog):
 
 
     
+"""
+
+Event filter which loads all images of the minefield and the smiley into the PixmapCache once the widget
+it is installed on has been painted for the first time, so the first paint does not wait for them and
+no image is read from disk during a game, e.g. the dead smiley when a mine is hit. The digits of the
+counters are loaded with the first counter, see Counter
+
+"""
+class _PreloadAfterFirstPaint(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, lambda: PixmapCache.preload(CONSTANTS.IMG_PATHS))
+        return False
+    
 """
 
 Main-GUI-class
 
 """
-class GameDialog(QtWidgets.QMainWindow):
+class GameDialog(QtWidgets.QMainWindow, Ui_MainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        self._gamefield = Gamefield()
-        self._minefield_labels= [[]]    # 2-dimensional array for the GUI-elements of the fields in the minefield
+        # the first minefield is built once with its whole size, the game starts on it at the end
+        self._gamefield = ArrayGamefield(CONSTANTS.INITIAL_WIDTH, CONSTANTS.INITIAL_HEIGHT, CONSTANTS.INITIAL_NUM_MINES,
+                                         first_click = CONSTANTS.FIRST_CLICK)
         self._is_game_over = False
         self._is_game_started = False   # if the player has yet clicked on a field
-
-        self.ui = uic.loadUi("MainWindow.ui", self)
+        self._move_log = None           # MoveLog of the current game, None for loaded games
+        self._replay_log = None         # MoveLog which is being replayed
+        self._replay_index = 0          # index of the next move of _replay_log
+        self._game_clock = GameClock()  # elapsed time of the game, shown on the right counter
+        self._paused_by_minimize = False    # if the clock has been paused since the window is minimized
+        self._gamefieldsize_dialog = None   # created when it is first opened
+        
+        self._replay_timer = QTimer(self)
+        self._replay_timer.setSingleShot(True)
+        self._replay_timer.timeout.connect(self._on_replay_timer_timeout)
+        
+        # widgets generated by pyuic5 from MainWindow.ui, so the .ui-file is not parsed at startup
+        self.setupUi(self)
         
         self.smileyButton.clicked.connect(self._on_smiley_button_clicked)
         self.actionClose.triggered.connect(self._on_actionClose_clicked)
         self.actionGamefieldsize.triggered.connect(self._on_actionGamefieldsize_clicked)
-        
-        self._gamefield.num_mines = 50
-        self._gamefield.width = 20
-        self._gamefield.height = 20
-        self.reset_gamefield()
-        self.update_gamefield()
+        self.actionSave.triggered.connect(self._on_actionSave_clicked)
+        self.actionLoad.triggered.connect(self._on_actionLoad_clicked)
+        self.actionSaveMoves.triggered.connect(self._on_actionSaveMoves_clicked)
+        self.actionReplay.triggered.connect(self._on_actionReplay_clicked)
+        self.actionNoGuess.toggled.connect(self._on_actionNoGuess_toggled)
+        
+        # one widget paints the whole minefield, inside a scroll area for large minefields
+        self._board_view = BoardView()
+        self._board_view.set_tile_images([CONSTANTS.IMG_CLOSED_PATH, CONSTANTS.IMG_FLAG_PATH, CONSTANTS.IMG_MINE_PATH, CONSTANTS.IMG_MINE_RED_PATH] + CONSTANTS.IMG_NUM_MINES,
+                                          CONSTANTS.MINEFIELD_IMG_WIDTH, CONSTANTS.MINEFIELD_IMG_HEIGHT)
+        self._board_view.clicked.connect(self._on_field_left_clicked)
+        self._board_view.rightClicked.connect(self._on_field_right_clicked)
+        self._board_view.chorded.connect(self._on_field_chorded)
+        self._board_view.mouseReleased.connect(self._on_field_mouse_released)
+        self._board_view.mouseDown.connect(self._on_field_mouse_down)
+        self._board_view.installEventFilter(_PreloadAfterFirstPaint(self))
+        
+        self._board_scroll_area = QScrollArea(self)
+        self._board_scroll_area.setFrameShape(QFrame.NoFrame)
+        self._board_scroll_area.setWidget(self._board_view)
+        self.layout_minefield.addWidget(self._board_scroll_area, 0, 0)
+        
+        # large minefields are generated on a worker thread, with their progress in the status bar
+        self._board_generator = BoardGenerator(self)
+        self._board_generator.progress.connect(self._on_board_generator_progress)
+        self._board_generator.busyChanged.connect(self._on_board_generator_busy_changed)
+        
+        self._progress_bar = QProgressBar()
+        self._progress_bar.setFormat("Minenfeld wird erzeugt ...")
+        self._cancel_button = QPushButton("Abbrechen")
+        self._cancel_button.clicked.connect(self._on_cancel_button_clicked)
+        self.statusBar().addWidget(self._progress_bar, 1)
+        self.statusBar().addPermanentWidget(self._cancel_button)
+        self.statusBar().hide()
+        
+        # minefields which can be solved without guessing are generated in advance by worker processes.
+        # If there is none for a new game, the timer looks into the pool until there is one
+        self._no_guess_pool = NoGuessPool()
+        QCoreApplication.instance().aboutToQuit.connect(self._no_guess_pool.close)
+        self._no_guess_config = None    # (width, height, num_mines) of the minefield waited for
+        self._no_guess_elapsed = QElapsedTimer()
+        self._no_guess_timer = QTimer(self)
+        self._no_guess_timer.setInterval(CONSTANTS.NO_GUESS_POLL_INTERVAL)
+        self._no_guess_timer.timeout.connect(self._on_no_guess_timer_timeout)
+        
+        # the GUI follows the changes of the minefield through its events
+        self._gamefield.subscribe(self._on_gamefield_changed)
+        
+        self._start_game(self._gamefield)
         
     def _on_actionGamefieldsize_clicked(self):
-        dialog = GamefieldsizeDialog(self)
-        dialog.show()
+        if self._gamefieldsize_dialog is None:
+            self._gamefieldsize_dialog = GamefieldsizeDialog(self)
+        self._gamefieldsize_dialog.show()
         
     def _on_actionClose_clicked(self):
         self.close()
-
+        
+    def _on_actionSave_clicked(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Spiel speichern", "", CONSTANTS.SAVEGAME_FILTER)
+        if not path:
+            return
+        
+        try:
+            savegame.save(path, self._gamefield, self._game_clock.elapsed())
+        except OSError as e:
+            QMessageBox.warning(self, "Spiel speichern", str(e))
+            
+    def _on_actionLoad_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Spiel laden", "", CONSTANTS.SAVEGAME_FILTER)
+        if not path:
+            return
+        
+        # load into a new minefield, so that the current game stays if the file is broken
+        try:
+            gamefield, elapsed_time = savegame.load(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Spiel laden", str(e))
+            return
+        
+        self._cancel_generation()
+        self._set_gamefield(gamefield)
+        self._move_log = None
+        self._show_gamefield(elapsed_time)
+        
+    def _on_actionSaveMoves_clicked(self):
+        if self._move_log is None:
+            QMessageBox.information(self, "Aufzeichnung speichern", "Für geladene Spiele gibt es keine Aufzeichnung.")
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(self, "Aufzeichnung speichern", "", CONSTANTS.MOVE_LOG_FILTER)
+        if not path:
+            return
+        
+        try:
+            self._move_log.write(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Aufzeichnung speichern", str(e))
+            
+    def _on_actionReplay_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Aufzeichnung abspielen", "", CONSTANTS.MOVE_LOG_FILTER)
+        if not path:
+            return
+        
+        try:
+            log = MoveLog.read(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Aufzeichnung abspielen", str(e))
+            return
+        
+        self.replay(log)
+        
+    # replays the moves of the MoveLog log on a new minefield at the pace they have been recorded,
+    # sped up by CONSTANTS.REPLAY_SPEED. Clicks on the minefield are ignored during the replay
+    def replay(self, log):
+        self._cancel_generation()
+        self._set_gamefield(ArrayGamefield(log.width, log.height, log.num_mines, seed = log.seed, first_click = log.first_click))
+        self._move_log = log
+        self._show_gamefield()
+        
+        self._replay_log = log
+        self._replay_index = 0
+        if log.moves:
+            self._replay_timer.start(0)
+            
+    # applies the next move of the replay and schedules the one after it
+    def _on_replay_timer_timeout(self):
+        moves = self._replay_log.moves
+        move = moves[self._replay_index]
+        self._replay_index += 1
+        
+        if not self._is_game_started:
+            self._is_game_started = True
+            self._start_clock()
+            
+        apply_move(self._gamefield, move)
+        
+        if self._replay_index < len(moves) and not self._is_game_over:
+            delay = (moves[self._replay_index][0] - move[0]) / CONSTANTS.REPLAY_SPEED
+            self._replay_timer.start(int(1000 * delay))
+    
     def _on_smiley_button_clicked(self, e):
         self.reset_gamefield()
+        
+    def _on_actionNoGuess_toggled(self, checked):
+        self.reset_gamefield()
     
     # called when the player has clicked on a mine with indices mine_indices.
     # Opens all fields and shows all mines.
     def _gameover_open_all_fields(self, mine_indices):
         self._is_game_over = True
-        self.rightCounter.stop()
-        self.smileyButton.setIcon(QIcon(QPixmap(CONSTANTS.IMG_SMILEY_DEAD_PATH)))
+        self._stop_clock()
+        self.smileyButton.setIcon(PixmapCache.get_icon(CONSTANTS.IMG_SMILEY_DEAD_PATH))
         
-        # open all fields
-        for i in range(0, self._gamefield.height):
-            for j in range(0, self._gamefield.width):
-                current_label = self._minefield_labels[i][j]
-                
-                if self._gamefield.is_mine(i, j):
-                    current_label.setPixmap(QPixmap(CONSTANTS.IMG_MINE_PATH))
-                else:
-                    current_label.setPixmap(QPixmap(CONSTANTS.IMG_NUM_MINES[self._gamefield.get_num_neighbouring_mines(i, j)]))
-                    
-        # make the mine the played clicked on red
-        self._minefield_labels[mine_indices[0]][mine_indices[1]].setPixmap(QPixmap(CONSTANTS.IMG_MINE_RED_PATH))
+        # open all fields and make the mine the player clicked on red
+        self._board_view.reveal(mine_indices)
                 
-    # called when a field has been LEFT clicked to open it
-    def _on_field_left_clicked(self, indices):
+    # called when the field (i, j) has been LEFT clicked to open it
+    def _on_field_left_clicked(self, i, j):
+        if self._replay_timer.isActive() or self._is_generating():
+            return
+        
         if not self._is_game_started:
             self._is_game_started = True
-            self.rightCounter.start()
+            self._start_clock()
         
         if self._is_game_over:
             return
         
         # do not open flagged fields
-        if self._gamefield.is_flagged(indices[0], indices[1]):
+        if self._gamefield.is_flagged(i, j):
             return
         
-        # open field and check if the player clicked on a mine
-        if not self._gamefield.open_field(indices[0], indices[1]):
-            self._gameover_open_all_fields(indices)
-        else:
-            self.update_gamefield()
-            
-    # called when a field has been RIGHT clicked to flag it
-    def _on_field_right_clicked(self, indices):
-        if self._is_game_over:
+        # placing the mines of a large minefield at the first click takes a while
+        if not self._gamefield.are_mines_placed() and self._gamefield.width * self._gamefield.height >= CONSTANTS.ASYNC_MIN_FIELDS:
+            self._open_first_field(i, j)
             return
         
-        i, j = indices[0], indices[1]
+        # the redraw, or the game over if it is a mine, follows from the events of the minefield
+        self._gamefield.open_field(i, j)
+        
+    # opens the field (i, j) as the first field of the minefield on a worker thread: a copy of the
+    # minefield, with the flags set so far, places the mines, opens the field and then replaces the
+    # minefield. Clicks are ignored in the meantime
+    def _open_first_field(self, i, j):
+        snapshot = self._gamefield.snapshot()
+        first_click = self._gamefield.first_click
+        
+        def restore(_, progress):
+            gamefield = ArrayGamefield(1, 1, 0, first_click = first_click)
+            gamefield.restore(snapshot)
+            return gamefield
+        
+        # the mines are placed by the first open_field, which reports its progress
+        def open_field(gamefield, progress):
+            gamefield.set_progress(progress)
+            gamefield.open_field(i, j)
+            return gamefield
+        
+        self._board_generator.start([restore, open_field], lambda gamefield: self._on_first_field_opened(gamefield, i, j))
+        
+    # takes over the minefield on which _open_first_field has opened the field (i, j)
+    def _on_first_field_opened(self, gamefield, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_OPEN, i, j)
+            gamefield.set_move_log(self._move_log)
+        self._set_gamefield(gamefield)
+        self._board_view.set_gamefield(gamefield)
+        
+        if gamefield.is_mine(i, j):
+            self._gameover_open_all_fields((i, j))
+        elif gamefield.is_game_won():
+            self._show_game_won()
+            
+    # called when the field (i, j) has been RIGHT clicked to flag it
+    def _on_field_right_clicked(self, i, j):
+        if self._is_game_over or self._replay_timer.isActive() or self._is_generating():
+            return
         
         if self._gamefield.get_num_flagged_fields() == self._gamefield.num_mines and not self._gamefield.is_flagged(i, j):
             return
@@ -433,79 +416,230 @@ class GameDialog(QtWidgets.QMainWindow):
             self._gamefield.remove_flag(i, j)
         elif not self._gamefield.is_open(i, j):
             self._gamefield.set_flag(i, j)
-            
-        self.update_gamefield()
+        
+    # called when the field (i, j) has been double or middle clicked to open all neighbors that are not
+    # flagged at once
+    def _on_field_chorded(self, i, j):
+        if self._is_game_over or self._replay_timer.isActive() or self._is_generating():
+            return
+        
+        self._gamefield.chord_field(i, j)
         
     def _on_field_mouse_released(self):
         if not self._is_game_over:
-            self.smileyButton.setIcon(QIcon(QPixmap(CONSTANTS.IMG_SMILEY_HAPPY_PATH)))
+            self.smileyButton.setIcon(PixmapCache.get_icon(CONSTANTS.IMG_SMILEY_HAPPY_PATH))
         
     def _on_field_mouse_down(self):
         if not self._is_game_over:
-            self.smileyButton.setIcon(QIcon(QPixmap(CONSTANTS.IMG_SMILEY_TENSE_PATH)))
-        
-    # closes all fields in the minefield, redistributes mines, resets counters etc.
-    def reset_gamefield(self):
-        self._gamefield.reset()
+            self.smileyButton.setIcon(PixmapCache.get_icon(CONSTANTS.IMG_SMILEY_TENSE_PATH))
+        
+    # starts a new game on a minefield of the given size, by default the size of the current one.
+    # Smaller minefields are changed in place with Gamefield.configure, so the board view and the
+    # subscription stay and the cells of the minefield are reused as far as they reach. Minefields with at least
+    # CONSTANTS.ASYNC_MIN_FIELDS fields are generated on a worker thread, or taken from the one
+    # generated in advance after the last game of the same size; the current game stays until the new
+    # minefield is ready
+    def reset_gamefield(self, width = None, height = None, num_mines = None):
+        self._cancel_generation()
+        width = self._gamefield.width if width is None else width
+        height = self._gamefield.height if height is None else height
+        num_mines = self._gamefield.num_mines if num_mines is None else num_mines
+        
+        if self.actionNoGuess.isChecked():
+            self._reset_no_guess_gamefield(width, height, num_mines)
+            return
         
-        self._is_game_over = False
-        self._is_game_started = False
+        gamefield = self._board_generator.take_pregenerated(width, height, num_mines, CONSTANTS.FIRST_CLICK)
+        if gamefield is not None:
+            self._start_game(gamefield)
+        elif width * height < CONSTANTS.ASYNC_MIN_FIELDS:
+            # the reset event of the minefield shows it again
+            self._gamefield.first_click = CONSTANTS.FIRST_CLICK
+            self._gamefield.configure(width, height, num_mines)
+            self._move_log = MoveLog.record(self._gamefield)
+        else:
+            self._board_generator.start([lambda _, progress: ArrayGamefield(width, height, num_mines, first_click = CONSTANTS.FIRST_CLICK,
+                                                                            progress = progress)],
+                                        self._start_game)
+            
+    # starts a new game on a minefield of the given size which can be solved without guessing. Its seed
+    # is taken from the NoGuessPool, which is refilled in the background by worker processes; if the
+    # pool has none yet, the timer waits for one for at most CONSTANTS.NO_GUESS_TIME_BUDGET seconds
+    def _reset_no_guess_gamefield(self, width, height, num_mines):
+        self._no_guess_pool.fill(width, height, num_mines)
+        seed = self._no_guess_pool.take(width, height, num_mines)
+        if seed is not None:
+            self._start_game(ArrayGamefield(width, height, num_mines, seed, FIRST_CLICK_NO_GUESS))
+            return
         
-        self.smileyButton.setIcon(QIcon(QPixmap(CONSTANTS.IMG_SMILEY_HAPPY_PATH)))
+        self._no_guess_config = (width, height, num_mines)
+        self._no_guess_elapsed.start()
+        self._no_guess_timer.start()
+        self._update_status_bar()
+        
+    # starts the game as soon as the pool has a minefield, the current game stays if there is none in
+    # time. The searches of the workers which have used up their time budget are started again
+    def _on_no_guess_timer_timeout(self):
+        width, height, num_mines = self._no_guess_config
+        seed = self._no_guess_pool.take(width, height, num_mines)
+        if seed is not None:
+            self._stop_no_guess_timer()
+            self._start_game(ArrayGamefield(width, height, num_mines, seed, FIRST_CLICK_NO_GUESS))
+        elif self._no_guess_elapsed.elapsed() >= 1000 * CONSTANTS.NO_GUESS_TIME_BUDGET:
+            self._stop_no_guess_timer()
+            QMessageBox.information(self, "Ohne Raten", "In %g Sekunden wurde kein Minenfeld gefunden, das ohne Raten lösbar ist. "
+                                    "Vermutlich hat es zu viele Minen." % CONSTANTS.NO_GUESS_TIME_BUDGET)
+        else:
+            self._no_guess_pool.fill(width, height, num_mines)
+            
+    def _stop_no_guess_timer(self):
+        self._no_guess_timer.stop()
+        self._no_guess_config = None
+        self._update_status_bar()
+        
+    # if a minefield is being generated or waited for, clicks on the minefield are ignored meanwhile
+    def _is_generating(self):
+        return self._board_generator.is_busy() or self._no_guess_timer.isActive()
+    
+    # drops the minefield being generated or waited for
+    def _cancel_generation(self):
+        self._board_generator.cancel()
+        if self._no_guess_timer.isActive():
+            self._stop_no_guess_timer()
+            
+    # shows the new minefield gamefield and records its moves. A minefield which can be solved without
+    # guessing starts with its start field opened. For large minefields, the minefield of the next game
+    # is generated in advance
+    def _start_game(self, gamefield):
+        self._set_gamefield(gamefield)
+        self._move_log = MoveLog.record(gamefield)
+        self._show_gamefield()
+        
+        if gamefield.get_start_field() is not None:
+            gamefield.open_field(*gamefield.get_start_field())
+        elif gamefield.width * gamefield.height >= CONSTANTS.ASYNC_MIN_FIELDS:
+            self._board_generator.pregenerate(gamefield.width, gamefield.height, gamefield.num_mines, CONSTANTS.FIRST_CLICK)
+            
+    def _on_board_generator_progress(self, value, maximum):
+        self._progress_bar.setRange(0, maximum)
+        self._progress_bar.setValue(value)
+        
+    def _on_board_generator_busy_changed(self, is_busy):
+        self._update_status_bar()
+        
+    # shows the progress bar and the cancel button while a minefield is generated or waited for. How
+    # long the wait for a minefield without guessing takes is unknown, so the bar only shows that
+    # something is going on then
+    def _update_status_bar(self):
+        if self._no_guess_timer.isActive():
+            self._progress_bar.setRange(0, 0)
+        self.statusBar().setVisible(self._is_generating())
+        self.setFixedSize(self.sizeHint())
+        
+    # drops the minefield being generated or waited for. A first click that has not been finished is undone
+    def _on_cancel_button_clicked(self):
+        self._cancel_generation()
+        if not self._gamefield.are_mines_placed():
+            self._is_game_started = False
+            self._stop_clock()
+            self._game_clock.reset()
+            self.rightCounter.number = 0
+            
+    
+    # replaces the minefield by gamefield, e.g. a loaded one, and follows its events instead
+    def _set_gamefield(self, gamefield):
+        self._gamefield.unsubscribe(self._on_gamefield_changed)
+        self._gamefield = gamefield
+        self._gamefield.subscribe(self._on_gamefield_changed)
+        
+    # called by the minefield with an event and the coordinates of the fields it concerns (see
+    # Gamefield.subscribe). Only these fields are redrawn
+    def _on_gamefield_changed(self, event, fields):
+        if event == EVENT_RESET:
+            self._show_gamefield()
+        elif event == EVENT_MINE_HIT:
+            self._gameover_open_all_fields(fields[0])
+        elif event == EVENT_GAME_WON:
+            self._show_game_won()
+        else:
+            self._board_view.update_fields(fields)
+            if event != EVENT_FIELDS_OPENED:
+                self.leftCounter.number = self._gamefield.num_mines - self._gamefield.get_num_flagged_fields()
+                
+    # starts or resumes the clock of the game and shows it on the right counter
+    def _start_clock(self):
+        self._game_clock.resume()
+        self.rightCounter.start(self._game_clock)
         
+    def _stop_clock(self):
+        self._game_clock.pause()
         self.rightCounter.stop()
-        self.rightCounter.number = 0
         
-        window_width = CONSTANTS.MINEFIELD_IMG_WIDTH * self._gamefield.width
-        window_height = CONSTANTS.MINEFIELD_IMG_HEIGHT * self._gamefield.height + 40
-        self.setMinimumSize(window_width, window_height)
-        self.setMaximumSize(window_width, window_height)
+    # elapsed time of the current game in seconds, measured with a monotonic clock
+    def get_elapsed_time(self):
+        return self._game_clock.elapsed()
         
-        for i in range(0, self.layout_minefield.rowCount()):
-            for j in range(0, self.layout_minefield.columnCount()):
-                self.layout_minefield.removeItem(self.layout_minefield.itemAtPosition(i, j))
-
-        self._minefield_labels = [[QLabel_clickable(self) for j in range(self._gamefield.width)] for i in range(self._gamefield.height)]
+    # pauses the clock while the window is minimized
+    def changeEvent(self, ev):
+        super().changeEvent(ev)
+        if ev.type() != QEvent.WindowStateChange:
+            return
         
-        # set properties of labels/fields
-        for i in range(0, self._gamefield.height):
-            for j in range(0, self._gamefield.width):
-                current_label = self._minefield_labels[i][j]
-                
-                # pass the data which field has been clicked to the functions with "partial"
-                current_label.clicked.connect(partial(self._on_field_left_clicked, (i,j)))
-                current_label.rightClicked.connect(partial(self._on_field_right_clicked, (i,j)))
-                
-                current_label.mouseReleased.connect(self._on_field_mouse_released)
-                current_label.mouseDown.connect(self._on_field_mouse_down)
-                
-                # set default image
-                current_label.setPixmap(QPixmap(CONSTANTS.IMG_CLOSED_PATH))
-                
-                self.layout_minefield.addWidget(current_label, i, j)
+        if self.isMinimized() and self._game_clock.is_running():
+            self._stop_clock()
+            self._paused_by_minimize = True
+        elif not self.isMinimized() and self._paused_by_minimize:
+            self._paused_by_minimize = False
+            if self._is_game_started and not self._is_game_over:
+                self._start_clock()
                 
-        self.update_gamefield()
-                
-    # update minefield according to the data in the Gamefield-object
-    def update_gamefield(self):
+    def _show_game_won(self):
+        self._is_game_over = True
+        self.smileyButton.setIcon(PixmapCache.get_icon(CONSTANTS.IMG_SMILEY_SUNGLASSES_PATH))
+        self._stop_clock()
+        
+    # shows the Gamefield-object after it has been reset or loaded, with the time elapsed_time in seconds
+    # on the right counter. The time runs on from the next click
+    def _show_gamefield(self, elapsed_time = 0.0):
+        self._replay_timer.stop()
+        self._is_game_over = False
+        self._is_game_started = False
+        
+        self.smileyButton.setIcon(PixmapCache.get_icon(CONSTANTS.IMG_SMILEY_HAPPY_PATH))
+        
+        self._stop_clock()
+        self._game_clock.reset(elapsed_time)
+        self.rightCounter.number = int(elapsed_time)
+        
         self.leftCounter.number = self._gamefield.num_mines - self._gamefield.get_num_flagged_fields()
         
-        # set the right images for the labels
-        for i in range(0, self._gamefield.height):
-            for j in range(0, self._gamefield.width):
-                current_label = self._minefield_labels[i][j]
-                
-                if self._gamefield.is_flagged(i, j):
-                    current_label.setPixmap(QPixmap(CONSTANTS.IMG_FLAG_PATH))
-                elif self._gamefield.is_open(i, j):
-                    current_label.setPixmap(QPixmap(CONSTANTS.IMG_NUM_MINES[self._gamefield.get_num_neighbouring_mines(i, j)]))
-                else:
-                    current_label.setPixmap(QPixmap(CONSTANTS.IMG_CLOSED_PATH))
-                  
+        self._board_view.set_gamefield(self._gamefield)
+        self._update_window_size()
+        
         if self._gamefield.is_game_won():
-            self._is_game_over = True
-            self.smileyButton.setIcon(QIcon(QPixmap(CONSTANTS.IMG_SMILEY_SUNGLASSES_PATH)))
-            self.rightCounter.stop()
+            self._show_game_won()
+        
+    # adds an overlay with the measurements of recorder (see instrumentation.py), toggled with F12
+    def add_performance_overlay(self, recorder):
+        self._performance_overlay = PerformanceOverlay(recorder, self)
+        self._performance_overlay.move(0, self.menuBar().height())
+        QShortcut(QKeySequence(Qt.Key_F12), self, self._performance_overlay.toggle)
+        
+    # fits the window to the minefield. Minefields larger than the maximum view size get scroll bars
+    def _update_window_size(self):
+        view_width = self._board_view.width()
+        view_height = self._board_view.height()
+        scroll_bar_extent = self.style().pixelMetric(QStyle.PM_ScrollBarExtent)
+        if view_width > CONSTANTS.MAX_BOARD_VIEW_WIDTH:
+            view_width = CONSTANTS.MAX_BOARD_VIEW_WIDTH
+            view_height += scroll_bar_extent
+        if view_height > CONSTANTS.MAX_BOARD_VIEW_HEIGHT:
+            view_height = CONSTANTS.MAX_BOARD_VIEW_HEIGHT
+            view_width = min(view_width + scroll_bar_extent, CONSTANTS.MAX_BOARD_VIEW_WIDTH)
+        self._board_scroll_area.setFixedSize(view_width, view_height)
+        
+        self.setFixedSize(self.sizeHint())
+                
             
             
             
@@ -513,12 +647,59 @@ class GameDialog(QtWidgets.QMainWindow):
             
             
                   
+# instruments the minefields and the hot paths of the GUI with recorder, see instrumentation.py. The
+# cells of the GUI are the changed fields of an event, all fields when the game is lost and the tiles
+# painted per frame
+def install_instrumentation(recorder):
+    instrumentation.install_engine(recorder)
+    recorder.wrap(GameDialog, "reset_gamefield")
+    recorder.wrap(GameDialog, "_on_gamefield_changed", cells = lambda dialog, args, result: len(args[1]))
+    recorder.wrap(GameDialog, "_gameover_open_all_fields", cells = lambda dialog, args, result: dialog._gamefield.width * dialog._gamefield.height)
+    recorder.wrap(BoardView, "paintEvent", cells = lambda view, args, result: view.get_num_painted_tiles())
+    
+"""
+
+Event filter which quits the application after the first paint event of the widget it is installed on
+has been handled, to measure the time from the start of the process to the first paint
+
+"""
+class _QuitAfterFirstPaint(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, QCoreApplication.quit)
+        return False
+    
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description = "Minesweeper")
+    parser.add_argument("--profile", nargs = "?", const = "", metavar = "TRACE",
+                        help = "measure the hot paths (overlay with F12) and write them as JSON to TRACE at exit")
+    parser.add_argument("--quit-after-first-paint", action = "store_true",
+                        help = "quit as soon as the minefield has been painted, to measure the startup time (see benchmark.py)")
+    args, qt_args = parser.parse_known_args()
+    
+    # the methods have to be instrumented before the dialog connects them to its signals
+    is_profiling, trace_path = instrumentation.read_env()
+    if args.profile is not None:
+        is_profiling = True
+        trace_path = args.profile or trace_path
+    recorder = None
+    if is_profiling:
+        recorder = instrumentation.Recorder()
+        install_instrumentation(recorder)
+    
+    # the images are loaded when they are first shown or after the first paint, see _PreloadAfterFirstPaint
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
     dialog = GameDialog()
+    if recorder is not None:
+        dialog.add_performance_overlay(recorder)
+        if trace_path:
+            app.aboutToQuit.connect(lambda: recorder.dump(trace_path))
+    if args.quit_after_first_paint:
+        first_paint_filter = _QuitAfterFirstPaint(dialog)
+        dialog._board_view.installEventFilter(first_paint_filter)
     dialog.show()
     sys.exit(app.exec_())
     
-main()
-    
-    
\ No newline at end of file
+if __name__ == "__main__":
+    main()
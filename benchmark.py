@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Benchmarks for the hot paths of the game: Gamefield.reset (also with the mines placed at the first
+click), open_field-cascades, flagging and is_game_won, and optionally the GUI-cycle of
+GameDialog.reset_gamefield and a click on an offscreen Qt platform, and the cold start of the game up
+to the first paint of the minefield. Runs a matrix of minefield sizes and mine densities and writes the results as JSON, so
+that the results of two commits can be compared:
+
+    python benchmark.py --output before.json
+    (change something)
+    python benchmark.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from chunkedgamefield import ChunkedGamefield
+from gamefield import ArrayGamefield, FIRST_CLICK_SAFE_AREA, Gamefield
+
+GAMEFIELD_CLASSES = {"Gamefield": Gamefield, "ArrayGamefield": ArrayGamefield, "ChunkedGamefield": ChunkedGamefield}
+
+DEFAULT_SIZES = "30x16,100x100,500x500,2000x2000"
+DEFAULT_DENSITIES = "0.05,0.15,0.2"
+
+# Gamefield builds one object per field, larger minefields are skipped for it
+MAX_OBJECT_FIELDS = 250000
+# the GUI is only benchmarked up to this number of fields
+MAX_GUI_FIELDS = 250000
+# seconds the cold start of the game up to the first paint of the minefield may take, see bench_startup
+STARTUP_TARGET = 1.0
+
+
+# returns the best and the median time of calling func repeat times. setup is called before every
+# call and its result is passed to func
+def _time(func, repeat, setup = None):
+    times = []
+    for n in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    
+    return {"best": min(times), "median": statistics.median(times)}
+
+
+# returns the indices of a field with zero neighbouring mines, or of any safe field if there is none
+def _find_cascade_field(gamefield, rand):
+    safe_fields = []
+    for n in range(1000):
+        i, j = rand.randrange(gamefield.height), rand.randrange(gamefield.width)
+        if gamefield.is_mine(i, j):
+            continue
+        if gamefield.get_num_neighbouring_mines(i, j) == 0:
+            return i, j
+        safe_fields.append((i, j))
+    
+    return safe_fields[0] if safe_fields else (0, 0)
+
+
+# benchmarks the engine for one minefield class, size and mine density
+def bench_engine(class_name, width, height, density, repeat):
+    cls = GAMEFIELD_CLASSES[class_name]
+    num_mines = min(int(width * height * density), width * height - 1)
+    rand = random.Random(1)
+    result = {"kind": "engine", "class": class_name, "width": width, "height": height, "num_mines": num_mines}
+    
+    # reset, with peak memory of building the minefield
+    gamefield = cls(width, height, num_mines, seed = 1)
+    result["reset"] = _time(lambda arg: gamefield.reset(seed = 1), repeat)
+    
+    tracemalloc.start()
+    gamefield = cls(width, height, num_mines, seed = 1)
+    result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    # reset and first click of a minefield which places its mines at the first click. A ChunkedGamefield
+    # always places them at reset
+    if cls is not ChunkedGamefield:
+        deferred = cls(width, height, num_mines, seed = 1, first_click = FIRST_CLICK_SAFE_AREA)
+        result["reset_deferred"] = _time(lambda arg: deferred.reset(seed = 1), repeat)
+        result["first_click_deferred"] = _time(lambda arg: deferred.open_field(height // 2, width // 2), repeat, lambda: deferred.reset(seed = 1))
+    
+    # cascade of opening one field with zero neighbouring mines on a fresh minefield
+    i, j = _find_cascade_field(gamefield, rand)
+    result["open_field"] = _time(lambda arg: gamefield.open_field(i, j), repeat, lambda: gamefield.reset(seed = 1))
+    result["cascade_size"] = len(gamefield.get_last_opened_fields())
+    
+    # flagging and unflagging a set of fields, checking for a win after each action
+    fields = [(rand.randrange(height), rand.randrange(width)) for n in range(1000)]
+    def flag_cycle(arg):
+        for i, j in fields:
+            gamefield.set_flag(i, j)
+            gamefield.is_game_won()
+        for i, j in fields:
+            gamefield.remove_flag(i, j)
+            gamefield.is_game_won()
+    result["flag_cycle_2000_actions"] = _time(flag_cycle, repeat)
+    
+    return result
+
+
+# benchmarks GameDialog.reset_gamefield and one click, which the dialog follows through the events of
+# the minefield, for one size and mine density
+def bench_gui(dialog, width, height, density, repeat):
+    num_mines = min(int(width * height * density), width * height - 1)
+    result = {"kind": "gui", "class": type(dialog._gamefield).__name__, "width": width, "height": height, "num_mines": num_mines}
+    
+    # large minefields are generated on a worker thread, wait until they have been handed over
+    def reset(arg = None):
+        dialog.reset_gamefield(width, height, num_mines)
+        dialog._board_generator.wait()
+    result["reset_gamefield"] = _time(reset, repeat)
+    
+    rand = random.Random(1)
+    def click(arg):
+        gamefield = dialog._gamefield
+        i, j = _find_cascade_field(gamefield, rand)
+        gamefield.open_field(i, j)
+        dialog.repaint()
+    result["click_update_gamefield"] = _time(click, repeat, reset)
+    
+    return result
+
+
+# measures the cold start of the game: the time from starting a new Python process with
+# Minesweeper_Final.py until it quits after the first paint of the minefield, on the offscreen Qt
+# platform. Returns None if the game cannot be started, e.g. without PyQt5
+def bench_startup(repeat):
+    directory = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, QT_QPA_PLATFORM = "offscreen")
+    command = [sys.executable, os.path.join(directory, "Minesweeper_Final.py"), "--quit-after-first-paint"]
+    
+    def start(arg):
+        if subprocess.run(command, cwd = directory, env = env, capture_output = True).returncode != 0:
+            raise OSError("The game could not be started.")
+    try:
+        cold_start = _time(start, repeat)
+    except OSError:
+        return None
+    
+    import Minesweeper_Final
+    constants = Minesweeper_Final.CONSTANTS
+    return {"kind": "startup", "class": "GameDialog", "width": constants.INITIAL_WIDTH, "height": constants.INITIAL_HEIGHT,
+            "num_mines": constants.INITIAL_NUM_MINES, "cold_start": cold_start}
+
+
+# creates a GameDialog on the offscreen Qt platform. Returns None if PyQt5 is not available
+def create_gui():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))        # the .ui-files and images are loaded relative
+    
+    try:
+        from PyQt5 import QtWidgets
+    except ImportError:
+        return None
+    import Minesweeper_Final
+    
+    create_gui.app = QtWidgets.QApplication(sys.argv[:1])      # keep the application alive
+    dialog = Minesweeper_Final.GameDialog()
+    dialog.show()
+    return dialog
+
+
+def _parse_sizes(text):
+    return [tuple(int(n) for n in size.split("x")) for size in text.split(",")]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output = True, text = True,
+                              cwd = os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+# key identifying the same benchmark in two result files
+def _result_key(result):
+    return result["kind"], result["class"], result["width"], result["height"], result["num_mines"]
+
+
+# prints the ratio of the best times of the results to the best times of the results in old_results
+def compare(results, old_results):
+    old = {_result_key(result): result for result in old_results}
+    for result in results:
+        old_result = old.get(_result_key(result))
+        if old_result is None:
+            continue
+        
+        for name, value in result.items():
+            if isinstance(value, dict) and name in old_result:
+                ratio = value["best"] / old_result[name]["best"] if old_result[name]["best"] > 0 else float("inf")
+                print("%-6s %-15s %5dx%-5d %7d mines  %-24s %6.2fx %s" % (result["kind"], result["class"], result["width"], result["height"],
+                                                                          result["num_mines"], name, ratio, "SLOWER" if ratio > 1.1 else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmarks for the Minesweeper engine and GUI.")
+    parser.add_argument("--sizes", default = DEFAULT_SIZES, help = "comma separated list of WIDTHxHEIGHT")
+    parser.add_argument("--densities", default = DEFAULT_DENSITIES, help = "comma separated list of mine densities")
+    parser.add_argument("--classes", default = ",".join(GAMEFIELD_CLASSES), help = "comma separated list of Gamefield classes")
+    parser.add_argument("--repeat", type = int, default = 5, help = "number of timed runs per benchmark")
+    parser.add_argument("--gui", action = "store_true", help = "also benchmark the GUI on the offscreen Qt platform")
+    parser.add_argument("--startup", action = "store_true",
+                        help = "also measure the cold start up to the first paint, fails if it exceeds %g s" % STARTUP_TARGET)
+    parser.add_argument("--output", help = "write the results as JSON to this file")
+    parser.add_argument("--compare", help = "JSON file of an earlier run to compare the results with")
+    args = parser.parse_args()
+    
+    sizes = _parse_sizes(args.sizes)
+    densities = [float(density) for density in args.densities.split(",")]
+    
+    results = []
+    for class_name in args.classes.split(","):
+        for width, height in sizes:
+            if class_name == "Gamefield" and width * height > MAX_OBJECT_FIELDS:
+                continue
+            for density in densities:
+                result = bench_engine(class_name, width, height, density, args.repeat)
+                results.append(result)
+                print("engine %-15s %5dx%-5d %7d mines  reset %8.4fs  open %8.4fs (%d fields)  flags %8.4fs  %8.1f MB"
+                      % (class_name, width, height, result["num_mines"], result["reset"]["best"], result["open_field"]["best"],
+                         result["cascade_size"], result["flag_cycle_2000_actions"]["best"], result["peak_memory_bytes"] / 1e6))
+    
+    if args.gui:
+        dialog = create_gui()
+        if dialog is None:
+            print("PyQt5 is not available, skipping the GUI benchmarks")
+        else:
+            for width, height in sizes:
+                if width * height > MAX_GUI_FIELDS:
+                    continue
+                for density in densities:
+                    result = bench_gui(dialog, width, height, density, args.repeat)
+                    results.append(result)
+                    print("gui    %-15s %5dx%-5d %7d mines  reset_gamefield %8.4fs  click %8.4fs"
+                          % (result["class"], width, height, result["num_mines"], result["reset_gamefield"]["best"],
+                             result["click_update_gamefield"]["best"]))
+    
+    is_startup_too_slow = False
+    if args.startup:
+        result = bench_startup(args.repeat)
+        if result is None:
+            print("The game could not be started, skipping the startup benchmark")
+        else:
+            results.append(result)
+            is_startup_too_slow = result["cold_start"]["median"] > STARTUP_TARGET
+            print("startup cold start to first paint  best %8.4fs  median %8.4fs  target %.2fs %s"
+                  % (result["cold_start"]["best"], result["cold_start"]["median"], STARTUP_TARGET, "EXCEEDED" if is_startup_too_slow else ""))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"commit": _git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+                       "repeat": args.repeat, "results": results}, f, indent = 1)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+    
+    if is_startup_too_slow:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+import threading
+
+from PyQt5.QtCore import *
+
+from gamefield import ArrayGamefield
+
+# progress of a single step, see _Job
+STEP_RANGE = 1000
+
+"""
+
+Signals of a job, which live in the GUI thread so that the worker thread can emit them
+
+"""
+class _JobSignals(QObject):
+    progress = pyqtSignal(int, int)         # job id, progress in STEP_RANGE per step
+    finished = pyqtSignal(int, object)      # job id, the generated minefield
+
+
+# raised by the progress of a step when its job has been cancelled
+class _Cancelled(Exception):
+    pass
+
+
+"""
+
+Progress of one step of a job, which the step calls as progress(num_done, num_steps), e.g. as the
+progress callback of a Gamefield (see Gamefield.set_progress). Emits the progress of the job and raises
+_Cancelled when the job has been cancelled, which stops the step. After the step it does nothing, so a
+minefield which keeps it as its callback can be used on
+
+"""
+class _StepProgress:
+    def __init__(self, job, step_index):
+        self._job = job
+        self._step_index = step_index
+        self._value = -1                # progress emitted last
+        self.is_finished = False
+    
+    def __call__(self, num_done, num_steps):
+        if self.is_finished:
+            return
+        if self._job.cancelled.is_set():
+            raise _Cancelled()
+        
+        value = self._step_index * STEP_RANGE + STEP_RANGE * num_done // max(num_steps, 1)
+        if value != self._value:
+            self._value = value
+            self._job.emit_progress(value)
+
+
+"""
+
+Job for the thread pool: calls its steps one after another, each as step(result, progress) with the
+result of the one before (None for the first step) and a _StepProgress, and emits the result of the last
+step. Stops between two steps when it is cancelled, and within a step whenever it reports its progress.
+
+"""
+class _Job(QRunnable):
+    def __init__(self, job_id, steps, signals):
+        super().__init__()
+        self.setAutoDelete(False)       # the generator keeps its own reference to compare the job ids
+        
+        self.job_id = job_id
+        self.steps = steps
+        self.cancelled = threading.Event()
+        self._signals = signals
+    
+    def emit_progress(self, value):
+        self._signals.progress.emit(self.job_id, value)
+    
+    def run(self):
+        result = None
+        for n, step in enumerate(self.steps):
+            progress = _StepProgress(self, n)
+            try:
+                progress(0, 1)
+                result = step(result, progress)
+                progress(1, 1)
+            except _Cancelled:
+                return
+            finally:
+                progress.is_finished = True
+        
+        if not self.cancelled.is_set():
+            self._signals.finished.emit(self.job_id, result)
+
+
+"""
+
+Generates minefields on the worker threads of a QThreadPool, so that the GUI stays responsive while the
+mines of a large minefield are placed and counted. A job is a list of steps, functions which get the
+result of the step before and a progress callback, and return the next result (see start); the result of
+the last step is passed to the callback in the GUI thread. Only one job runs at a time: starting a new
+one or cancel() drops the current one, and its result is never delivered. A step stops at its next
+report of progress, e.g. a minefield after the next band of its mines (see Gamefield.set_progress).
+
+Besides, the next minefield of a size can be generated in advance with pregenerate and taken with
+take_pregenerated, e.g. when the player starts a new game with the same size.
+
+progress is emitted with the progress of the current job and its maximum, STEP_RANGE per step, and
+busyChanged when a job starts or ends.
+
+"""
+class BoardGenerator(QObject):
+    progress = pyqtSignal(int, int)
+    busyChanged = pyqtSignal(bool)
+    
+    def __init__(self, parent = None):
+        super().__init__(parent)
+        
+        self._pool = QThreadPool.globalInstance()
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_job_progress)
+        self._signals.finished.connect(self._on_job_finished)
+        
+        self._next_job_id = 0
+        self._job = None                # current job
+        self._callback = None           # receives the result of the current job
+        self._pregenerate_job = None    # job generating the minefield for take_pregenerated
+        self._pregenerate_key = None    # (width, height, num_mines, first_click) of the pregenerated minefield
+        self._pregenerated = None       # pregenerated minefield, None while it is generated
+    
+    def _create_job(self, steps):
+        self._next_job_id += 1
+        return _Job(self._next_job_id, steps, self._signals)
+    
+    # runs the steps on a worker thread and calls callback with the result of the last step in the GUI
+    # thread. Every step is called as step(result, progress), see _Job. A job still running is cancelled
+    def start(self, steps, callback):
+        self.cancel()
+        
+        self._job = self._create_job(steps)
+        self._callback = callback
+        self._pool.start(self._job)
+        
+        self.busyChanged.emit(True)
+        self.progress.emit(0, len(steps) * STEP_RANGE)
+    
+    # cancels the current job, its result is dropped
+    def cancel(self):
+        if self._job is None:
+            return
+        
+        self._job.cancelled.set()
+        self._job = None
+        self._callback = None
+        self.busyChanged.emit(False)
+    
+    def is_busy(self):
+        return self._job is not None
+    
+    # blocks until all jobs have finished and their results have been delivered, e.g. for benchmarks
+    def wait(self):
+        self._pool.waitForDone()
+        QCoreApplication.processEvents()
+    
+    # starts generating a minefield of the given size with the given mode of the first click (see
+    # Gamefield.first_click), which take_pregenerated returns later. Replaces a pregenerated minefield
+    # of another size
+    def pregenerate(self, width, height, num_mines, first_click):
+        key = (width, height, num_mines, first_click)
+        if key == self._pregenerate_key:
+            return
+        if self._pregenerate_job is not None:
+            self._pregenerate_job.cancelled.set()
+        
+        self._pregenerate_key = key
+        self._pregenerated = None
+        self._pregenerate_job = self._create_job([lambda _, progress: ArrayGamefield(width, height, num_mines, first_click = first_click,
+                                                                                   progress = progress)])
+        self._pool.start(self._pregenerate_job)
+    
+    # returns the pregenerated minefield of the given size and mode of the first click, or None if there
+    # is none (yet). A minefield is only returned once
+    def take_pregenerated(self, width, height, num_mines, first_click):
+        if (width, height, num_mines, first_click) != self._pregenerate_key or self._pregenerated is None:
+            return None
+        
+        gamefield = self._pregenerated
+        self._pregenerate_key = None
+        self._pregenerated = None
+        return gamefield
+    
+    def _on_job_progress(self, job_id, value):
+        if self._job is not None and job_id == self._job.job_id:
+            self.progress.emit(value, len(self._job.steps) * STEP_RANGE)
+    
+    # hands the result of a job over to the GUI thread in one piece, results of dropped jobs are ignored
+    def _on_job_finished(self, job_id, result):
+        if self._pregenerate_job is not None and job_id == self._pregenerate_job.job_id:
+            self._pregenerate_job = None
+            self._pregenerated = result
+            return
+        
+        if self._job is None or job_id != self._job.job_id:
+            return
+        
+        callback = self._callback
+        self._job = None
+        self._callback = None
+        self.busyChanged.emit(False)
+        callback(result)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+from PyQt5.QtWidgets import *
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+
+from pixmapcache import PixmapCache
+
+"""
+
+Widget which displays a whole minefield. Instead of one widget per field, the fields are painted as
+tiles from one sprite atlas in paintEvent, and only the tiles inside the area to repaint are drawn.
+Mouse clicks are mapped to the indices (i, j) of the field; a middle click or a double click emits
+chorded. Holding Ctrl while turning the mouse wheel zooms; put the widget into a QScrollArea to scroll
+on large minefields.
+
+"""
+class BoardView(QWidget):
+    clicked = pyqtSignal(int, int)
+    rightClicked = pyqtSignal(int, int)
+    chorded = pyqtSignal(int, int)
+    mouseReleased = pyqtSignal()
+    mouseDown = pyqtSignal()
+    
+    # order of the tiles in the sprite atlas, see set_tile_images
+    TILE_CLOSED = 0
+    TILE_FLAG = 1
+    TILE_MINE = 2
+    TILE_MINE_RED = 3
+    TILE_NUM_MINES = 4          # TILE_NUM_MINES + n is the tile for a field with n neighbouring mines
+    
+    _MIN_ZOOM = 0.25
+    _MAX_ZOOM = 4.0
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        self._gamefield = None
+        self._atlas = None              # all tiles side by side in one pixmap, built at the first paint
+        self._tile_paths = []           # image files of the tiles, see set_tile_images
+        self._tile_width = 16           # size of a tile in the atlas
+        self._tile_height = 16
+        self._zoom = 1.0
+        self._is_revealed = False       # if all fields are shown, e.g. after the game is lost
+        self._red_mine = None           # indices of the mine drawn red when revealed
+        self._num_painted_tiles = 0     # tiles drawn by the last paintEvent
+        
+    # sets the image files the sprite atlas is built from, which have to be in the order of the
+    # TILE_-constants. All images must have the size tile_width x tile_height. They are loaded at the
+    # first paint, not before
+    def set_tile_images(self, paths, tile_width, tile_height):
+        self._tile_width = tile_width
+        self._tile_height = tile_height
+        self._tile_paths = list(paths)
+        self._atlas = None
+        
+        self._update_size()
+        
+    # returns the sprite atlas, which is built from the tile images on the first call
+    def _get_atlas(self):
+        if self._atlas is None:
+            self._atlas = QPixmap(self._tile_width * len(self._tile_paths), self._tile_height)
+            self._atlas.fill(Qt.transparent)
+            painter = QPainter(self._atlas)
+            for n, path in enumerate(self._tile_paths):
+                painter.drawPixmap(n * self._tile_width, 0, PixmapCache.get_pixmap(path))
+            painter.end()
+            
+        return self._atlas
+        
+    # shows the minefield gamefield (instance of Gamefield) with all fields as they are now
+    def set_gamefield(self, gamefield):
+        self._gamefield = gamefield
+        self._is_revealed = False
+        self._red_mine = None
+        
+        self._update_size()
+        self.update()
+        
+    # shows all fields with their mines or numbers, the mine with indices red_mine in red
+    def reveal(self, red_mine = None):
+        self._is_revealed = True
+        self._red_mine = red_mine
+        self.update()
+        
+    # repaints the fields with the coordinates in fields, e.g. from the events of a Gamefield
+    def update_fields(self, fields):
+        if not fields:
+            return
+        
+        rows = [i for i, j in fields]
+        columns = [j for i, j in fields]
+        top_left = self._field_rect(min(rows), min(columns))
+        bottom_right = self._field_rect(max(rows), max(columns))
+        self.update(top_left.united(bottom_right))
+        
+    @property
+    def zoom(self):
+        return self._zoom
+    
+    @zoom.setter
+    def zoom(self, a):
+        self._zoom = min(max(a, self._MIN_ZOOM), self._MAX_ZOOM)
+        self._update_size()
+        self.update()
+        
+    # size of a field on screen
+    def _field_size(self):
+        return self._tile_width * self._zoom, self._tile_height * self._zoom
+    
+    def _field_rect(self, i, j):
+        field_width, field_height = self._field_size()
+        x = int(j * field_width)
+        y = int(i * field_height)
+        return QRect(x, y, int((j + 1) * field_width) - x, int((i + 1) * field_height) - y)
+        
+    def _update_size(self):
+        if self._gamefield is None:
+            return
+        
+        field_width, field_height = self._field_size()
+        self.setFixedSize(int(self._gamefield.width * field_width), int(self._gamefield.height * field_height))
+        
+    # returns the index of the tile in the atlas for the field with indices (i, j)
+    def _tile(self, i, j):
+        gamefield = self._gamefield
+        
+        if self._is_revealed:
+            if gamefield.is_mine(i, j):
+                return self.TILE_MINE_RED if (i, j) == self._red_mine else self.TILE_MINE
+            return self.TILE_NUM_MINES + gamefield.get_num_neighbouring_mines(i, j)
+        
+        if gamefield.is_flagged(i, j):
+            return self.TILE_FLAG
+        if gamefield.is_open(i, j):
+            return self.TILE_NUM_MINES + gamefield.get_num_neighbouring_mines(i, j)
+        return self.TILE_CLOSED
+    
+    # returns the indices (i, j) of the field at the position pos or None if there is no field
+    def field_at(self, pos):
+        if self._gamefield is None:
+            return None
+        
+        field_width, field_height = self._field_size()
+        i = int(pos.y() // field_height)
+        j = int(pos.x() // field_width)
+        if 0 <= i < self._gamefield.height and 0 <= j < self._gamefield.width:
+            return i, j
+        return None
+        
+    # paints only the tiles in the area that has to be repainted
+    def paintEvent(self, ev):
+        if self._gamefield is None:
+            return
+        
+        field_width, field_height = self._field_size()
+        rect = ev.rect()
+        first_row = max(int(rect.top() // field_height), 0)
+        last_row = min(int(rect.bottom() // field_height), self._gamefield.height - 1)
+        first_column = max(int(rect.left() // field_width), 0)
+        last_column = min(int(rect.right() // field_width), self._gamefield.width - 1)
+        
+        atlas = self._get_atlas()
+        painter = QPainter(self)
+        for i in range(first_row, last_row + 1):
+            for j in range(first_column, last_column + 1):
+                source = QRect(self._tile(i, j) * self._tile_width, 0, self._tile_width, self._tile_height)
+                painter.drawPixmap(self._field_rect(i, j), atlas, source)
+        painter.end()
+        
+        self._num_painted_tiles = (last_row - first_row + 1) * (last_column - first_column + 1)
+        
+    # number of tiles drawn by the last paintEvent
+    def get_num_painted_tiles(self):
+        return self._num_painted_tiles
+        
+    def mousePressEvent(self, ev):
+        self.mouseDown.emit()
+        
+        field = self.field_at(ev.pos())
+        if field is None:
+            return
+        
+        if ev.button() == Qt.LeftButton:
+            self.clicked.emit(*field)
+        elif ev.button() == Qt.RightButton:
+            self.rightClicked.emit(*field)
+        elif ev.button() == Qt.MiddleButton:
+            self.chorded.emit(*field)
+            
+    # the first click of a double click has already been passed on by mousePressEvent
+    def mouseDoubleClickEvent(self, ev):
+        if ev.button() != Qt.LeftButton:
+            self.mousePressEvent(ev)
+            return
+        
+        self.mouseDown.emit()
+        field = self.field_at(ev.pos())
+        if field is not None:
+            self.chorded.emit(*field)
+            
+    def mouseReleaseEvent(self, ev):
+        self.mouseReleased.emit()
+        
+    # zooms with Ctrl + mouse wheel, otherwise the wheel scrolls the surrounding QScrollArea
+    def wheelEvent(self, ev):
+        if ev.modifiers() & Qt.ControlModifier:
+            self.zoom = self._zoom * (1.25 if ev.angleDelta().y() > 0 else 0.8)
+            ev.accept()
+        else:
+            ev.ignore()
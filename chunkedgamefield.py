@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Minefield for very large ("endless") boards of up to billions of fields, stored in square chunks which
+are only created when they are first touched. See ChunkedGamefield.
+"""
+
+import random
+import zlib
+from collections import OrderedDict
+
+from gamefield import Field, Gamefield, count_neighbouring_mines, FIRST_CLICK_ANY, MOVE_CHORD, MOVE_FLAG, \
+    MOVE_OPEN, MOVE_UNFLAG, EVENT_FIELDS_OPENED, EVENT_FLAG_REMOVED, EVENT_FLAG_SET, EVENT_MINE_HIT, EVENT_RESET
+
+# size of the memory the uncompressed chunks may take, in bytes
+DEFAULT_MEMORY_BUDGET = 64 * 2**20
+# number of fields a single cascade of open_field or chord_field opens at most
+DEFAULT_MAX_CASCADE = 2**18
+# number of chunks whose mines are kept for counting the neighbouring mines of new chunks
+_MINE_CACHE_SIZE = 64
+
+# offsets of the eight neighbors of a field
+_NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+"""
+
+Minefield with the same interface as Gamefield for boards far too large to be held in memory. The
+board is divided into chunks of chunk_size x chunk_size fields (the chunks at the right and bottom
+edge may be cut off), which are created only when a field in them is first read or changed. Every
+chunk holds one byte per field (index = a * chunk_size + b for the field in row a and column b of the
+chunk) with the same bits as ArrayGamefield: the lower four bits hold the number of neighbouring mines,
+the upper bits whether the field is a mine, open or flagged.
+
+The mines of a chunk only depend on the seed and the coordinates of the chunk: each chunk gets its
+share of num_mines in proportion to its number of fields, drawn from a random generator seeded with
+the seed and the chunk coordinates. So chunks can be created in any order and dropped and created again
+at any time. The numbers of neighbouring mines at the edges of a chunk are counted with the mines of
+the neighbouring chunks, which are drawn for this without creating these chunks.
+
+Whenever a new chunk is needed, also in the middle of a cascade, the chunks used least recently are
+taken out of memory until the uncompressed chunks fit into memory_budget bytes. Chunks the player has
+not changed are dropped, the others are compressed and decompressed when they are used again. So memory
+grows with the explored area only. Cascades of open_field and chord_field cross chunk borders like on
+any other minefield. Below a mine density of about 10%, fields with zero neighbouring mines join into
+areas without bounds, so a cascade stops after max_cascade opened fields. Its open fields with zero
+neighbouring mines at the border of the closed fields can then be chorded (see chord_field) to go on.
+The mines are always placed at reset, first_click can only be FIRST_CLICK_ANY. get_states and set_state
+hold the states of all fields at once, so they only suit minefields which fit into memory; savegame.py
+does not save a ChunkedGamefield, snapshot and restore keep only the changed chunks.
+
+"""
+class ChunkedGamefield(Gamefield):
+    _COUNT_MASK = 0x0F
+    _MINE = 0x10
+    _OPEN = 0x20
+    _FLAG = 0x40
+    
+    # translation table from the cells to 1 for mines
+    _MINE_BIT_TABLE = bytes(c >> 4 & 1 for c in range(256))
+    # translation tables from the cells to the states of get_states and to the numbers of neighbouring
+    # mines of the open fields (9 for closed fields), and from the states to 1 for (correct) flags
+    _STATE_TABLE = bytes(c >> 4 & 0x07 for c in range(256))
+    _OPEN_COUNT_TABLE = bytes(c & 0x0F if c & 0x20 else 9 for c in range(256))
+    _STATE_FLAG_TABLE = bytes(c >> 2 & 1 for c in range(256))
+    _STATE_CORRECT_FLAG_TABLE = bytes(int(c & 0x05 == 0x05) for c in range(256))
+    
+    def __init__(self, width = 10, height = 10, num_mines = 10, seed = None, first_click = FIRST_CLICK_ANY,
+                 chunk_size = 64, memory_budget = DEFAULT_MEMORY_BUDGET, max_cascade = DEFAULT_MAX_CASCADE):
+        if first_click != FIRST_CLICK_ANY:
+            raise ValueError("A ChunkedGamefield only supports FIRST_CLICK_ANY.")
+        if type(chunk_size) != int or chunk_size < 1:
+            raise ValueError("The chunk size must be a positive integer.")
+        if type(max_cascade) != int or max_cascade < 1:
+            raise ValueError("The maximum size of a cascade must be a positive integer.")
+        if num_mines >= width * height:
+            raise ValueError("There cannot be more mines than fields.")
+        
+        self._chunk_size = chunk_size
+        self._memory_budget = memory_budget
+        self._max_chunks = max(memory_budget // (chunk_size * chunk_size), 1)  # uncompressed chunks in memory
+        self._max_cascade = max_cascade
+        self._chunks = OrderedDict()    # (chunk row, chunk column) -> bytearray of the cells, least recently used first
+        self._compressed_chunks = {}    # (chunk row, chunk column) -> compressed cells of changed chunks out of memory
+        self._changed_chunks = set()    # chunks with opened or flagged fields, they are compressed instead of dropped
+        self._mine_cache = OrderedDict()    # (chunk row, chunk column) -> mines of a chunk, see _get_chunk_mines
+        
+        super().__init__(width, height, num_mines, seed, first_click)
+    
+    # returns the number of mines of all chunks before the chunk (ci, cj) in row-major order. Each chunk
+    # gets the mines in proportion to its fields, rounded so that all chunks together have num_mines
+    def _get_num_mines_before(self, ci, cj):
+        size = self._chunk_size
+        chunk_height = min(size, self._height - ci * size)
+        num_fields_before = min(ci * size, self._height) * self._width + cj * size * chunk_height
+        
+        return self._num_mines * num_fields_before // (self._width * self._height)
+    
+    # returns a bytearray with one byte per field of the chunk (ci, cj) which is 1 if the field is a mine
+    # and 0 otherwise, and only zeros for chunks outside of the minefield. The mines are drawn without
+    # replacement from a random generator seeded with the seed and the chunk coordinates
+    def _sample_chunk_mines(self, ci, cj):
+        size = self._chunk_size
+        mines = bytearray(size * size)
+        if ci < 0 or cj < 0 or ci * size >= self._height or cj * size >= self._width:
+            return mines
+        
+        chunk_height = min(size, self._height - ci * size)
+        chunk_width = min(size, self._width - cj * size)
+        if cj * size + chunk_width < self._width:
+            num_mines = self._get_num_mines_before(ci, cj + 1) - self._get_num_mines_before(ci, cj)
+        else:
+            num_mines = self._get_num_mines_before(ci + 1, 0) - self._get_num_mines_before(ci, cj)
+        
+        rand = random.Random("%s/%d/%d" % (self._seed, ci, cj))
+        for p in rand.sample(range(chunk_height * chunk_width), num_mines):
+            a, b = divmod(p, chunk_width)
+            mines[a * size + b] = 1
+        
+        return mines
+    
+    # returns the mines of the chunk (ci, cj) as from _sample_chunk_mines, taken from the chunk if it
+    # exists and drawn otherwise. Drawn mines are cached, since neighbouring chunks are often created
+    # one after another
+    def _get_chunk_mines(self, ci, cj):
+        key = (ci, cj)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            return cells.translate(self._MINE_BIT_TABLE)
+        if key in self._compressed_chunks:
+            return zlib.decompress(self._compressed_chunks[key]).translate(self._MINE_BIT_TABLE)
+        
+        mines = self._mine_cache.get(key)
+        if mines is None:
+            mines = self._sample_chunk_mines(ci, cj)
+            self._mine_cache[key] = mines
+            if len(self._mine_cache) > _MINE_CACHE_SIZE:
+                self._mine_cache.popitem(last = False)
+        
+        return mines
+    
+    # creates the cells of the chunk (ci, cj). The mines of the chunk are surrounded by the edges of the
+    # mines of its eight neighbors, so that the numbers of neighbouring mines can be counted for the
+    # whole padded block at once (see count_neighbouring_mines), of which the inner part is kept
+    def _create_chunk(self, ci, cj):
+        size = self._chunk_size
+        mines = [[self._get_chunk_mines(ci + di, cj + dj) for dj in (-1, 0, 1)] for di in (-1, 0, 1)]
+        
+        padded = bytearray()
+        for di, rows in ((0, [size - 1]), (1, range(size)), (2, [0])):
+            left, middle, right = mines[di]
+            for a in rows:
+                padded += left[a * size + size - 1:a * size + size] + middle[a * size:(a + 1) * size] + right[a * size:a * size + 1]
+        
+        padded_counts = count_neighbouring_mines(padded, size + 2, size + 2)
+        counts = b"".join(padded_counts[(a + 1) * (size + 2) + 1:(a + 2) * (size + 2) - 1] for a in range(size))
+        
+        # merge the mine bits into the numbers of neighbouring mines, as in ArrayGamefield._place_mines
+        cells = int.from_bytes(counts, "little") | (int.from_bytes(mines[1][1], "little") << 4)
+        return bytearray(cells.to_bytes(size * size, "little"))
+    
+    # returns the cells of the chunk (ci, cj), which are decompressed or created if they are not in memory.
+    # Other chunks may be taken out of memory for it, so cells returned before must not be used anymore
+    def _get_chunk(self, ci, cj):
+        key = (ci, cj)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            self._chunks.move_to_end(key)
+            return cells
+        
+        compressed = self._compressed_chunks.pop(key, None)
+        if compressed is not None:
+            cells = bytearray(zlib.decompress(compressed))
+        else:
+            cells = self._create_chunk(ci, cj)
+            self._mine_cache.pop(key, None)
+        self._chunks[key] = cells
+        self._trim_chunks()
+        
+        return cells
+    
+    # returns the cells of the chunk (ci, cj) like _get_chunk, but without taking other chunks out of
+    # memory: chunks which are not in memory are decompressed or created only for the caller
+    def _peek_chunk(self, ci, cj):
+        key = (ci, cj)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            return cells
+        
+        compressed = self._compressed_chunks.get(key)
+        if compressed is not None:
+            return zlib.decompress(compressed)
+        return self._create_chunk(ci, cj)
+    
+    # takes the chunks used least recently out of memory until at most memory_budget bytes are used by
+    # uncompressed chunks
+    def _trim_chunks(self):
+        while len(self._chunks) > self._max_chunks:
+            key, cells = self._chunks.popitem(last = False)
+            if key in self._changed_chunks:
+                self._compressed_chunks[key] = zlib.compress(cells, 1)
+    
+    # returns the cells of the chunk containing the field (i, j) and the index of the field in them
+    def _locate(self, i, j):
+        ci, a = divmod(i, self._chunk_size)
+        cj, b = divmod(j, self._chunk_size)
+        return self._get_chunk(ci, cj), a * self._chunk_size + b
+    
+    # opens the field (i, j), which is closed and has zero neighbouring mines, all of its neighbors and,
+    # as long as there are fields with zero neighbouring mines among them, their neighbors too, until
+    # about max_fields fields are opened. Works with a stack of global coordinates, so the cascade
+    # continues across the borders of the chunks; the chunk of every neighbor is looked up anew, since
+    # chunks may be taken out of memory on the way. Returns the coordinates of the opened fields
+    def _open_free_fields(self, i, j, max_fields):
+        size = self._chunk_size
+        width = self._width
+        height = self._height
+        num_opened_by_number = self._num_opened_by_number
+        
+        opened = []
+        stack = [(i, j)]
+        while stack and len(opened) < max_fields:
+            i, j = stack.pop()
+            for di, dj in _NEIGHBOR_OFFSETS:
+                ni = i + di
+                nj = j + dj
+                if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                    continue
+                
+                ci, a = divmod(ni, size)
+                cj, b = divmod(nj, size)
+                cells = self._get_chunk(ci, cj)
+                k = a * size + b
+                cell = cells[k]
+                if cell & self._OPEN:
+                    continue
+                
+                cells[k] = cell | self._OPEN
+                self._changed_chunks.add((ci, cj))
+                num_opened_by_number[cell & self._COUNT_MASK] += 1
+                opened.append((ni, nj))
+                if cell & self._COUNT_MASK == 0:
+                    stack.append((ni, nj))
+        
+        self._num_opened_fields += len(opened)
+        return opened
+    
+    # opens the closed field (i, j), which is no mine, together with its cascade of at most max_fields
+    # fields. Returns the coordinates of the opened fields
+    def _open(self, i, j, max_fields):
+        cells, k = self._locate(i, j)
+        cell = cells[k]
+        if cell & self._OPEN:
+            return []
+        
+        cells[k] = cell | self._OPEN
+        self._changed_chunks.add((i // self._chunk_size, j // self._chunk_size))
+        self._num_opened_fields += 1
+        self._num_opened_by_number[cell & self._COUNT_MASK] += 1
+        
+        opened = [(i, j)]
+        if cell & self._COUNT_MASK == 0:
+            opened += self._open_free_fields(i, j, max_fields - 1)
+        return opened
+    
+    # opens a field. Returns False if field was a mine. Also, if the field has zero mines, opens
+    # all neighbors of the field with zero mines and also adjacent fields to fields with zero mines,
+    # up to max_cascade fields. The opened fields can be read with get_last_opened_fields
+    def open_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_OPEN, i, j)
+        
+        cells, k = self._locate(i, j)
+        self._last_opened_fields = []
+        
+        if cells[k] & self._MINE:
+            if self._subscribers:
+                self._publish(EVENT_MINE_HIT, [(i, j)])
+            return False
+        
+        self._last_opened_fields = self._open(i, j, self._max_cascade)
+        
+        if self._subscribers:
+            self._publish_changes(EVENT_FIELDS_OPENED, self._last_opened_fields)
+        
+        return True
+    
+    # returns the coordinates of all neighbors of the field (i, j)
+    def _neighbors(self, i, j):
+        return [(i + di, j + dj) for di, dj in _NEIGHBOR_OFFSETS
+                if 0 <= i + di < self._height and 0 <= j + dj < self._width]
+    
+    # opens all closed, unflagged neighbors of the open field (i, j) at once if it has as many flagged
+    # neighbors as neighbouring mines, including the cascades of neighbors with zero mines, which open up
+    # to max_cascade fields together. Returns False if a flag was wrong and a mine has been opened; the
+    # other neighbors are opened anyway. The opened fields of all cascades can be read with
+    # get_last_opened_fields
+    def chord_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_CHORD, i, j)
+        
+        cells, k = self._locate(i, j)
+        cell = cells[k]
+        self._last_opened_fields = []
+        
+        neighbors = self._neighbors(i, j)
+        if not cell & self._OPEN or sum(1 for n in neighbors if self.is_flagged(*n)) != cell & self._COUNT_MASK:
+            return True
+        
+        mines_hit = []
+        opened = []
+        for ni, nj in neighbors:
+            neighbor_cells, nk = self._locate(ni, nj)
+            neighbor = neighbor_cells[nk]
+            if neighbor & (self._OPEN | self._FLAG):
+                continue
+            if neighbor & self._MINE:
+                mines_hit.append((ni, nj))
+                continue
+            opened += self._open(ni, nj, max(self._max_cascade - len(opened), 1))
+        
+        self._last_opened_fields = opened
+        
+        if self._subscribers:
+            self._publish_chord(mines_hit)
+        
+        return not mines_hit
+    
+    def set_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_FLAG, i, j)
+        
+        cells, k = self._locate(i, j)
+        cell = cells[k]
+        if not cell & self._FLAG:
+            self._num_flagged_fields += 1
+            if cell & self._MINE:
+                self._num_correct_flags += 1
+            self._changed_chunks.add((i // self._chunk_size, j // self._chunk_size))
+        
+        cells[k] = cell | self._FLAG
+        
+        if not cell & self._FLAG and self._subscribers:
+            self._publish_changes(EVENT_FLAG_SET, [(i, j)])
+    
+    def remove_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_UNFLAG, i, j)
+        
+        cells, k = self._locate(i, j)
+        cell = cells[k]
+        if cell & self._FLAG:
+            self._num_flagged_fields -= 1
+            if cell & self._MINE:
+                self._num_correct_flags -= 1
+        
+        cells[k] = cell & ~self._FLAG
+        
+        if cell & self._FLAG and self._subscribers:
+            self._publish_changes(EVENT_FLAG_REMOVED, [(i, j)])
+    
+    def is_flagged(self, i, j):
+        cells, k = self._locate(i, j)
+        return bool(cells[k] & self._FLAG)
+    
+    def is_open(self, i, j):
+        cells, k = self._locate(i, j)
+        return bool(cells[k] & self._OPEN)
+    
+    def is_mine(self, i, j):
+        cells, k = self._locate(i, j)
+        return bool(cells[k] & self._MINE)
+    
+    def get_num_neighbouring_mines(self, i, j):
+        cells, k = self._locate(i, j)
+        return cells[k] & self._COUNT_MASK
+    
+    # returns a Field-instance holding a copy of the state of the field. Its neighbors are not filled in
+    def get_field(self, i, j):
+        cells, k = self._locate(i, j)
+        cell = cells[k]
+        
+        field = Field(i, j, bool(cell & self._MINE), bool(cell & self._FLAG), bool(cell & self._OPEN))
+        field.num_neighbouring_mines = cell & self._COUNT_MASK
+        
+        return field
+    
+    # returns the coordinates of the mines in all chunks which have been created so far. The mines of
+    # the rest of the minefield are not drawn
+    def get_mine_positions(self):
+        size = self._chunk_size
+        chunks = list(self._chunks.items()) + [(key, zlib.decompress(compressed)) for key, compressed in self._compressed_chunks.items()]
+        
+        positions = []
+        for (ci, cj), cells in chunks:
+            mines = cells.translate(self._MINE_BIT_TABLE)
+            k = mines.find(1)
+            while k != -1:
+                a, b = divmod(k, size)
+                positions.append((ci * size + a, cj * size + b))
+                k = mines.find(1, k + 1)
+        
+        return positions
+    
+    # returns the number of chunks in memory and the number of compressed chunks
+    def get_num_chunks(self):
+        return len(self._chunks), len(self._compressed_chunks)
+    
+    # closes all fields and drops all chunks. The same seed always gives the same mine distribution;
+    # without a seed a new one is drawn
+    def reset(self, seed = None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._clear_chunks(seed)
+        
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+    
+    # drops all chunks and counters and sets the seed, without publishing EVENT_RESET
+    def _clear_chunks(self, seed):
+        self._move_log = None
+        self._num_flagged_fields = 0
+        self._num_correct_flags = 0
+        self._num_opened_fields = 0
+        self._num_opened_by_number = [0] * 9
+        self._last_opened_fields = []
+        self._seed = seed
+        
+        self._max_chunks = max(self._memory_budget // (self._chunk_size * self._chunk_size), 1)
+        self._chunks = OrderedDict()
+        self._compressed_chunks = {}
+        self._changed_chunks = set()
+        self._mine_cache = OrderedDict()
+        self._are_mines_placed = True
+    
+    # returns the state of all fields as a bytearray with one byte per field (index = i * width + j), see
+    # Gamefield.get_states. The chunks are read one row of chunks after another; chunks which have not
+    # been created are created for it, but not kept, so the chunks in memory stay the same
+    def get_states(self):
+        size = self._chunk_size
+        width = self._width
+        num_chunk_columns = -(-width // size)
+        
+        states = bytearray()
+        for ci in range(-(-self._height // size)):
+            chunk_height = min(size, self._height - ci * size)
+            chunk_states = [self._peek_chunk(ci, cj).translate(self._STATE_TABLE) for cj in range(num_chunk_columns)]
+            for a in range(chunk_height):
+                for cj, cells in enumerate(chunk_states):
+                    states += cells[a * size:a * size + min(size, width - cj * size)]
+        
+        return states
+    
+    # replaces the whole state of the minefield by the given size, seed and states (see get_states). The
+    # numbers of neighbouring mines are counted one row of chunks after another, and all chunks are kept
+    # compressed, since their mines need not be those the seed gives. The states must contain the mines
+    def set_state(self, width, height, num_mines, seed, states):
+        if num_mines and not states.translate(self._STATE_MINE_TABLE).count(1):
+            raise ValueError("The mines of a ChunkedGamefield must be placed in the states.")
+        self._check_state(width, height, num_mines, states)
+        self._clear_chunks(seed)
+        
+        size = self._chunk_size
+        mines = states.translate(self._STATE_MINE_TABLE)
+        for ci in range(-(-height // size)):
+            first_row = ci * size
+            stop_row = min(first_row + size, height)
+            top = max(first_row - 1, 0)
+            bottom = min(stop_row + 1, height)
+            
+            # count the rows of the chunks together with the rows above and below them, and merge the
+            # states into the counts as in ArrayGamefield.set_state
+            counts = count_neighbouring_mines(mines[top * width:bottom * width], width, bottom - top)
+            counts = counts[(first_row - top) * width:(stop_row - top) * width]
+            cells = int.from_bytes(counts, "little") | (int.from_bytes(states[first_row * width:stop_row * width], "little") << 4)
+            cells = cells.to_bytes(len(counts), "little")
+            
+            open_counts = cells.translate(self._OPEN_COUNT_TABLE)
+            for n in range(9):
+                self._num_opened_by_number[n] += open_counts.count(n)
+            
+            for cj in range(-(-width // size)):
+                chunk = bytearray(size * size)
+                left = cj * size
+                chunk_width = min(size, width - left)
+                for a in range(stop_row - first_row):
+                    chunk[a * size:a * size + chunk_width] = cells[a * width + left:a * width + left + chunk_width]
+                self._compressed_chunks[(ci, cj)] = zlib.compress(chunk, 1)
+                self._changed_chunks.add((ci, cj))
+        
+        self._num_opened_fields = states.translate(self._STATE_OPEN_TABLE).count(1)
+        self._num_flagged_fields = states.translate(self._STATE_FLAG_TABLE).count(1)
+        self._num_correct_flags = states.translate(self._STATE_CORRECT_FLAG_TABLE).count(1)
+        
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+    
+    # returns a copy of the state of the minefield: the changed chunks, compressed, and the counters.
+    # Unchanged chunks are created again from the seed
+    def snapshot(self):
+        chunks = dict(self._compressed_chunks)
+        for key, cells in self._chunks.items():
+            if key in self._changed_chunks:
+                chunks[key] = zlib.compress(cells, 1)
+        
+        return (self._width, self._height, self._num_mines, self._seed, self._chunk_size, chunks, self._num_flagged_fields,
+                self._num_correct_flags, self._num_opened_fields, tuple(self._num_opened_by_number))
+    
+    # sets back a snapshot. EVENT_RESET is only published when the chunks and counters are restored, so
+    # that subscribers read the restored fields
+    def restore(self, snapshot):
+        self._width, self._height, self._num_mines, seed, self._chunk_size, chunks, num_flagged_fields, \
+            num_correct_flags, num_opened_fields, num_opened_by_number = snapshot
+        
+        self._clear_chunks(seed)
+        self._compressed_chunks = dict(chunks)
+        self._changed_chunks = set(chunks)
+        self._num_flagged_fields = num_flagged_fields
+        self._num_correct_flags = num_correct_flags
+        self._num_opened_fields = num_opened_fields
+        self._num_opened_by_number = list(num_opened_by_number)
+        
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+    
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+    
+    @property
+    def first_click(self):
+        return FIRST_CLICK_ANY
+    
+    @first_click.setter
+    def first_click(self, a):
+        if a != FIRST_CLICK_ANY:
+            raise ValueError("A ChunkedGamefield only supports FIRST_CLICK_ANY.")
@@ -5,17 +5,20 @@ Created on Tue Jan 10 08:45:17 2023
 @author: AMD
 """
 
-from PyQt5 import QtWidgets, uic
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 
-import math
+from gameclock import GameClock
+from pixmapcache import PixmapCache
 
 """
 
 Class for a display with graphical digits. You can set the number with Counter.number and the width with
-Counter.width. Or you can start/stop a count-up with Counter.start/Counter.stop.
+Counter.width. Or you can start/stop a count-up of the seconds of a GameClock with Counter.start/Counter.stop.
+Negative numbers are shown with a minus sign in the first place, numbers which do not fit are shown as the
+largest or smallest number that does. The display keeps one pixmap item per place and only swaps the
+pixmaps of the places whose digit has changed.
 
 """
 class Counter(QGraphicsView):
@@ -36,85 +39,124 @@ class Counter(QGraphicsView):
         
     _DEFAULT_WIDTH = 3
     _DEFAULT_NUMBER = 0
+    
+    _glyphs = None      # character ("0" - "9" or "-") -> QPixmap, shared by all counters, see _get_glyphs
         
     def __init__(self, name, parent=None):
         super(QGraphicsView,self).__init__(parent)
         
         self._number = self._DEFAULT_NUMBER     # current number to display
         self._width = self._DEFAULT_WIDTH       # number of the digits to display, e.g. 4 for 1234, 3 for 123, ...
+        self._digit_items = []                  # one QGraphicsPixmapItem per place, from left to right
+        self._shown_text = ""                   # characters the digit items show at the moment
         
-        self._timer = QTimer(self)              # timer for countdown/-up
+        self._clock = None                      # GameClock of the count-up, None if it is stopped
+        self._timer = QTimer(self)              # refreshes the count-up at the next full second of the clock
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
         self._timer.timeout.connect(self._on_timer_timeout)
         
         self.setMaximumHeight(self._IMG_HEIGHT)
         self.setMinimumHeight(self._IMG_HEIGHT)
-        self.setMaximumWidth(self._IMG_WIDTH * self._width)
-        self.setMinimumWidth(self._IMG_WIDTH * self._width)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setFrameShape(QFrame.NoFrame)
         
-        self.graphicsScene = QGraphicsScene(0, 0, self._IMG_WIDTH * self._width, self._IMG_HEIGHT)
+        self.graphicsScene = QGraphicsScene(self)
         self.setScene(self.graphicsScene)
         
-        self._update()
+        self._update_width()
         
+    # returns the pixmaps of the digits and of the minus sign, which are created with the first counter.
+    # There is no image of the minus sign: it is drawn as a middle segment in the color of the lit
+    # segments on the background of the digit-images
+    @classmethod
+    def _get_glyphs(cls):
+        if cls._glyphs is None:
+            cls._glyphs = {str(digit): PixmapCache.get_pixmap(path) for digit, path in enumerate(cls._IMG_DIGIT_PATHS)}
+            
+            middle = cls._IMG_HEIGHT // 2
+            background = cls._glyphs["0"].toImage().pixelColor(cls._IMG_WIDTH // 2, middle)    # the 0 has no middle segment
+            segment = cls._glyphs["8"].toImage().pixelColor(cls._IMG_WIDTH // 2, middle)
+            
+            minus = QPixmap(cls._IMG_WIDTH, cls._IMG_HEIGHT)
+            minus.fill(background)
+            painter = QPainter(minus)
+            painter.fillRect(2, middle - 1, cls._IMG_WIDTH - 4, 3, segment)
+            painter.end()
+            cls._glyphs["-"] = minus
+            
+        return cls._glyphs
+    
+    # shows the whole seconds of the clock and waits for its next full second. Ticks delayed by a busy
+    # event loop are not lost, since the time is read from the clock
     def _on_timer_timeout(self):
-        self._number += 1
+        elapsed_ms = self._clock.elapsed_ms()
+        self._number = elapsed_ms // 1000
         self._update()
         
-    # update visual digits
+        if self._clock.is_running():
+            self._timer.start(1000 - elapsed_ms % 1000)
+        
+    # returns the characters to display for the number: width digits with leading zeros, or a minus sign
+    # and width - 1 digits
+    def _get_text(self):
+        if self._number < 0 and self._width > 1:
+            return "-%0*d" % (self._width - 1, min(-self._number, self._max_negative_number))
+        return "%0*d" % (self._width, min(max(self._number, 0), self._max_number))
+        
+    # update visual digits. Only the places whose character has changed get a new pixmap
     def _update(self):
-        self.graphicsScene.clear()
+        text = self._get_text()
+        if text == self._shown_text:
+            return
         
-        if self._number <= 0:
-            num_digits = 0
-        else:
-            num_digits = int(math.floor(math.log10(self._number))+1) # e.g. 4 for 1234, 3 for 123, 3 for 999, ...
-            
-        if num_digits > self._width:
-            num_digits = self._width
-            
-        if self._number < 0:
-            number_cpy = 0
-        else:
-            number_cpy = self._number
-            
-        # display the digits of the number_cpy in the graphics view. Begin with the last digit, e.g. 4
-        # of 1234. Then draw the 3, the 2, and then the 1.
-        for i in range(0, num_digits):
-            digit = number_cpy % 10 # get the last digit from number_cpy
-            number_cpy = int(math.floor(number_cpy / 10)) # remove the last digit from number_cpy
-            
-            image = QGraphicsPixmapItem(QPixmap(self._IMG_DIGIT_PATHS[digit]))
-            image.setPos(self._IMG_WIDTH * self._width - (i+1)*self._IMG_WIDTH, 0)
-            self.graphicsScene.addItem(image)
-            
-        # if the number has fewer digits than the width of the display, fill the places to the left
-        # with zeros
-        if num_digits < self._width:
-            for i in range(0, self._width - num_digits):
-                image = QGraphicsPixmapItem(QPixmap(self._IMG_DIGIT_PATHS[0]))
-                image.setPos(self._IMG_WIDTH * self._width - (i+1+num_digits)*self._IMG_WIDTH, 0)
-                self.graphicsScene.addItem(image)
-        
-    # called when a user has changed the width
+        glyphs = self._get_glyphs()
+        for item, char, shown_char in zip(self._digit_items, text, self._shown_text):
+            if char != shown_char:
+                item.setPixmap(glyphs[char])
+        self._shown_text = text
+        
+    # called when a user has changed the width. Creates the digit items for the new width
     def _update_width(self):
         self.setMaximumWidth(self._IMG_WIDTH * self._width)
         self.setMinimumWidth(self._IMG_WIDTH * self._width)
         
-        self.graphicsScene = QGraphicsScene(0, 0, self._IMG_WIDTH * self._width, self._IMG_HEIGHT)
-        self.setScene(self.graphicsScene)
+        # largest number and largest absolute value of a negative number that fit into the display
+        self._max_number = 10 ** self._width - 1
+        self._max_negative_number = 10 ** (self._width - 1) - 1
+        
+        self.graphicsScene.clear()
+        self.graphicsScene.setSceneRect(0, 0, self._IMG_WIDTH * self._width, self._IMG_HEIGHT)
+        
+        zero = self._get_glyphs()["0"]
+        self._digit_items = []
+        for i in range(self._width):
+            item = self.graphicsScene.addPixmap(zero)
+            item.setPos(i * self._IMG_WIDTH, 0)
+            self._digit_items.append(item)
+        self._shown_text = "0" * self._width
         
         self._update()
         
-    # starts the count-up
-    def start(self):
-        self._timer.start(1000)
+    # starts the count-up: the display follows the whole seconds of clock, a GameClock, which has to be
+    # resumed and paused by the caller. Without clock, a running clock starting at the current number is
+    # used
+    def start(self, clock = None):
+        if clock is None:
+            clock = GameClock(self._number)
+            clock.resume()
+            
+        self._clock = clock
+        self._on_timer_timeout()
     
-    # stops the count-up
+    # stops the count-up, showing the time of the clock at this moment
     def stop(self):
         self._timer.stop()
+        if self._clock is not None:
+            self._number = self._clock.elapsed_ms() // 1000
+            self._clock = None
+            self._update()
         
     @property
     def number(self):
@@ -136,6 +178,8 @@ class Counter(QGraphicsView):
     def width(self, a):
         if type(a) != int:
             raise TypeError("Only integers allowed!")
+        if a < 1:
+            raise ValueError("The counter needs at least one digit.")
             
         self._width = a
         self._update_width()
\ No newline at end of file
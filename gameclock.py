@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+import time
+
+"""
+
+Clock for the elapsed time of a game, which can be paused and resumed. The time is measured with a
+monotonic high-resolution clock (time.perf_counter by default) instead of counting timer ticks, so it
+stays accurate when the event loop is busy, and it can be read without a GUI. A new clock is paused.
+
+"""
+class GameClock:
+    def __init__(self, elapsed = 0.0, clock = time.perf_counter):
+        self._clock = clock
+        self._elapsed = elapsed         # seconds elapsed before the last resume
+        self._resumed_at = None         # time of clock at the last resume, None while paused
+    
+    # starts the clock or lets it run on after a pause. Does nothing if it is running
+    def resume(self):
+        if self._resumed_at is None:
+            self._resumed_at = self._clock()
+    
+    # stops the clock, resume lets it run on from the same time. Does nothing if it is paused
+    def pause(self):
+        if self._resumed_at is not None:
+            self._elapsed += self._clock() - self._resumed_at
+            self._resumed_at = None
+    
+    # stops the clock and sets its time to elapsed seconds, e.g. of a loaded game
+    def reset(self, elapsed = 0.0):
+        self._elapsed = elapsed
+        self._resumed_at = None
+    
+    def is_running(self):
+        return self._resumed_at is not None
+    
+    # returns the elapsed time in seconds
+    def elapsed(self):
+        if self._resumed_at is None:
+            return self._elapsed
+        return self._elapsed + self._clock() - self._resumed_at
+    
+    # returns the elapsed time in whole milliseconds
+    def elapsed_ms(self):
+        return int(self.elapsed() * 1000)
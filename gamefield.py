@@ -0,0 +1,1125 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Jan  9 10:03:44 2023
+
+@author: AMD
+"""
+
+import random
+import re
+from array import array
+from collections import deque
+
+# actions of the moves passed to a move log, see Gamefield.set_move_log
+MOVE_OPEN = "o"
+MOVE_FLAG = "f"
+MOVE_UNFLAG = "u"
+MOVE_CHORD = "c"
+
+# events passed to the subscribers of a Gamefield together with the coordinates of the affected fields,
+# see Gamefield.subscribe
+EVENT_FIELDS_OPENED = "fields_opened"
+EVENT_FLAG_SET = "flag_set"
+EVENT_FLAG_REMOVED = "flag_removed"
+EVENT_MINE_HIT = "mine_hit"
+EVENT_GAME_WON = "game_won"
+EVENT_RESET = "reset"
+
+# when the mines are placed, see Gamefield.first_click: at reset, or at the first open_field, which is
+# then always safe, optionally together with the 3x3 area around it, or at reset on a minefield which
+# can be solved without guessing from its start field
+FIRST_CLICK_ANY = 0
+FIRST_CLICK_SAFE = 1
+FIRST_CLICK_SAFE_AREA = 2
+FIRST_CLICK_NO_GUESS = 3
+
+# number of fields whose neighbouring mines are counted at once when the mines are placed, so that the
+# big integers of count_neighbouring_mines stay small on large minefields
+BAND_FIELDS = 2**18
+
+
+# returns a bytearray with the number of neighbouring mines of each field of a width x height minefield,
+# with mines one byte 0 or 1 per field (index = i * width + j). The whole minefield is computed at once:
+# the mines are read as one big integer with one byte per field, so shifting it by one byte (or by one
+# row) moves every mine one field to the side (or one row up or down). Summing the shifted copies adds
+# up the mines in every 3x3-block without carries between fields, since a sum never exceeds 9
+def count_neighbouring_mines(mines, width, height):
+    num_fields = len(mines)
+    
+    grid = int.from_bytes(mines, "little")
+    
+    # masks removing mines that have been shifted over the left or right edge into the next row
+    no_first_column = int.from_bytes((b"\x00" + b"\xff" * (width - 1)) * height, "little")
+    no_last_column = int.from_bytes((b"\xff" * (width - 1) + b"\x00") * height, "little")
+    
+    rows = grid + ((grid << 8) & no_first_column) + ((grid >> 8) & no_last_column)
+    blocks = rows + (rows << 8 * width) + (rows >> 8 * width)
+    blocks &= (1 << 8 * num_fields) - 1
+    
+    # the 3x3-blocks include the field itself
+    return bytearray((blocks - grid).to_bytes(num_fields, "little"))
+
+
+# returns the field (i, j) a minefield with FIRST_CLICK_NO_GUESS is solved from, the middle of the minefield
+def get_start_field(width, height):
+    return height // 2, width // 2
+
+
+"""
+
+Data-class for a field in the minefield. Holds essential data for the field.
+
+"""
+class Field:
+    def __init__(self, i, j, is_mine = False, is_flagged = False, is_open = False):
+        self.is_mine = is_mine
+        self.is_flagged = is_flagged
+        self.is_open = is_open              # if the player has opened this field
+        
+        self.neighbors = []                 # list of neighbors of the field, including fields with mines
+        self.num_neighbouring_mines = 0     # number of neighbors with mines
+        
+        self.coordinates = (i, j)
+
+
+
+
+
+
+
+
+
+"""
+
+Class for a minefield. Holds and alters the game state. Does not handle the GUI.
+
+"""
+class Gamefield:
+    # bits of the states of get_states and set_state
+    STATE_MINE = 1
+    STATE_OPEN = 2
+    STATE_FLAG = 4
+    
+    _VALID_STATES = bytes(range(8))
+    _STATE_MINE_TABLE = bytes(c & 1 for c in range(256))
+    _STATE_OPEN_TABLE = bytes(c >> 1 & 1 for c in range(256))
+    
+    def __init__(self, width = 10, height = 10, num_mines = 10, seed = None, first_click = FIRST_CLICK_ANY, progress = None):
+        self._field = [[]]              # 2-dimensional array with fields (instances of Field-class) in it
+        self._num_mines = num_mines     # number of mines in the minefield
+        self._num_flagged_fields = 0
+        self._num_correct_flags = 0
+        self._num_opened_fields = 0
+        self._num_opened_by_number = [0] * 9    # number of opened fields with 0, 1, ..., 8 neighbouring mines
+        self._mine_indices = None       # sorted indices i * width + j of all mines, see get_mine_positions
+        self._seed = None               # seed the current mine distribution was generated with
+        self._first_click = first_click # FIRST_CLICK_-constant, see first_click
+        self._are_mines_placed = False  # False until the first open_field with deferred mine placement
+        self._last_opened_fields = []   # coordinates of the fields opened by the last call of open_field
+        self._move_log = None           # receives all moves if set, see set_move_log
+        self._subscribers = []          # callbacks receiving the events, see subscribe
+        self._progress = progress       # callback receiving the progress of placing the mines, see set_progress
+        
+        self._height = height
+        self._width = width
+        
+        self.reset(seed)
+        
+    # returns a bytearray with one byte per field (index = i * width + j) which is 1 if the field is a
+    # mine and 0 otherwise. The mines are drawn one after another from a random generator seeded with
+    # seed, and a field which already is a mine is drawn again, which gives every distribution of the
+    # mines the same chance without holding a list of all indices. The fields with the indices in
+    # excluded get no mines: they count as drawn already. If mines is given, the mines are drawn into
+    # it instead, by setting mine_bit in the byte of each mine; mine_bit must not be set in it before
+    def _sample_mines(self, seed, excluded = (), mines = None, mine_bit = 1):
+        num_fields = self._width * self._height
+        rand = random.Random(seed)
+        if mines is None:
+            mines = bytearray(num_fields)
+            
+        excluded = set(excluded)
+        num_choices = num_fields - len(excluded)
+        
+        # if more than half of the fields are mines, draw the free fields instead and invert the fields
+        # at the end, so that at most half of the draws hit a field drawn before
+        is_inverted = 2 * self._num_mines > num_choices
+        num_draws = num_choices - self._num_mines if is_inverted else self._num_mines
+        
+        for k in excluded:
+            mines[k] |= mine_bit
+            
+        # the draws are split into as many parts as there are bands (see _count_neighbouring_mines_in_bands),
+        # after each of which the progress is reported
+        getrandbits = rand.getrandbits
+        num_bits = num_fields.bit_length()
+        num_bands = self._get_num_bands()
+        for n in range(num_bands):
+            num_band_draws = num_draws * (n + 1) // num_bands - num_draws * n // num_bands
+            while num_band_draws:
+                k = getrandbits(num_bits)
+                if k < num_fields:
+                    c = mines[k]
+                    if not c & mine_bit:
+                        mines[k] = c | mine_bit
+                        num_band_draws -= 1
+            self._report_progress(n + 1, 2 * num_bands)
+            
+        # the excluded fields have been drawn, so inverting the fields frees them too
+        if is_inverted:
+            table = bytes(c ^ mine_bit for c in range(256))
+            for start in range(0, num_fields, BAND_FIELDS):
+                mines[start:start + BAND_FIELDS] = mines[start:start + BAND_FIELDS].translate(table)
+        else:
+            for k in excluded:
+                mines[k] &= ~mine_bit
+                
+        return mines
+    
+    # returns the indices of the fields which get no mines if the first open_field is at (i, j), see
+    # first_click. The 3x3 area is only kept free if there are enough other fields for the mines
+    def _get_safe_indices(self, i, j):
+        if self._first_click == FIRST_CLICK_ANY:
+            return []
+        
+        k = i * self._width + j
+        if self._first_click in (FIRST_CLICK_SAFE_AREA, FIRST_CLICK_NO_GUESS):
+            area = [(i + di) * self._width + j + dj for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                    if 0 <= i + di < self._height and 0 <= j + dj < self._width]
+            if self._width * self._height - len(area) >= self._num_mines:
+                return area
+            
+        return [k] if self._width * self._height - 1 >= self._num_mines else []
+    
+    # returns the sorted indices of the mines in mines (one byte 0 or 1 per field, see _sample_mines) as
+    # an array of 4-byte integers. Searches with bytearray.find, so only the mines are visited in Python
+    def _find_mine_indices(self, mines):
+        indices = array("I")
+        k = mines.find(1)
+        while k != -1:
+            indices.append(k)
+            k = mines.find(1, k + 1)
+            
+        return indices
+    
+    # returns the number of rows of a band of _count_neighbouring_mines_in_bands
+    def _get_num_band_rows(self):
+        return max(BAND_FIELDS // self._width, 1)
+    
+    # returns the number of bands of _count_neighbouring_mines_in_bands
+    def _get_num_bands(self):
+        return -(-self._height // self._get_num_band_rows())
+    
+    # raises ValueError if seed is None and the minefield has FIRST_CLICK_NO_GUESS: only a seed which has
+    # been checked with the solver gives a minefield that can be solved without guessing
+    def _check_seed(self, seed):
+        if seed is None and self._first_click == FIRST_CLICK_NO_GUESS:
+            raise ValueError("A minefield with FIRST_CLICK_NO_GUESS needs a seed from noguess.find_no_guess_seed or a noguess.NoGuessPool.")
+            
+    # calls the progress callback, see set_progress
+    def _report_progress(self, num_done, num_steps):
+        if self._progress is not None:
+            self._progress(num_done, num_steps)
+            
+    # returns a bytearray with the number of neighbouring mines of each field for the mines from
+    # _sample_mines, see count_neighbouring_mines
+    def _count_neighbouring_mines(self, mines):
+        num_neighbouring_mines = bytearray(len(mines))
+        for start, stop, counts in self._count_neighbouring_mines_in_bands(mines):
+            num_neighbouring_mines[start:stop] = counts
+            
+        return num_neighbouring_mines
+    
+    # yields the numbers of neighbouring mines for the mines from _sample_mines band by band, as tuples
+    # (start, stop, counts) with the counts of the fields with the indices start to stop - 1. Every band
+    # of rows holds about BAND_FIELDS fields and is counted together with the rows above and below it,
+    # so memory only grows with the size of a band. With mine_table, mines holds other bits too, and
+    # each band is translated to 0 or 1 per field with it first
+    def _count_neighbouring_mines_in_bands(self, mines, mine_table = None):
+        width = self._width
+        height = self._height
+        num_rows = self._get_num_band_rows()
+        
+        for first_row in range(0, height, num_rows):
+            stop_row = min(first_row + num_rows, height)
+            top = max(first_row - 1, 0)
+            bottom = min(stop_row + 1, height)
+            
+            band = mines[top * width:bottom * width]
+            if mine_table is not None:
+                band = band.translate(mine_table)
+            counts = count_neighbouring_mines(band, width, bottom - top)
+            yield first_row * width, stop_row * width, counts[(first_row - top) * width:(stop_row - top) * width]
+        
+    # opens all neighbors of a field with zero mines and also adjacent fields to fields with zero mines.
+    # Works through a queue instead of recursion, so every field is visited only once and large free
+    # areas do not hit the recursion limit. Returns the coordinates of the opened fields
+    def _open_free_fields(self, field):
+        opened = []
+        queue = deque([field])
+        while queue:
+            for neighbor in queue.popleft().neighbors:
+                if neighbor.is_open:
+                    continue
+                
+                neighbor.is_open = True
+                self._num_opened_fields += 1
+                self._num_opened_by_number[neighbor.num_neighbouring_mines] += 1
+                opened.append(neighbor.coordinates)
+                if neighbor.num_neighbouring_mines == 0:
+                    queue.append(neighbor)
+                    
+        return opened
+        
+    # opens a field. Returns False if field was a mine. Also, if the field has zero mines, opens
+    # all neighbors of the field with zero mines and also adjacent fields to fields with zero mines.
+    # The opened fields can be read with get_last_opened_fields
+    def open_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_OPEN, i, j)
+        if not self._are_mines_placed:
+            self._place_mines(self._get_safe_indices(i, j))
+            
+        field = self._field[i][j]
+        self._last_opened_fields = []
+        
+        if field.is_mine:
+            if self._subscribers:
+                self._publish(EVENT_MINE_HIT, [(i, j)])
+            return False
+        
+        if not field.is_open:
+            self._num_opened_fields += 1
+            self._num_opened_by_number[field.num_neighbouring_mines] += 1
+            self._last_opened_fields.append(field.coordinates)
+        field.is_open = True
+        
+        # open all fields with zero mines
+        if field.num_neighbouring_mines == 0:
+            self._last_opened_fields += self._open_free_fields(field)
+            
+        if self._subscribers:
+            self._publish_changes(EVENT_FIELDS_OPENED, self._last_opened_fields)
+        
+        return True
+    
+    # opens all closed, unflagged neighbors of the open field (i, j) at once if it has as many flagged
+    # neighbors as neighbouring mines, including the cascades of neighbors with zero mines. Returns False
+    # if a flag was wrong and a mine has been opened; the other neighbors are opened anyway. The opened
+    # fields of all cascades can be read with get_last_opened_fields
+    def chord_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_CHORD, i, j)
+            
+        field = self._field[i][j]
+        self._last_opened_fields = []
+        
+        if not field.is_open or sum(neighbor.is_flagged for neighbor in field.neighbors) != field.num_neighbouring_mines:
+            return True
+        
+        mines_hit = []
+        opened = []
+        for neighbor in field.neighbors:
+            if neighbor.is_open or neighbor.is_flagged:
+                continue
+            if neighbor.is_mine:
+                mines_hit.append(neighbor.coordinates)
+                continue
+            
+            neighbor.is_open = True
+            self._num_opened_fields += 1
+            self._num_opened_by_number[neighbor.num_neighbouring_mines] += 1
+            opened.append(neighbor.coordinates)
+            if neighbor.num_neighbouring_mines == 0:
+                opened += self._open_free_fields(neighbor)
+                
+        self._last_opened_fields = opened
+        
+        if self._subscribers:
+            self._publish_chord(mines_hit)
+        
+        return not mines_hit
+    
+    def set_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_FLAG, i, j)
+        
+        is_new_flag = not self._field[i][j].is_flagged
+        if is_new_flag:
+            self._num_flagged_fields += 1
+            if self._field[i][j].is_mine:
+                self._num_correct_flags += 1
+            
+        self._field[i][j].is_flagged = True
+        
+        if is_new_flag and self._subscribers:
+            self._publish_changes(EVENT_FLAG_SET, [(i, j)])
+        
+    def remove_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_UNFLAG, i, j)
+        
+        was_flagged = self._field[i][j].is_flagged
+        if was_flagged:
+            self._num_flagged_fields -= 1
+            if self._field[i][j].is_mine:
+                self._num_correct_flags -= 1
+            
+        self._field[i][j].is_flagged = False
+        
+        if was_flagged and self._subscribers:
+            self._publish_changes(EVENT_FLAG_REMOVED, [(i, j)])
+        
+    def is_flagged(self, i, j):
+        return self._field[i][j].is_flagged
+    
+    def is_open(self, i, j):
+        return self._field[i][j].is_open
+    
+    def is_mine(self, i, j):
+        return self._field[i][j].is_mine
+    
+    def get_num_neighbouring_mines(self, i, j):
+        return self._field[i][j].num_neighbouring_mines
+    
+    def get_num_flagged_fields(self):
+        return self._num_flagged_fields
+    
+    def get_num_correct_flags(self):
+        return self._num_correct_flags
+    
+    def get_num_opened_fields(self):
+        return self._num_opened_fields
+    
+    # number of fields without a mine which are still closed. The game is over when it is zero
+    def get_num_closed_safe_fields(self):
+        return self._width * self._height - self._num_mines - self._num_opened_fields
+    
+    # returns a list with the numbers of opened fields with 0, 1, ..., 8 neighbouring mines
+    def get_num_opened_fields_by_number(self):
+        return list(self._num_opened_by_number)
+    
+    # returns the coordinates of all mines, e.g. to show them when the game is lost. The indices of the
+    # mines are only searched by the first call after the mines have been placed and then kept, so
+    # placing the mines does not build them for every game
+    def get_mine_positions(self):
+        if self._mine_indices is None:
+            self._mine_indices = self._find_mine_indices(self.get_states().translate(self._STATE_MINE_TABLE))
+        
+        width = self._width
+        return [divmod(k, width) for k in self._mine_indices]
+    
+    # returns the coordinates of all fields the last call of open_field has opened
+    def get_last_opened_fields(self):
+        return self._last_opened_fields
+    
+    # returns the number of fields the last call of open_field has opened
+    def get_num_last_opened_fields(self):
+        return len(self._last_opened_fields)
+    
+    # records every following open_field, chord_field, set_flag and remove_flag by calling
+    # move_log.append(action, i, j) with action MOVE_OPEN, MOVE_CHORD, MOVE_FLAG or MOVE_UNFLAG, e.g.
+    # into a movelog.MoveLog. None stops the recording. reset, set_state and restore stop it too, since the moves belong to one minefield
+    def set_move_log(self, move_log):
+        self._move_log = move_log
+        
+    def get_move_log(self):
+        return self._move_log
+    
+    # calls progress(num_done, num_steps) while the mines are placed, at reset or at the first open_field
+    # (see first_click): num_done of num_steps parts of drawing the mines and counting the neighbouring
+    # mines are done. progress may raise an exception to stop placing the mines, e.g. when the
+    # minefield is generated on a worker thread and is not needed anymore; the minefield must not be
+    # used then. None stops the reports
+    def set_progress(self, progress):
+        self._progress = progress
+    
+    # calls callback(event, fields) after every change of the minefield, with event one of the EVENT_-
+    # constants and fields a list of the coordinates of the affected fields: all fields opened by one
+    # open_field or chord_field, the flagged or unflagged field, the mines hit, or an empty list for
+    # EVENT_GAME_WON and EVENT_RESET (reset, set_state and restore). Without subscribers no events are
+    # created
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+        
+    def _publish(self, event, fields):
+        for callback in list(self._subscribers):
+            callback(event, fields)
+            
+    # publishes event with fields if any fields have changed and EVENT_GAME_WON if the game is won now
+    def _publish_changes(self, event, fields):
+        if not fields:
+            return
+        
+        self._publish(event, fields)
+        if self.is_game_won():
+            self._publish(EVENT_GAME_WON, [])
+            
+    # publishes the fields opened by chord_field and the mines hit by it
+    def _publish_chord(self, mines_hit):
+        self._publish_changes(EVENT_FIELDS_OPENED, self.get_last_opened_fields())
+        if mines_hit:
+            self._publish(EVENT_MINE_HIT, mines_hit)
+            
+    def get_field(self, i, j):
+        return self._field[i][j]
+    
+    def is_game_won(self):
+        return self._num_correct_flags + self._num_opened_fields == self._width * self._height
+    
+    # False until the first open_field if the mines are placed there, see first_click
+    def are_mines_placed(self):
+        return self._are_mines_placed
+    
+    # closes all fields, removes mines, redistributes mines randomly. The same seed always gives the
+    # same mine distribution; without a seed a new one is drawn, except for FIRST_CLICK_NO_GUESS, which
+    # needs a checked seed (see first_click)
+    def reset(self, seed = None):
+        self._check_seed(seed)
+        self._move_log = None
+        self._num_flagged_fields = 0
+        self._num_correct_flags = 0
+        self._num_opened_fields = 0
+        self._num_opened_by_number = [0] * 9
+        self._last_opened_fields = []
+        
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._seed = seed
+        
+        if len(self._field) == self._height and len(self._field[0]) == self._width:
+            self._clear_fields()
+        else:
+            self._create_fields()
+        
+        self._mine_indices = None
+        self._are_mines_placed = False
+        if self._first_click == FIRST_CLICK_ANY:
+            self._place_mines()
+        elif self._first_click == FIRST_CLICK_NO_GUESS:
+            self._place_mines(self._get_safe_indices(*self.get_start_field()))
+            
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+            
+    # distributes the mines with the seed of the minefield, without mines on the fields with the indices
+    # in excluded, and counts the neighbouring mines of all fields. Flags set before are kept
+    def _place_mines(self, excluded = ()):
+        mines = self._sample_mines(self._seed, excluded)
+        self._mine_indices = None
+        
+        # copy mines and number of neighbouring mines into the fields, band by band
+        self._num_correct_flags = 0
+        num_bands = self._get_num_bands()
+        for n, (start, stop, num_neighbouring_mines) in enumerate(self._count_neighbouring_mines_in_bands(mines)):
+            for k in range(start, stop):
+                field = self._field[k // self._width][k % self._width]
+                field.is_mine = mines[k] == 1
+                field.num_neighbouring_mines = num_neighbouring_mines[k - start]
+                self._num_correct_flags += field.is_mine and field.is_flagged
+            self._report_progress(num_bands + n + 1, 2 * num_bands)
+            
+        self._are_mines_placed = True
+                
+    # creates closed fields without mines for the current width and height and gets the neighbors of
+    # each field. The Field-instances of the old size are reused as far as they reach, only the missing
+    # ones are created
+    def _create_fields(self):
+        num_fields = self._width * self._height
+        fields = [field for row in self._field for field in row]
+        del fields[num_fields:]
+        fields += [Field(*divmod(k, self._width)) for k in range(len(fields), num_fields)]
+        self._field = [fields[i * self._width:(i + 1) * self._width] for i in range(self._height)]
+        
+        for i in range(self._height):
+            for j in range(self._width):
+                field = self._field[i][j]
+                field.coordinates = (i, j)
+                field.is_mine = False
+                field.is_flagged = False
+                field.is_open = False
+                field.num_neighbouring_mines = 0
+                
+                neighbors = []
+                if i < self._height - 1:
+                    neighbors.append(self._field[i+1][j])
+                if i > 0:
+                    neighbors.append(self._field[i-1][j])
+                if j < self._width - 1:
+                    neighbors.append(self._field[i][j+1])
+                if j > 0:
+                    neighbors.append(self._field[i][j-1])
+                if i < self._height - 1 and j < self._width - 1:
+                    neighbors.append(self._field[i+1][j+1])
+                if i > 0 and j < self._width - 1:
+                    neighbors.append(self._field[i-1][j+1])
+                if i > 0 and j > 0:
+                    neighbors.append(self._field[i-1][j-1])
+                if i < self._height - 1 and j > 0:
+                    neighbors.append(self._field[i+1][j-1])
+                    
+                field.neighbors = neighbors
+                
+    # closes all fields and removes their mines. The Field-instances and their neighbors are kept, so
+    # a reset with an unchanged size does not build the minefield anew
+    def _clear_fields(self):
+        for row in self._field:
+            for field in row:
+                field.is_mine = False
+                field.is_flagged = False
+                field.is_open = False
+                field.num_neighbouring_mines = 0
+                
+    # checks the arguments of set_state and sets the size of the minefield
+    def _check_state(self, width, height, num_mines, states):
+        if type(width) != int or type(height) != int or type(num_mines) != int:
+            raise TypeError("The height, width and number of mines of the minefield must be integers.")
+        if len(states) != width * height:
+            raise ValueError("There must be one state per field.")
+        if states.translate(None, self._VALID_STATES):
+            raise ValueError("Invalid state of a field.")
+        
+        # states without mines and open fields belong to a minefield whose mines are placed at the first
+        # open_field, see first_click
+        num_state_mines = states.translate(self._STATE_MINE_TABLE).count(1)
+        are_mines_placed = num_state_mines == num_mines
+        if not are_mines_placed and (num_state_mines or states.translate(self._STATE_OPEN_TABLE).count(1)):
+            raise ValueError("The number of mines in the states is not num_mines.")
+            
+        self._width = width
+        self._height = height
+        self._num_mines = num_mines
+        self._are_mines_placed = are_mines_placed
+        
+    # returns the state of all fields as a bytearray with one byte per field (index = i * width + j),
+    # which is the sum of STATE_MINE, STATE_OPEN and STATE_FLAG if the field is a mine, open or flagged
+    def get_states(self):
+        return bytearray(field.is_mine | field.is_open << 1 | field.is_flagged << 2 for row in self._field for field in row)
+    
+    # replaces the whole state of the minefield by the given size, seed and states (see get_states).
+    # The numbers of neighbouring mines and the counters are computed from the states. The Field-
+    # instances are only created anew if the size changes. The whole minefield has to be redrawn
+    def set_state(self, width, height, num_mines, seed, states):
+        is_new_size = (width, height) != (self._width, self._height)
+        self._check_state(width, height, num_mines, states)
+        self._seed = seed
+        self._move_log = None
+        self._last_opened_fields = []
+        
+        if is_new_size:
+            self._create_fields()
+            
+        mines = states.translate(self._STATE_MINE_TABLE)
+        num_neighbouring_mines = self._count_neighbouring_mines(mines)
+        self._mine_indices = None
+        self._num_flagged_fields = 0
+        self._num_correct_flags = 0
+        self._num_opened_fields = 0
+        self._num_opened_by_number = [0] * 9
+        for i in range(height):
+            for j in range(width):
+                k = i * width + j
+                field = self._field[i][j]
+                field.is_mine = bool(states[k] & self.STATE_MINE)
+                field.is_open = bool(states[k] & self.STATE_OPEN)
+                field.is_flagged = bool(states[k] & self.STATE_FLAG)
+                field.num_neighbouring_mines = num_neighbouring_mines[k]
+                
+                self._num_opened_fields += field.is_open
+                self._num_opened_by_number[field.num_neighbouring_mines] += field.is_open
+                self._num_flagged_fields += field.is_flagged
+                self._num_correct_flags += field.is_flagged and field.is_mine
+                
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+                
+    # returns a copy of the whole state of the minefield, which restore sets back. Snapshots can only
+    # be restored into a minefield of the same class
+    def snapshot(self):
+        return self._width, self._height, self._num_mines, self._seed, self.get_states()
+    
+    def restore(self, snapshot):
+        self.set_state(*snapshot)
+        
+    @property
+    def num_mines(self):
+        return self._num_mines
+    
+    @num_mines.setter
+    def num_mines(self, a):
+        if type(a) != int:
+            raise TypeError("The number of mines must be an integer.")
+        if a >= self._height * self._width:
+            raise ValueError("There cannot be more mines than fields.")
+        self._check_seed(None)
+        
+        self._num_mines = a
+        self.reset()
+        
+    @property
+    def height(self):
+        return self._height
+    
+    @height.setter
+    def height(self, a):
+        if type(a) != int:
+            raise TypeError("The height and width of the minefield must be an integer.")
+        self._check_seed(None)
+        
+        self._height = a
+        self.reset()
+        
+    @property
+    def width(self):
+        return self._width
+    
+    @width.setter
+    def width(self, a):
+        if type(a) != int:
+            raise TypeError("The height and width of the minefield must be an integer.")
+        self._check_seed(None)
+        
+        self._width = a
+        self.reset()
+        
+    # changes the width, the height and the number of mines at once and resets the minefield with seed
+    # (see reset), so it is built only once instead of once per setter. The storage of the fields is
+    # reused as far as it reaches: the cells of an ArrayGamefield, the Field-instances of a Gamefield.
+    # Raises TypeError or ValueError for an invalid size, or without a seed for FIRST_CLICK_NO_GUESS,
+    # the minefield stays unchanged then
+    def configure(self, width, height, num_mines, seed = None):
+        if type(width) != int or type(height) != int or type(num_mines) != int:
+            raise TypeError("The height, width and number of mines of the minefield must be integers.")
+        if width < 1 or height < 1:
+            raise ValueError("The height and width of the minefield must be at least 1.")
+        if num_mines < 0:
+            raise ValueError("The number of mines cannot be negative.")
+        if num_mines >= width * height:
+            raise ValueError("There cannot be more mines than fields.")
+        self._check_seed(seed)
+        
+        self._width = width
+        self._height = height
+        self._num_mines = num_mines
+        self.reset(seed)
+            
+    # seed of the current mine distribution. Passing it to reset() restores the same minefield
+    @property
+    def seed(self):
+        return self._seed
+    
+    # field (i, j) from which a minefield with FIRST_CLICK_NO_GUESS can be solved without guessing,
+    # None for the other modes of the first click
+    def get_start_field(self):
+        if self._first_click != FIRST_CLICK_NO_GUESS:
+            return None
+        return get_start_field(self._width, self._height)
+    
+    # FIRST_CLICK_ANY places the mines at reset. FIRST_CLICK_SAFE and FIRST_CLICK_SAFE_AREA make reset
+    # cheap and place the mines at the first open_field, without a mine on the opened field or the 3x3
+    # area around it. The same seed and first open_field always give the same mine distribution.
+    # FIRST_CLICK_NO_GUESS places the mines at reset, without a mine in the 3x3 area around the start
+    # field (see get_start_field). The minefield is not checked again: it can only be solved from there
+    # without guessing with a seed found by noguess.find_no_guess_seed or taken from a noguess.NoGuessPool,
+    # so reset, configure and the setters of the size raise ValueError without a seed. A change applies
+    # from the next reset, or, except for FIRST_CLICK_NO_GUESS, to the mines of the current minefield if
+    # they are not placed yet
+    @property
+    def first_click(self):
+        return self._first_click
+    
+    @first_click.setter
+    def first_click(self, a):
+        if a not in (FIRST_CLICK_ANY, FIRST_CLICK_SAFE, FIRST_CLICK_SAFE_AREA, FIRST_CLICK_NO_GUESS):
+            raise ValueError("first_click must be FIRST_CLICK_ANY, FIRST_CLICK_SAFE, FIRST_CLICK_SAFE_AREA or FIRST_CLICK_NO_GUESS.")
+            
+        self._first_click = a
+        
+        
+        
+    
+        
+    
+    
+    
+        
+"""
+
+Minefield with the same interface as Gamefield, but without Field-instances. The state of all fields
+is held in one flat bytearray with one byte per field (index = i * width + j): the lower four bits hold
+the number of neighbouring mines, the upper bits whether the field is a mine, open or flagged.
+Neighbors are computed from the index. Suited for large minefields.
+
+"""
+class ArrayGamefield(Gamefield):
+    _COUNT_MASK = 0x0F
+    _MINE = 0x10
+    _OPEN = 0x20
+    _FLAG = 0x40
+    
+    # runs of closed fields with zero neighbouring mines (flagged or not), of closed fields with
+    # neighbouring mines and of closed fields in general
+    _CLOSED_ZERO_RUN = re.compile(rb"[\x00\x40]+")
+    _CLOSED_NUMBER_RUN = re.compile(rb"[\x01-\x1f\x41-\x5f]+")
+    _CLOSED_RUN = re.compile(rb"[\x00-\x1f\x40-\x5f]+")
+    
+    # translation table which opens every field
+    _OPEN_TABLE = bytes(c | 0x20 for c in range(256))
+    # translation table which opens every field except closed fields with zero neighbouring mines
+    _OPEN_NUMBERS_TABLE = bytes(c if c in (0x00, 0x40) else c | 0x20 for c in range(256))
+    
+    # translation tables from the cells to the states of get_states, to 1 for open fields, to 1 for
+    # flagged fields and to 1 for flagged mines
+    _STATE_TABLE = bytes(c >> 4 & 0x07 for c in range(256))
+    _MINE_BIT_TABLE = bytes(c >> 4 & 1 for c in range(256))
+    _OPEN_BIT_TABLE = bytes(c >> 5 & 1 for c in range(256))
+    _FLAG_BIT_TABLE = bytes(c >> 6 & 1 for c in range(256))
+    _CORRECT_FLAG_TABLE = bytes(int(c & 0x50 == 0x50) for c in range(256))
+    # translation table from the cells to their number of neighbouring mines, and from open cells to
+    # their number and closed cells to 9
+    _COUNT_TABLE = bytes(c & 0x0F for c in range(256))
+    _OPEN_COUNT_TABLE = bytes(c & 0x0F if c & 0x20 else 9 for c in range(256))
+    
+    def __init__(self, width = 10, height = 10, num_mines = 10, seed = None, first_click = FIRST_CLICK_ANY, progress = None):
+        self._cells = bytearray()       # one byte per field, see above
+        self._last_opened_runs = []     # (start, stop)-ranges of indices opened by the last open_field
+        
+        super().__init__(width, height, num_mines, seed, first_click, progress)
+        
+    # returns the indices of all neighbors of the field with index k
+    def _neighbor_indices(self, k):
+        width = self._width
+        i, j = divmod(k, width)
+        
+        neighbors = []
+        has_left = j > 0
+        has_right = j < width - 1
+        if i > 0:
+            if has_left:
+                neighbors.append(k - width - 1)
+            neighbors.append(k - width)
+            if has_right:
+                neighbors.append(k - width + 1)
+        if has_left:
+            neighbors.append(k - 1)
+        if has_right:
+            neighbors.append(k + 1)
+        if i < self._height - 1:
+            if has_left:
+                neighbors.append(k + width - 1)
+            neighbors.append(k + width)
+            if has_right:
+                neighbors.append(k + width + 1)
+                
+        return neighbors
+    
+    # opens the fields in the range start:stop of the row beginning at index row_start. With
+    # only_numbers, closed fields with zero neighbouring mines are left closed. Returns the
+    # (start, stop)-ranges of the fields that have been opened
+    def _open_segment(self, row_start, start, stop, only_numbers = False):
+        cells = self._cells
+        segment = cells[row_start + start:row_start + stop]
+        
+        closed_run = self._CLOSED_NUMBER_RUN if only_numbers else self._CLOSED_RUN
+        runs = [(row_start + start + m.start(), row_start + start + m.end()) for m in closed_run.finditer(segment)]
+        for run_start, run_stop in runs:
+            self._num_opened_fields += run_stop - run_start
+            
+        table = self._OPEN_NUMBERS_TABLE if only_numbers else self._OPEN_TABLE
+        cells[row_start + start:row_start + stop] = segment.translate(table)
+        
+        return runs
+    
+    # opens the closed field with index k, which has zero neighbouring mines, all of its neighbors and,
+    # as long as there are fields with zero neighbouring mines among them, their neighbors too. Works as
+    # a scanline fill: a whole run of zero-fields in a row is opened at once together with the fields
+    # above and below it, and only the first field of each run of zero-fields there is put on the stack.
+    # Every field is visited once. Returns the (start, stop)-ranges of the indices of the opened fields
+    def _open_free_fields(self, k):
+        cells = self._cells
+        width = self._width
+        height = self._height
+        
+        opened = []
+        stack = [k]
+        while stack:
+            k = stack.pop()
+            if cells[k] & self._OPEN:
+                continue            # already opened as part of another run
+            
+            i, j = divmod(k, width)
+            row_start = i * width
+            
+            # find the run of closed zero-fields around the field
+            left = j
+            while left > 0 and cells[row_start + left - 1] in (0x00, 0x40):
+                left -= 1
+            right = j + 1
+            m = self._CLOSED_ZERO_RUN.match(cells, row_start + right, row_start + width)
+            if m:
+                right = m.end() - row_start
+                
+            # open the run with the fields to its left and right
+            start = max(left - 1, 0)
+            stop = min(right + 1, width)
+            opened += self._open_segment(row_start, start, stop)
+            
+            # open the fields above and below the run. Runs of zero-fields there are opened later
+            # from the stack
+            for row in (i - 1, i + 1):
+                if row < 0 or row >= height:
+                    continue
+                
+                row_start = row * width
+                for m in self._CLOSED_ZERO_RUN.finditer(cells, row_start + start, row_start + stop):
+                    stack.append(m.start())
+                opened += self._open_segment(row_start, start, stop, only_numbers = True)
+                
+        return opened
+    
+    # adds the fields in the (start, stop)-ranges runs, which have just been opened, to the numbers of
+    # opened fields by number. The opened fields are joined and counted once per number
+    def _count_opened_numbers(self, runs):
+        opened = b"".join([self._cells[start:stop] for start, stop in runs]).translate(self._COUNT_TABLE)
+        num_opened_by_number = self._num_opened_by_number
+        for n in range(9):
+            num_opened_by_number[n] += opened.count(n)
+            
+    # opens a field. Returns False if field was a mine. Also, if the field has zero mines, opens
+    # all neighbors of the field with zero mines and also adjacent fields to fields with zero mines.
+    # The opened fields can be read with get_last_opened_fields
+    def open_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_OPEN, i, j)
+        if not self._are_mines_placed:
+            self._place_mines(self._get_safe_indices(i, j))
+            
+        k = i * self._width + j
+        cell = self._cells[k]
+        self._last_opened_runs = []
+        
+        if cell & self._MINE:
+            if self._subscribers:
+                self._publish(EVENT_MINE_HIT, [(i, j)])
+            return False
+        
+        if cell & self._COUNT_MASK == 0 and not cell & self._OPEN:
+            self._last_opened_runs = self._open_free_fields(k)
+            self._count_opened_numbers(self._last_opened_runs)
+        elif not cell & self._OPEN:
+            self._num_opened_fields += 1
+            self._num_opened_by_number[cell & self._COUNT_MASK] += 1
+            self._cells[k] = cell | self._OPEN
+            self._last_opened_runs = [(k, k + 1)]
+            
+        if self._subscribers:
+            self._publish_changes(EVENT_FIELDS_OPENED, self.get_last_opened_fields())
+            
+        return True
+    
+    # opens all closed, unflagged neighbors of the open field (i, j) at once if it has as many flagged
+    # neighbors as neighbouring mines, including the cascades of neighbors with zero mines. Returns False
+    # if a flag was wrong and a mine has been opened; the other neighbors are opened anyway. The opened
+    # fields of all cascades can be read with get_last_opened_fields
+    def chord_field(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_CHORD, i, j)
+            
+        cells = self._cells
+        k = i * self._width + j
+        cell = cells[k]
+        self._last_opened_runs = []
+        
+        neighbors = self._neighbor_indices(k)
+        if not cell & self._OPEN or sum(1 for n in neighbors if cells[n] & self._FLAG) != cell & self._COUNT_MASK:
+            return True
+        
+        mines_hit = []
+        opened = []
+        for n in neighbors:
+            neighbor = cells[n]             # read again, a cascade may have opened it
+            if neighbor & (self._OPEN | self._FLAG):
+                continue
+            if neighbor & self._MINE:
+                mines_hit.append(divmod(n, self._width))
+                continue
+            
+            if neighbor & self._COUNT_MASK == 0:
+                opened += self._open_free_fields(n)
+            else:
+                cells[n] = neighbor | self._OPEN
+                self._num_opened_fields += 1
+                opened.append((n, n + 1))
+                
+        self._count_opened_numbers(opened)
+        self._last_opened_runs = opened
+        
+        if self._subscribers:
+            self._publish_chord(mines_hit)
+        
+        return not mines_hit
+    
+    def set_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_FLAG, i, j)
+        
+        k = i * self._width + j
+        cell = self._cells[k]
+        if not cell & self._FLAG:
+            self._num_flagged_fields += 1
+            if cell & self._MINE:
+                self._num_correct_flags += 1
+                
+        self._cells[k] = cell | self._FLAG
+        
+        if not cell & self._FLAG and self._subscribers:
+            self._publish_changes(EVENT_FLAG_SET, [(i, j)])
+        
+    def remove_flag(self, i, j):
+        if self._move_log is not None:
+            self._move_log.append(MOVE_UNFLAG, i, j)
+        
+        k = i * self._width + j
+        cell = self._cells[k]
+        if cell & self._FLAG:
+            self._num_flagged_fields -= 1
+            if cell & self._MINE:
+                self._num_correct_flags -= 1
+                
+        self._cells[k] = cell & ~self._FLAG
+        
+        if cell & self._FLAG and self._subscribers:
+            self._publish_changes(EVENT_FLAG_REMOVED, [(i, j)])
+        
+    def is_flagged(self, i, j):
+        return bool(self._cells[i * self._width + j] & self._FLAG)
+    
+    def is_open(self, i, j):
+        return bool(self._cells[i * self._width + j] & self._OPEN)
+    
+    def is_mine(self, i, j):
+        return bool(self._cells[i * self._width + j] & self._MINE)
+    
+    def get_num_neighbouring_mines(self, i, j):
+        return self._cells[i * self._width + j] & self._COUNT_MASK
+    
+    # returns the coordinates of all fields the last call of open_field has opened
+    def get_last_opened_fields(self):
+        width = self._width
+        return [divmod(k, width) for start, stop in self._last_opened_runs for k in range(start, stop)]
+    
+    def get_num_last_opened_fields(self):
+        return sum(stop - start for start, stop in self._last_opened_runs)
+    
+    # returns a Field-instance holding a copy of the state of the field. Its neighbors are not filled in
+    def get_field(self, i, j):
+        cell = self._cells[i * self._width + j]
+        
+        field = Field(i, j, bool(cell & self._MINE), bool(cell & self._FLAG), bool(cell & self._OPEN))
+        field.num_neighbouring_mines = cell & self._COUNT_MASK
+        
+        return field
+    
+    # closes all fields, removes mines, redistributes mines randomly. The same seed always gives the
+    # same mine distribution; without a seed a new one is drawn, except for FIRST_CLICK_NO_GUESS, which
+    # needs a checked seed (see first_click)
+    def reset(self, seed = None):
+        self._check_seed(seed)
+        self._move_log = None
+        self._num_flagged_fields = 0
+        self._num_correct_flags = 0
+        self._num_opened_fields = 0
+        self._num_opened_by_number = [0] * 9
+        self._last_opened_runs = []
+        
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._seed = seed
+        
+        # all fields closed and without mines until the mines are placed. The cells are cleared in place,
+        # so a minefield with no more fields than before keeps its buffer
+        num_fields = self._width * self._height
+        del self._cells[num_fields:]
+        self._cells[:] = bytes(num_fields)
+        self._mine_indices = None
+        self._are_mines_placed = False
+        if self._first_click == FIRST_CLICK_ANY:
+            self._place_mines()
+        elif self._first_click == FIRST_CLICK_NO_GUESS:
+            self._place_mines(self._get_safe_indices(*self.get_start_field()))
+            
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+            
+    # distributes the mines with the seed of the minefield, without mines on the fields with the indices
+    # in excluded, and counts the neighbouring mines of all fields band by band. The mine bits are drawn
+    # right into the cells, so no other buffer of the size of the minefield is needed. Flags set before
+    # are kept
+    def _place_mines(self, excluded = ()):
+        self._sample_mines(self._seed, excluded, self._cells, self._MINE)
+        self._mine_indices = None
+        
+        # merge the numbers of neighbouring mines into the lower four bits of the cells, which are still 0
+        num_bands = self._get_num_bands()
+        bands = self._count_neighbouring_mines_in_bands(self._cells, self._MINE_BIT_TABLE)
+        for n, (start, stop, num_neighbouring_mines) in enumerate(bands):
+            cells = int.from_bytes(num_neighbouring_mines, "little") | int.from_bytes(self._cells[start:stop], "little")
+            self._cells[start:stop] = cells.to_bytes(stop - start, "little")
+            self._report_progress(num_bands + n + 1, 2 * num_bands)
+            
+        self._num_correct_flags = self._cells.translate(self._CORRECT_FLAG_TABLE).count(1) if self._num_flagged_fields else 0
+        self._are_mines_placed = True
+        
+    # returns the state of all fields as a bytearray with one byte per field (index = i * width + j),
+    # which is the sum of STATE_MINE, STATE_OPEN and STATE_FLAG if the field is a mine, open or flagged
+    def get_states(self):
+        return self._cells.translate(self._STATE_TABLE)
+    
+    # replaces the whole state of the minefield by the given size, seed and states (see get_states).
+    # The numbers of neighbouring mines and the counters are computed from the states. The whole
+    # minefield has to be redrawn
+    def set_state(self, width, height, num_mines, seed, states):
+        self._check_state(width, height, num_mines, states)
+        self._seed = seed
+        self._move_log = None
+        self._last_opened_runs = []
+        
+        # the bits of the states are the mine, open and flag bits of the cells shifted by four bits, so
+        # they are merged into the numbers of neighbouring mines like the mines in reset
+        mines = states.translate(self._STATE_MINE_TABLE)
+        self._mine_indices = None
+        self._cells = bytearray(len(states))
+        for start, stop, num_neighbouring_mines in self._count_neighbouring_mines_in_bands(mines):
+            cells = int.from_bytes(num_neighbouring_mines, "little") | (int.from_bytes(states[start:stop], "little") << 4)
+            self._cells[start:stop] = cells.to_bytes(stop - start, "little")
+        
+        self._num_opened_fields = self._cells.translate(self._OPEN_BIT_TABLE).count(1)
+        self._num_flagged_fields = self._cells.translate(self._FLAG_BIT_TABLE).count(1)
+        self._num_correct_flags = self._cells.translate(self._CORRECT_FLAG_TABLE).count(1)
+        
+        open_counts = self._cells.translate(self._OPEN_COUNT_TABLE)
+        self._num_opened_by_number = [open_counts.count(n) for n in range(9)]
+        
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
+        
+    # returns a copy of the whole state of the minefield, which restore sets back. Snapshots can only
+    # be restored into a minefield of the same class. Taking and restoring a snapshot copies the cells
+    # once, without sampling the mines or counting the neighbouring mines again
+    def snapshot(self):
+        return (self._width, self._height, self._num_mines, self._seed, bytes(self._cells), self._are_mines_placed,
+                self._num_flagged_fields, self._num_correct_flags, self._num_opened_fields, tuple(self._num_opened_by_number))
+    
+    def restore(self, snapshot):
+        self._width, self._height, self._num_mines, self._seed, cells, self._are_mines_placed, \
+            self._num_flagged_fields, self._num_correct_flags, self._num_opened_fields, num_opened_by_number = snapshot
+        self._cells = bytearray(cells)
+        self._mine_indices = None
+        self._num_opened_by_number = list(num_opened_by_number)
+        self._move_log = None
+        self._last_opened_runs = []
+        
+        if self._subscribers:
+            self._publish(EVENT_RESET, [])
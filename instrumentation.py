@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Optional instrumentation of the hot paths of the game: call counts, latency histograms and the number
+of fields (or tiles) each call touched. It is switched on with the environment variable
+MINESWEEPER_PROFILE or the command-line flag --profile of Minesweeper_Final.py:
+
+    MINESWEEPER_PROFILE=1 python Minesweeper_Final.py              (overlay only, toggled with F12)
+    MINESWEEPER_PROFILE=trace.json python Minesweeper_Final.py     (and a JSON trace when the game exits)
+    python Minesweeper_Final.py --profile trace.json
+
+Nothing is measured unless Recorder.wrap has replaced a method by a measuring wrapper, so the
+instrumentation costs nothing when it is off. Does not need PyQt5, install_engine can also be used by
+headless code.
+"""
+
+import bisect
+import functools
+import json
+import os
+import time
+
+from chunkedgamefield import ChunkedGamefield
+from gamefield import ArrayGamefield, Gamefield
+
+ENV_VAR = "MINESWEEPER_PROFILE"
+
+# upper bounds of the buckets of the latency histograms in milliseconds, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+"""
+
+Measurements of the calls of one instrumented method
+
+"""
+class CallStats:
+    def __init__(self):
+        self.num_calls = 0
+        self.total_time = 0.0               # seconds
+        self.max_time = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)    # number of calls per latency bucket
+        self.num_cells = 0                  # fields or tiles touched by all calls
+        self.max_cells = 0
+    
+    def add(self, duration, num_cells = None):
+        self.num_calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, 1000 * duration)] += 1
+        if num_cells is not None:
+            self.num_cells += num_cells
+            self.max_cells = max(self.max_cells, num_cells)
+    
+    def to_dict(self):
+        num_calls = max(self.num_calls, 1)
+        return {"calls": self.num_calls, "total_ms": 1000 * self.total_time, "mean_ms": 1000 * self.total_time / num_calls,
+                "max_ms": 1000 * self.max_time, "histogram": self.histogram, "cells": self.num_cells,
+                "mean_cells": self.num_cells / num_calls, "max_cells": self.max_cells}
+
+
+"""
+
+Collects the CallStats of all instrumented methods by their labels
+
+"""
+class Recorder:
+    def __init__(self):
+        self._stats = {}                    # label -> CallStats
+        self._start = time.perf_counter()
+    
+    def get_stats(self, label):
+        stats = self._stats.get(label)
+        if stats is None:
+            stats = self._stats[label] = CallStats()
+        return stats
+    
+    # replaces the method name of the class owner by a wrapper which measures every call under label
+    # ("Class.method" by default). cells(obj, args, result) returns the number of fields or tiles a call
+    # has touched; it is called after the time has been taken
+    def wrap(self, owner, name, label = None, cells = None):
+        function = owner.__dict__[name]
+        stats = self.get_stats(label or "%s.%s" % (owner.__name__, name))
+        perf_counter = time.perf_counter
+        
+        @functools.wraps(function)
+        def wrapper(obj, *args, **kwargs):
+            start = perf_counter()
+            result = function(obj, *args, **kwargs)
+            duration = perf_counter() - start
+            stats.add(duration, cells(obj, args, result) if cells is not None else None)
+            return result
+        
+        setattr(owner, name, wrapper)
+    
+    def to_dict(self):
+        return {"duration_s": time.perf_counter() - self._start, "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+                "calls": {label: stats.to_dict() for label, stats in sorted(self._stats.items())}}
+    
+    # returns one line of text per instrumented method which has been called, e.g. for an overlay
+    def get_summary_lines(self):
+        lines = ["%-36s %7s %9s %9s %10s" % ("", "calls", "mean ms", "max ms", "cells/call")]
+        for label, stats in sorted(self._stats.items()):
+            if stats.num_calls:
+                values = stats.to_dict()
+                lines.append("%-36s %7d %9.3f %9.3f %10.1f" % (label, values["calls"], values["mean_ms"], values["max_ms"], values["mean_cells"]))
+        return lines
+    
+    # writes the measurements as JSON to the file path
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent = 1)
+
+
+# returns whether the instrumentation is switched on by the environment variable and the path of the
+# JSON trace it names, or None if it only switches it on ("1")
+def read_env():
+    value = os.environ.get(ENV_VAR, "")
+    if value in ("", "0"):
+        return False, None
+    return True, None if value == "1" else value
+
+
+# instruments reset, open_field and chord_field of all minefield classes with recorder. The cells of
+# reset are all fields of the minefield, those of open_field and chord_field the opened fields
+def install_engine(recorder):
+    for cls in (Gamefield, ArrayGamefield, ChunkedGamefield):
+        recorder.wrap(cls, "reset", cells = lambda gamefield, args, result: gamefield.width * gamefield.height)
+        recorder.wrap(cls, "open_field", cells = lambda gamefield, args, result: gamefield.get_num_last_opened_fields())
+        recorder.wrap(cls, "chord_field", cells = lambda gamefield, args, result: gamefield.get_num_last_opened_fields())
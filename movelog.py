@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Append-only log of the moves of one game and a replay engine for it. A log file is a line of JSON with
+the size, number of mines and seed of the minefield, followed by one line per move:
+
+    {"format": "minesweeper-moves", "version": 1, "width": 30, "height": 16, "num_mines": 99, "seed": 42, "first_click": 2}
+    0.000000 o 7 12
+    1.532118 f 3 4
+
+with the time of the move in seconds since the start of the recording, the action (see MOVE_OPEN,
+MOVE_CHORD, MOVE_FLAG and MOVE_UNFLAG in gamefield.py) and the indices i and j of the field. With a safe first
+click (see Gamefield.first_click) the mines depend on the first move as well, which the log contains. Moves can be written
+to the file as they are made, so that the log of a session survives a crash:
+
+    log = MoveLog.record(gamefield, "game.log")
+    (play)
+    log.close()
+
+    gamefield = replay(MoveLog.read("game.log"))
+"""
+
+import json
+import time
+
+from gamefield import ArrayGamefield, FIRST_CLICK_ANY, MOVE_CHORD, MOVE_FLAG, MOVE_OPEN, MOVE_UNFLAG
+
+_FORMAT = "minesweeper-moves"
+_VERSION = 1
+
+
+"""
+
+Log of the moves of one game on the minefield with the given size, number of mines, seed and mode of
+the first click (a FIRST_CLICK_-constant from gamefield.py). moves is a
+list of (time, action, i, j)-tuples. If path is given, the header and every move are written to this
+file immediately.
+
+"""
+class MoveLog:
+    def __init__(self, width, height, num_mines, seed, path = None, first_click = FIRST_CLICK_ANY):
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.seed = seed
+        self.first_click = first_click
+        self.moves = []
+        
+        self._start = time.perf_counter()   # time of the recording the times of the moves refer to
+        self._file = None
+        if path is not None:
+            self._file = open(path, "w")
+            self._file.write(self._header() + "\n")
+            self._file.flush()
+    
+    # starts recording the moves on gamefield into a new MoveLog, which is returned
+    @classmethod
+    def record(cls, gamefield, path = None):
+        log = cls(gamefield.width, gamefield.height, gamefield.num_mines, gamefield.seed, path, gamefield.first_click)
+        gamefield.set_move_log(log)
+        return log
+    
+    def _header(self):
+        return json.dumps({"format": _FORMAT, "version": _VERSION, "width": self.width, "height": self.height,
+                           "num_mines": self.num_mines, "seed": self.seed, "first_click": self.first_click})
+    
+    # adds a move. Called by the Gamefield the log has been set on
+    def append(self, action, i, j):
+        move = (time.perf_counter() - self._start, action, i, j)
+        self.moves.append(move)
+        if self._file is not None:
+            self._file.write("%.6f %s %d %d\n" % move)
+            self._file.flush()
+    
+    # closes the file of the log, the moves stay in memory
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    # writes the whole log to the file path
+    def write(self, path):
+        with open(path, "w") as f:
+            f.write(self._header() + "\n")
+            f.writelines("%.6f %s %d %d\n" % move for move in self.moves)
+    
+    # reads a log written by MoveLog or MoveLog.write. A last line cut off by a crash is ignored, logs
+    # without first_click are from games with FIRST_CLICK_ANY
+    @classmethod
+    def read(cls, path):
+        with open(path) as f:
+            header = json.loads(f.readline())
+            if header.get("format") != _FORMAT:
+                raise ValueError("The file is not a move log.")
+            if header.get("version") != _VERSION:
+                raise ValueError("Unsupported version of the move log: %s" % header.get("version"))
+            
+            log = cls(header["width"], header["height"], header["num_mines"], header["seed"],
+                      first_click = header.get("first_click", FIRST_CLICK_ANY))
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                t, action, i, j = line.split()
+                if action not in (MOVE_OPEN, MOVE_CHORD, MOVE_FLAG, MOVE_UNFLAG):
+                    raise ValueError("Unknown action in the move log: " + action)
+                log.moves.append((float(t), action, int(i), int(j)))
+        
+        return log
+
+
+# applies the move (time, action, i, j) to gamefield. Returns the result of open_field or chord_field
+# for MOVE_OPEN and MOVE_CHORD and True otherwise
+def apply_move(gamefield, move):
+    _, action, i, j = move
+    if action == MOVE_OPEN:
+        return gamefield.open_field(i, j)
+    if action == MOVE_CHORD:
+        return gamefield.chord_field(i, j)
+    if action == MOVE_FLAG:
+        gamefield.set_flag(i, j)
+    else:
+        gamefield.remove_flag(i, j)
+    return True
+
+
+# returns a new minefield of class gamefield_class with the size, mines, seed and mode of the first
+# click of log, and applies the first num_moves (all if None) moves of log to it at full speed. Since
+# the mines only depend on the seed and the first move, this restores the game exactly as it was
+def replay(log, num_moves = None, gamefield_class = ArrayGamefield):
+    gamefield = gamefield_class(log.width, log.height, log.num_mines, seed = log.seed, first_click = log.first_click)
+    
+    open_field = gamefield.open_field
+    set_flag = gamefield.set_flag
+    remove_flag = gamefield.remove_flag
+    chord_field = gamefield.chord_field
+    for _, action, i, j in log.moves[:num_moves]:
+        if action == MOVE_OPEN:
+            open_field(i, j)
+        elif action == MOVE_CHORD:
+            chord_field(i, j)
+        elif action == MOVE_FLAG:
+            set_flag(i, j)
+        else:
+            remove_flag(i, j)
+    
+    return gamefield
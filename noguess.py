@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Search and pool of minefields which can be solved without guessing (see FIRST_CLICK_NO_GUESS in
+gamefield.py). find_no_guess_seed tries candidates with the Solver until it has found one; a minefield
+with FIRST_CLICK_NO_GUESS only places the mines of the seed it is given. The pool generates such seeds
+in advance on worker processes, so that a new game with such a minefield starts at once. Every worker
+searches until it has found one or its time budget is used up. The pool only keeps the seeds of the
+accepted minefields, a bounded number per (width, height, num_mines)-configuration. Does not need the
+GUI:
+
+    pool = NoGuessPool()
+    pool.fill(30, 16, 99)
+    ...
+    seed = pool.take(30, 16, 99)        # None if there is none yet
+    gamefield = ArrayGamefield(30, 16, 99, seed, FIRST_CLICK_NO_GUESS)
+
+Run as a script, it fills the pools of some configurations and prints the acceptance rates:
+
+    python noguess.py --configs 9x9x10,16x16x40,30x16x99 --boards 20
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from gamefield import ArrayGamefield, FIRST_CLICK_SAFE_AREA, get_start_field
+from solver import Solver
+
+# number of minefields kept per configuration
+DEFAULT_POOL_SIZE = 4
+
+# seconds a worker tries candidates for one minefield before it reports back without one
+DEFAULT_TIME_BUDGET = 2.0
+
+
+# returns whether the Solver solves the width x height minefield with num_mines mines, which a minefield
+# with FIRST_CLICK_NO_GUESS and the given seed has, only with its deterministic rules, starting with the
+# start field. The mines are drawn like for FIRST_CLICK_SAFE_AREA with the start field as first click
+def is_solvable_without_guessing(width, height, num_mines, seed):
+    gamefield = ArrayGamefield(width, height, num_mines, seed, FIRST_CLICK_SAFE_AREA)
+    gamefield.open_field(*get_start_field(width, height))
+    return Solver(gamefield).solve_without_guessing()
+
+
+# searches a minefield which can be solved without guessing among the candidates drawn from seed: the
+# first candidate is seed itself and the others are drawn from a random generator seeded with it, so
+# the seed of an accepted minefield is accepted again at the first attempt. Stops after max_attempts
+# candidates or time_budget seconds, if given. Returns the seed of the accepted minefield, or None if
+# there is none, and the number of candidates tried
+def find_no_guess_seed(width, height, num_mines, seed = None, max_attempts = None, time_budget = None):
+    if seed is None:
+        seed = random.getrandbits(64)
+    rand = random.Random(seed)
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    
+    num_attempts = 0
+    while max_attempts is None or num_attempts < max_attempts:
+        num_attempts += 1
+        if is_solvable_without_guessing(width, height, num_mines, seed):
+            return seed, num_attempts
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        seed = rand.getrandbits(64)
+        
+    return None, num_attempts
+
+
+"""
+
+Acceptance statistics of the candidates of one configuration
+
+"""
+class NoGuessStats:
+    def __init__(self, width, height, num_mines):
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        
+        self.num_candidates = 0         # minefields checked with the solver
+        self.num_accepted = 0           # minefields which can be solved without guessing
+        self.num_timeouts = 0           # searches which used up their time budget without a minefield
+        self.time = 0.0                 # seconds spent searching, summed over the workers
+    
+    def add(self, num_candidates, is_accepted, seconds):
+        self.num_candidates += num_candidates
+        self.num_accepted += is_accepted
+        self.num_timeouts += not is_accepted
+        self.time += seconds
+    
+    def get_acceptance_rate(self):
+        return self.num_accepted / max(self.num_candidates, 1)
+    
+    def to_dict(self):
+        return {"width": self.width, "height": self.height, "num_mines": self.num_mines,
+                "candidates": self.num_candidates, "accepted": self.num_accepted, "timeouts": self.num_timeouts,
+                "acceptance_rate": self.get_acceptance_rate(), "ms_per_candidate": 1000 * self.time / max(self.num_candidates, 1),
+                "ms_per_board": 1000 * self.time / max(self.num_accepted, 1)}
+
+
+# searches one minefield of the configuration which can be solved without guessing, starting with the
+# candidates drawn from seed, for at most time_budget seconds. Returns the configuration, the seed of
+# the minefield or None, the number of candidates and the time taken. Runs in a worker process
+def search_board(task):
+    width, height, num_mines, seed, time_budget = task
+    
+    start = time.perf_counter()
+    board_seed, num_candidates = find_no_guess_seed(width, height, num_mines, seed, time_budget = time_budget)
+    return (width, height, num_mines), board_seed, num_candidates, time.perf_counter() - start
+
+
+"""
+
+Keeps up to pool_size seeds of minefields which can be solved without guessing per configuration and
+generates new ones on a pool of num_workers processes (one less than the number of CPUs by default).
+fill starts the generation for a configuration, and take refills the pool of its configuration. The
+results of the workers arrive on a thread of the process pool, so all methods can be called from any
+thread. The worker processes are started by the first fill and stopped by close. They are spawned as
+fresh interpreters instead of forked, since forking a process with the threads of the GUI and of the
+process pool may copy locks which are held at that moment.
+
+"""
+class NoGuessPool:
+    def __init__(self, pool_size = DEFAULT_POOL_SIZE, time_budget = DEFAULT_TIME_BUDGET, num_workers = None):
+        if pool_size < 1:
+            raise ValueError("The pool must hold at least one minefield.")
+        if time_budget <= 0:
+            raise ValueError("The time budget must be positive.")
+        
+        self._pool_size = pool_size
+        self._time_budget = time_budget
+        self._num_workers = num_workers or max(os.cpu_count() - 1, 1)
+        
+        self._lock = threading.Lock()
+        self._process_pool = None
+        self._seeds = {}                # configuration -> deque of seeds of accepted minefields
+        self._num_pending = {}          # configuration -> number of searches running
+        self._stats = {}                # configuration -> NoGuessStats
+        self._is_closed = False
+    
+    # starts searching minefields of the configuration until its pool is full
+    def fill(self, width, height, num_mines):
+        if num_mines >= width * height:
+            raise ValueError("There cannot be more mines than fields.")
+        
+        with self._lock:
+            if self._is_closed:
+                return
+            if self._process_pool is None:
+                self._process_pool = multiprocessing.get_context("spawn").Pool(self._num_workers)
+            self._submit((width, height, num_mines))
+    
+    # submits as many searches as the pool of the configuration lacks minefields. Needs the lock
+    def _submit(self, key):
+        seeds = self._seeds.setdefault(key, deque())
+        num_pending = self._num_pending.get(key, 0)
+        for _ in range(self._pool_size - len(seeds) - num_pending):
+            task = key + (random.getrandbits(64), self._time_budget)
+            self._process_pool.apply_async(search_board, (task,), callback = self._on_board_searched)
+            num_pending += 1
+        self._num_pending[key] = num_pending
+    
+    # called on a thread of the process pool with the result of search_board. A search which has used
+    # up its time budget is only started again by the next fill or take, so that the workers do not
+    # search forever for a configuration with too many mines
+    def _on_board_searched(self, result):
+        key, seed, num_candidates, seconds = result
+        with self._lock:
+            self._num_pending[key] -= 1
+            self._stats.setdefault(key, NoGuessStats(*key)).add(num_candidates, seed is not None, seconds)
+            if seed is not None:
+                self._seeds[key].append(seed)
+    
+    # returns the seed of a minefield of the configuration which can be solved without guessing and
+    # starts searching a new one, or returns None if there is none yet
+    def take(self, width, height, num_mines):
+        key = (width, height, num_mines)
+        with self._lock:
+            seeds = self._seeds.get(key)
+            if not seeds:
+                return None
+            seed = seeds.popleft()
+            if not self._is_closed:
+                self._submit(key)
+            return seed
+    
+    # number of minefields of the configuration in the pool
+    def get_num_boards(self, width, height, num_mines):
+        with self._lock:
+            return len(self._seeds.get((width, height, num_mines), ()))
+    
+    # NoGuessStats of all searches of the configuration so far
+    def get_stats(self, width, height, num_mines):
+        with self._lock:
+            return self._stats.get((width, height, num_mines), NoGuessStats(width, height, num_mines))
+    
+    # stops the worker processes, searches which are running are dropped. The seeds in the pool can
+    # still be taken
+    def close(self):
+        with self._lock:
+            self._is_closed = True
+            process_pool = self._process_pool
+            self._process_pool = None
+        if process_pool is not None:
+            process_pool.terminate()
+            process_pool.join()
+
+
+def _parse_configs(text):
+    configs = []
+    for config in text.split(","):
+        width, height, num_mines = (int(n) for n in config.split("x"))
+        if num_mines >= width * height:
+            raise ValueError("There cannot be more mines than fields: " + config)
+        configs.append((width, height, num_mines))
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Generates Minesweeper minefields which can be solved without guessing.")
+    parser.add_argument("--configs", default = "9x9x10,16x16x40,30x16x99", help = "comma separated list of WIDTHxHEIGHTxMINES")
+    parser.add_argument("--boards", type = int, default = DEFAULT_POOL_SIZE, help = "number of minefields per configuration")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "number of worker processes")
+    parser.add_argument("--time-budget", type = float, default = DEFAULT_TIME_BUDGET, help = "seconds per search of a worker")
+    args = parser.parse_args()
+    
+    configs = _parse_configs(args.configs)
+    pool = NoGuessPool(args.boards, args.time_budget, args.workers)
+    
+    # fill is repeated, since searches which have used up their time budget are not started again
+    start = time.perf_counter()
+    remaining = list(configs)
+    while remaining:
+        for config in list(remaining):
+            pool.fill(*config)
+            if pool.get_num_boards(*config) == args.boards:
+                remaining.remove(config)
+                elapsed = time.perf_counter() - start
+                result = pool.get_stats(*config).to_dict()
+                print("%4dx%-4d %6d mines: %d minefields after %.2f s, acceptance rate %.4f, %.3f ms/candidate, %.1f ms/minefield per worker"
+                      % (config + (args.boards, elapsed, result["acceptance_rate"], result["ms_per_candidate"], result["ms_per_board"])))
+        time.sleep(0.05)
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+from PyQt5.QtWidgets import *
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+
+"""
+
+Semi-transparent label over a window which shows the measurements of an instrumentation.Recorder and
+refreshes them twice a second while it is visible. Mouse events pass through it to the window.
+
+"""
+class PerformanceOverlay(QLabel):
+    _REFRESH_INTERVAL = 500     # milliseconds
+    
+    def __init__(self, recorder, parent=None):
+        super().__init__(parent)
+        
+        self._recorder = recorder
+        
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: white; padding: 4px;")
+        
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._refresh)
+        
+        self.hide()
+        
+    # shows the overlay if it is hidden and hides it otherwise
+    def toggle(self):
+        if self.isVisible():
+            self._timer.stop()
+            self.hide()
+        else:
+            self._refresh()
+            self.show()
+            self.raise_()
+            self._timer.start(self._REFRESH_INTERVAL)
+            
+    def _refresh(self):
+        self.setText("\n".join(self._recorder.get_summary_lines()))
+        self.adjustSize()
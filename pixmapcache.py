@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+from PyQt5.QtGui import QIcon, QPixmap
+
+"""
+
+Process-wide cache for decoded images. Every image file is read from disk and decoded only once,
+afterwards the same QPixmap (or QIcon) is returned. Hits and misses are counted, so it can be checked
+that no images are loaded from disk while a game is running. A QApplication must exist before the
+first image is loaded.
+
+"""
+class PixmapCache:
+    _pixmaps = {}       # path -> QPixmap
+    _icons = {}         # path -> QIcon
+    _num_hits = 0
+    _num_misses = 0
+    
+    # returns the QPixmap for the image file at path, loading it on the first request
+    @classmethod
+    def get_pixmap(cls, path):
+        pixmap = cls._pixmaps.get(path)
+        if pixmap is None:
+            cls._num_misses += 1
+            pixmap = cls._pixmaps[path] = QPixmap(path)
+        else:
+            cls._num_hits += 1
+            
+        return pixmap
+    
+    # returns a QIcon for the image file at path, e.g. for buttons
+    @classmethod
+    def get_icon(cls, path):
+        icon = cls._icons.get(path)
+        if icon is None:
+            icon = cls._icons[path] = QIcon(cls.get_pixmap(path))
+        else:
+            cls._num_hits += 1
+            
+        return icon
+    
+    # loads all image files in paths in advance, e.g. at startup
+    @classmethod
+    def preload(cls, paths):
+        for path in paths:
+            cls.get_pixmap(path)
+            
+    # removes all images from the cache and resets the counters
+    @classmethod
+    def clear(cls):
+        cls._pixmaps = {}
+        cls._icons = {}
+        cls.reset_stats()
+        
+    @classmethod
+    def reset_stats(cls):
+        cls._num_hits = 0
+        cls._num_misses = 0
+        
+    # number of requests answered from the cache
+    @classmethod
+    def get_num_hits(cls):
+        return cls._num_hits
+    
+    # number of requests for which an image file had to be loaded from disk
+    @classmethod
+    def get_num_misses(cls):
+        return cls._num_misses
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Exact mine probabilities for the closed fields of a partially opened minefield.
+
+Every opened number gives a constraint: its closed neighbors contain exactly its number of mines. The
+closed fields next to opened numbers (the frontier) are split into components which do not share a
+constraint. The solutions of each component are counted per number of mines with a dynamic program over
+its fields, which memoizes the numbers of mines still missing in the constraints that are currently
+"open" (started but not finished), so it stays fast along long frontiers. The components are then
+combined with the fields in no constraint (the interior): a combination with M mines on the frontier
+leaves the num_mines - M remaining mines for the interior, which can be placed in
+binomial(interior fields, num_mines - M) ways.
+"""
+
+import math
+
+"""
+
+Dynamic program for one component of the frontier. Fields which are in exactly the same constraints are
+interchangeable and are handled together as a group: x mines in a group of g fields can be placed in
+binomial(g, x) ways. The groups are processed in breadth first order, so that only a few constraints
+are open at once. A state is the tuple of mines still missing in the open constraints; every state of a
+layer holds the number of assignments of the groups so far per number of mines among them (forward
+pass). The backward pass computes, per state and number of mines so far, the weighted number of ways to
+complete the assignment, where the weight of a completed component with m mines is weights(m). Both
+passes are rescaled per layer, which does not change the probabilities, so large components do not
+overflow.
+
+"""
+class _Component:
+    # largest number of states in one layer before the component is considered too complex
+    MAX_STATES = 20000
+    
+    def __init__(self, groups, constraints):
+        self.groups = groups                # groups of fields in breadth first order
+        self._layers = []                   # forward pass: state -> {mines so far: number of assignments}
+        self._edges = []                    # per group: list of (state, mines in the group, ways, next state)
+        
+        position = {}
+        for t, group in enumerate(groups):
+            for field in group:
+                position[field] = t
+        num_groups = len(groups)
+        
+        # for each group: the constraints starting at it (with their number of mines), the constraints
+        # containing it (with the number of their fields after it) and which constraints are still open after it
+        starts = [[] for t in range(num_groups)]
+        contains = [[] for t in range(num_groups)]
+        last = []
+        for c, (constraint_fields, num_mines) in enumerate(constraints):
+            positions = sorted({position[field] for field in constraint_fields})
+            starts[positions[0]].append((c, num_mines))
+            fields_left = len(constraint_fields)
+            for t in positions:
+                fields_left -= len(groups[t])
+                contains[t].append((c, fields_left))
+            last.append(positions[-1])
+        
+        # precompute the transitions of each layer on the tuples of missing mines
+        self._steps = []
+        open_constraints = []
+        for t in range(num_groups):
+            current = open_constraints + [c for c, num_mines in starts[t]]
+            index = {c: n for n, c in enumerate(current)}
+            start_mines = tuple(num_mines for c, num_mines in starts[t])
+            containing = [(index[c], fields_left) for c, fields_left in contains[t]]
+            open_constraints = [c for c in current if last[c] > t]
+            keep = [index[c] for c in open_constraints]
+            ways = [math.comb(len(groups[t]), x) for x in range(len(groups[t]) + 1)]
+            self._steps.append((start_mines, containing, keep, ways))
+        
+        self._forward()
+    
+    # returns the next state after placing x mines in group t in state, or None if that violates a
+    # constraint
+    def _transition(self, t, state, x):
+        start_mines, containing, keep, ways = self._steps[t]
+        missing = list(state + start_mines)
+        for n, fields_left in containing:
+            missing[n] -= x
+            if missing[n] < 0 or missing[n] > fields_left:
+                return None
+        
+        return tuple([missing[n] for n in keep])
+    
+    def _forward(self):
+        layer = {(): {0: 1.0}}
+        for t in range(len(self.groups)):
+            self._layers.append(layer)
+            ways = self._steps[t][3]
+            edges = []
+            next_layer = {}
+            for state, counts in layer.items():
+                for x, x_ways in enumerate(ways):
+                    next_state = self._transition(t, state, x)
+                    if next_state is None:
+                        continue
+                    
+                    edges.append((state, x, x_ways, next_state))
+                    next_counts = next_layer.setdefault(next_state, {})
+                    for m, count in counts.items():
+                        next_counts[m + x] = next_counts.get(m + x, 0.0) + count * x_ways
+                        
+                if len(next_layer) > self.MAX_STATES:
+                    raise ValueError("The opened fields are too complex to compute exact probabilities.")
+                
+            layer = _rescaled(next_layer)
+            self._edges.append(edges)
+        
+        # the final layer has only the empty state if there is a solution
+        self.counts = layer.get((), {})
+    
+    # returns the probability of a mine for each field of the component, if a solution with m mines
+    # in the component has the weight weights(m)
+    def probabilities(self, weights):
+        probabilities = {}
+        
+        # backward pass: state -> {mines so far: weighted number of completions}
+        completions = {(): {m: weights(m) for m in self.counts}}
+        for t in range(len(self.groups) - 1, -1, -1):
+            layer = self._layers[t]
+            previous = {}
+            mine_weight = 0.0
+            total_weight = 0.0
+            for state, x, x_ways, next_state in self._edges[t]:
+                next_completions = completions.get(next_state)
+                if not next_completions:
+                    continue
+                
+                state_completions = previous.setdefault(state, {})
+                for m, count in layer[state].items():
+                    completion = next_completions.get(m + x, 0.0) * x_ways
+                    state_completions[m] = state_completions.get(m, 0.0) + completion
+                    total_weight += count * completion
+                    mine_weight += count * completion * x
+            
+            # expected number of mines in the group, spread over its fields
+            group = self.groups[t]
+            probability = mine_weight / total_weight / len(group) if total_weight > 0 else 0.0
+            for field in group:
+                probabilities[field] = probability
+            completions = _rescaled(previous)
+        
+        return probabilities
+
+
+# divides all values of the dicts in layer (state -> {key: value}) by their maximum
+def _rescaled(layer):
+    largest = max((max(values.values()) for values in layer.values() if values), default = 0.0)
+    if largest <= 0.0 or (2.0 ** -100 < largest < 2.0 ** 100):
+        return layer
+    
+    return {state: {key: value / largest for key, value in values.items()} for state, values in layer.items()}
+
+
+# returns the convolution of two lists of numbers of solutions indexed by number of mines
+def _convolve(a, b):
+    result = [0.0] * (len(a) + len(b) - 1)
+    for m, x in enumerate(a):
+        if x:
+            for k, y in enumerate(b):
+                result[m + k] += x * y
+    return result
+
+
+# returns the list of counts indexed by number of mines, scaled to a maximum of 1
+def _normalized(counts):
+    values = [0.0] * (max(counts, default = 0) + 1)
+    for m, count in counts.items():
+        values[m] = count
+    largest = max(values)
+    return [value / largest for value in values] if largest > 0 else values
+
+
+# returns the probability of a mine for every field in one of the constraints, and the probability for
+# every other unknown field. constraints is a list of (fields, num_mines) where fields is an iterable of
+# field identifiers, num_unknown_fields the number of all unknown fields, including those in no
+# constraint, and num_mines the number of mines among them. Raises ValueError if the constraints cannot
+# all be satisfied
+def compute_probabilities(constraints, num_unknown_fields, num_mines):
+    # fields which are forced by a constraint without mines left or with as many mines as fields get
+    # the probability 0 or 1 right away and are removed from the other constraints
+    forced = {}
+    while True:
+        reduced = []
+        is_reduced = False
+        for fields, constraint_mines in constraints:
+            free_fields = []
+            for field in dict.fromkeys(fields):
+                if field in forced:
+                    constraint_mines -= forced[field]
+                else:
+                    free_fields.append(field)
+                    
+            if constraint_mines < 0 or constraint_mines > len(free_fields):
+                raise ValueError("The opened fields contradict each other.")
+            if not free_fields:
+                continue
+            
+            if constraint_mines == 0 or constraint_mines == len(free_fields):
+                for field in free_fields:
+                    forced[field] = 1 if constraint_mines else 0
+                is_reduced = True
+            else:
+                reduced.append((free_fields, constraint_mines))
+                
+        constraints = reduced
+        if not is_reduced:
+            break
+        
+    num_forced_mines = sum(forced.values())
+    num_unknown_fields -= len(forced)
+    num_mines -= num_forced_mines
+    
+    # group the fields which are in exactly the same constraints
+    field_constraints = {}
+    for c, (fields, constraint_mines) in enumerate(constraints):
+        for field in fields:
+            field_constraints.setdefault(field, []).append(c)
+            
+    groups = {}
+    for field, field_constraint_ids in field_constraints.items():
+        groups.setdefault(tuple(field_constraint_ids), []).append(field)
+        
+    group_of_field = {}
+    for group in groups.values():
+        for field in group:
+            group_of_field[field] = group
+            
+    # returns the groups of the component of group in breadth first order along shared constraints,
+    # and the constraints of the component
+    def breadth_first(group):
+        ordered = [group]
+        seen = {id(group)}
+        constraints_seen = set()
+        for group in ordered:
+            for c in field_constraints[group[0]]:
+                if c in constraints_seen:
+                    continue
+                constraints_seen.add(c)
+                for neighbor in constraints[c][0]:
+                    neighbor_group = group_of_field[neighbor]
+                    if id(neighbor_group) not in seen:
+                        seen.add(id(neighbor_group))
+                        ordered.append(neighbor_group)
+                        
+        return ordered, constraints_seen
+    
+    # split the groups into components. Each component is ordered breadth first from the group found
+    # last by a first breadth first search, which lies at an end of the component. Along a frontier
+    # this keeps the number of open constraints small
+    components = []
+    done = set()
+    for group in groups.values():
+        if id(group) in done:
+            continue
+        
+        ordered, constraints_seen = breadth_first(group)
+        ordered, constraints_seen = breadth_first(ordered[-1])
+        done.update(id(group) for group in ordered)
+        
+        component = _Component(ordered, [constraints[c] for c in sorted(constraints_seen)])
+        if not component.counts:
+            raise ValueError("The opened fields contradict each other.")
+        components.append(component)
+        
+    num_frontier_fields = len(field_constraints)
+    num_interior_fields = num_unknown_fields - num_frontier_fields
+    
+    # weight of a combination with frontier_mines mines on the frontier: the number of ways to place the
+    # other mines in the interior, as logarithm and scaled so that the largest weight is 1
+    def log_interior_ways(frontier_mines):
+        rest = num_mines - frontier_mines
+        if rest < 0 or rest > num_interior_fields:
+            return None
+        return math.lgamma(num_interior_fields + 1) - math.lgamma(rest + 1) - math.lgamma(num_interior_fields - rest + 1)
+    
+    max_frontier_mines = sum(max(component.counts) for component in components)
+    log_ways = [log_interior_ways(m) for m in range(max_frontier_mines + 1)]
+    largest_log_way = max((log_way for log_way in log_ways if log_way is not None), default = None)
+    if largest_log_way is None:
+        raise ValueError("The number of mines does not fit the opened fields.")
+    interior_ways = [math.exp(log_way - largest_log_way) if log_way is not None else 0.0 for log_way in log_ways]
+    
+    # number of solutions of all components together, and leaving out each component
+    counts = [_normalized(component.counts) for component in components]
+    prefixes = [[1.0]]
+    for component_counts in counts:
+        prefixes.append(_convolve(prefixes[-1], component_counts))
+    suffixes = [[1.0]]
+    for component_counts in reversed(counts):
+        suffixes.append(_convolve(suffixes[-1], component_counts))
+    suffixes.reverse()
+    
+    probabilities = {}
+    for n, component in enumerate(components):
+        others = _convolve(prefixes[n], suffixes[n + 1])
+        def weights(m, others = others):
+            return sum(count * interior_ways[m + k] for k, count in enumerate(others) if count)
+        probabilities.update(component.probabilities(weights))
+    probabilities.update(forced)
+    
+    # probability for the interior: expected number of mines left for the interior per interior field
+    interior_probability = 0.0
+    if num_interior_fields > 0:
+        total = prefixes[-1]
+        weight = sum(count * interior_ways[m] for m, count in enumerate(total))
+        if weight <= 0.0:
+            raise ValueError("The number of mines does not fit the opened fields.")
+        expected_mines = sum(count * interior_ways[m] * (num_mines - m) for m, count in enumerate(total))
+        interior_probability = expected_mines / weight / num_interior_fields
+    
+    return probabilities, interior_probability
+
+
+# returns a dict mapping the indices (i, j) of every closed field of gamefield (instance of Gamefield)
+# to the exact probability that it is a mine, given the opened fields. Flags are ignored unless
+# trust_flags is set, then flagged fields are treated as known mines and left out
+def get_mine_probabilities(gamefield, trust_flags = False):
+    width = gamefield.width
+    height = gamefield.height
+    
+    closed = []
+    num_mines = gamefield.num_mines
+    constraints = []
+    for i in range(height):
+        for j in range(width):
+            if not gamefield.is_open(i, j):
+                if trust_flags and gamefield.is_flagged(i, j):
+                    num_mines -= 1
+                else:
+                    closed.append((i, j))
+                continue
+            
+            constraint_mines = gamefield.get_num_neighbouring_mines(i, j)
+            fields = []
+            for x in range(max(i - 1, 0), min(i + 2, height)):
+                for y in range(max(j - 1, 0), min(j + 2, width)):
+                    if gamefield.is_open(x, y):
+                        continue
+                    if trust_flags and gamefield.is_flagged(x, y):
+                        constraint_mines -= 1
+                    else:
+                        fields.append((x, y))
+            if fields or constraint_mines:
+                constraints.append((fields, constraint_mines))
+    
+    probabilities, interior_probability = compute_probabilities(constraints, len(closed), num_mines)
+    return {field: probabilities.get(field, interior_probability) for field in closed}
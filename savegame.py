@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Saves and loads the state of a Gamefield (or ArrayGamefield) in a compact binary format:
+
+    offset      size        content
+    0           64          header, see _HEADER: magic b"MSWP", version, width, height, number of
+                            mines, seed, number of flagged, correctly flagged and opened fields,
+                            elapsed time of the game in seconds, mode of the first click (see
+                            Gamefield.first_click)
+    64          n           mine bitmap
+    64 + n      n           open bitmap
+    64 + 2n     n           flag bitmap
+
+with n = ceil(width * height / 8). The field with index k = i * width + j is bit k % 8 of byte k // 8
+of a bitmap. All offsets are fixed, so the file can be memory-mapped and single fields read from it
+directly. The numbers of neighbouring mines are not stored, they are computed when loading.
+"""
+
+import mmap
+import struct
+
+from chunkedgamefield import ChunkedGamefield
+from gamefield import ArrayGamefield
+
+_MAGIC = b"MSWP"
+_VERSION = 1
+
+# magic, version, has seed, width, height, number of mines, seed, number of flagged fields, number of
+# correct flags, number of opened fields, elapsed time, first click; padded to 64 bytes
+_HEADER = struct.Struct("<4sHHIIIQIIIdB15x")
+
+
+# returns the mine, open and flag bitmap of states (see Gamefield.get_states). The bytes k, k + 8,
+# k + 16, ... of the states are read as one big integer with one byte per byte of the bitmaps, and the
+# integers of k and k + 4 are combined into one word with the state of k in the low and the one of k + 4
+# in the high half of each byte. Each of the three bits of the four words is then masked and shifted
+# into bit k and k + 4 of the bytes of its bitmap. So only eight big integers are read and four words
+# are shifted for all three bitmaps instead of one integer per field
+def pack_states(states):
+    num_bytes = (len(states) + 7) // 8
+    if len(states) % 8:
+        states = states + bytes(8 * num_bytes - len(states))
+    
+    words = [int.from_bytes(states[k::8], "little") | int.from_bytes(states[k + 4::8], "little") << 4 for k in range(4)]
+    
+    bitmaps = []
+    for bit in range(3):
+        mask = int.from_bytes(bytes([0x11 << bit]) * num_bytes, "little")
+        bitmap = words[0] & mask
+        for k in range(1, 4):
+            bitmap |= (words[k] & mask) << k
+        bitmaps.append((bitmap >> bit).to_bytes(num_bytes, "little"))
+        
+    return bitmaps
+
+
+# returns the states of num_fields fields from the mine, open and flag bitmaps in bitmaps, the reverse
+# of pack_states
+def unpack_states(bitmaps, num_fields):
+    num_bytes = (num_fields + 7) // 8
+    bitmaps = [int.from_bytes(bitmap[:num_bytes], "little") for bitmap in bitmaps]
+    lowest_bits = int.from_bytes(b"\x01" * num_bytes, "little")
+    
+    states = bytearray(8 * num_bytes)
+    for k in range(8):
+        states_k = 0
+        for bit in range(3):
+            states_k |= ((bitmaps[bit] >> k) & lowest_bits) << bit
+        states[k::8] = states_k.to_bytes(num_bytes, "little")
+    del states[num_fields:]
+    
+    return states
+
+
+# returns the state of gamefield and the elapsed time in seconds in the binary format described above.
+# Seeds which are no integers between 0 and 2**64 - 1 are not stored. A ChunkedGamefield cannot be saved
+def to_bytes(gamefield, elapsed_time = 0.0):
+    if isinstance(gamefield, ChunkedGamefield):
+        raise TypeError("A ChunkedGamefield cannot be saved, use snapshot instead.")
+    
+    seed = gamefield.seed
+    has_seed = type(seed) == int and 0 <= seed < 1 << 64
+    
+    header = _HEADER.pack(_MAGIC, _VERSION, has_seed, gamefield.width, gamefield.height, gamefield.num_mines,
+                          seed if has_seed else 0, gamefield.get_num_flagged_fields(), gamefield.get_num_correct_flags(),
+                          gamefield.get_num_opened_fields(), elapsed_time, gamefield.first_click)
+    
+    return header + b"".join(pack_states(gamefield.get_states()))
+
+
+# sets the state of gamefield (a new ArrayGamefield if it is None) to the state in data, which has been
+# written by to_bytes. Returns the gamefield and the elapsed time in seconds
+def from_bytes(data, gamefield = None):
+    if isinstance(gamefield, ChunkedGamefield):
+        raise TypeError("A saved game cannot be loaded into a ChunkedGamefield.")
+    if len(data) < _HEADER.size:
+        raise ValueError("The data is too short for a saved game.")
+    
+    magic, version, has_seed, width, height, num_mines, seed, num_flagged_fields, num_correct_flags, \
+        num_opened_fields, elapsed_time, first_click = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("The data is not a saved game.")
+    if version != _VERSION:
+        raise ValueError("Unsupported version of the saved game: %d" % version)
+    
+    num_fields = width * height
+    num_bytes = (num_fields + 7) // 8
+    if len(data) < _HEADER.size + 3 * num_bytes:
+        raise ValueError("The saved game is incomplete.")
+    
+    # the view is released before any error below, so that a memory-mapped file can be closed
+    with memoryview(data) as view:
+        states = unpack_states([view[_HEADER.size + n * num_bytes:_HEADER.size + (n + 1) * num_bytes] for n in range(3)], num_fields)
+    
+    if gamefield is None:
+        gamefield = ArrayGamefield(1, 1, 0)
+    gamefield.first_click = first_click
+    gamefield.set_state(width, height, num_mines, seed if has_seed else None, states)
+    
+    if (gamefield.get_num_flagged_fields(), gamefield.get_num_correct_flags(), gamefield.get_num_opened_fields()) != \
+       (num_flagged_fields, num_correct_flags, num_opened_fields):
+        raise ValueError("The counters of the saved game do not match its bitmaps.")
+    
+    return gamefield, elapsed_time
+
+
+# saves the state of gamefield and the elapsed time in seconds to the file path
+def save(path, gamefield, elapsed_time = 0.0):
+    with open(path, "wb") as f:
+        f.write(to_bytes(gamefield, elapsed_time))
+
+
+# loads a game saved with save into gamefield (a new ArrayGamefield if it is None). The file is
+# memory-mapped instead of read into memory first. Returns the gamefield and the elapsed time in seconds
+def load(path, gamefield = None):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+            return from_bytes(data, gamefield)
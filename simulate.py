@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Plays many games with the Solver in a pool of worker processes and collects statistics per minefield
+configuration: win rate, clicks, guesses, cascade sizes and time per game. Every game gets its own
+seed derived from --seed, the configuration and the number of the game, so the results do not depend
+on the number of workers or the order in which they finish:
+
+    python simulate.py --configs 9x9x10,16x16x40,30x16x99 --games 10000 --output results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from gamefield import ArrayGamefield, Gamefield
+from solver import Solver
+
+GAMEFIELD_CLASSES = {"Gamefield": Gamefield, "ArrayGamefield": ArrayGamefield}
+
+# number of games a worker plays before it reports back
+DEFAULT_CHUNK_SIZE = 200
+
+
+"""
+
+Aggregated results of the games of one minefield configuration. Results of chunks of games played by
+different workers are combined with add.
+
+"""
+class SimulationStats:
+    def __init__(self, width, height, num_mines):
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        
+        self.num_games = 0
+        self.num_wins = 0
+        self.num_clicks = 0
+        self.num_guesses = 0
+        self.num_cascades = 0           # clicks which opened at least one field
+        self.num_cascade_fields = 0     # fields opened by all clicks
+        self.max_cascade_size = 0
+        self.time = 0.0                 # seconds spent playing, summed over the workers
+    
+    def add(self, other):
+        self.num_games += other.num_games
+        self.num_wins += other.num_wins
+        self.num_clicks += other.num_clicks
+        self.num_guesses += other.num_guesses
+        self.num_cascades += other.num_cascades
+        self.num_cascade_fields += other.num_cascade_fields
+        self.max_cascade_size = max(self.max_cascade_size, other.max_cascade_size)
+        self.time += other.time
+    
+    def to_dict(self):
+        num_games = max(self.num_games, 1)
+        return {"width": self.width, "height": self.height, "num_mines": self.num_mines,
+                "games": self.num_games, "wins": self.num_wins, "win_rate": self.num_wins / num_games,
+                "clicks_per_game": self.num_clicks / num_games, "guesses_per_game": self.num_guesses / num_games,
+                "mean_cascade_size": self.num_cascade_fields / max(self.num_cascades, 1),
+                "max_cascade_size": self.max_cascade_size, "ms_per_game": 1000 * self.time / num_games}
+
+
+# returns the seeds for the minefield and for the guesses of the solver of a game. They are different,
+# so that the solver does not guess along the same random sequence the mines were placed with
+def game_seeds(seed, config_index, game_index):
+    game_seed = (seed * 1000003 + config_index) * 1000003 + game_index
+    return 2 * game_seed, 2 * game_seed + 1
+
+
+# plays the games first_game to first_game + num_games - 1 of the configuration with index config_index
+# and returns their SimulationStats. Runs in a worker process
+def play_games(task):
+    class_name, seed, config_index, (width, height, num_mines), first_game, num_games = task
+    cls = GAMEFIELD_CLASSES[class_name]
+    stats = SimulationStats(width, height, num_mines)
+    
+    start = time.perf_counter()
+    for game_index in range(first_game, first_game + num_games):
+        gamefield_seed, solver_seed = game_seeds(seed, config_index, game_index)
+        solver = Solver(cls(width, height, num_mines, seed = gamefield_seed), seed = solver_seed)
+        
+        stats.num_games += 1
+        stats.num_wins += solver.solve()
+        stats.num_clicks += solver.get_num_clicks()
+        stats.num_guesses += solver.get_num_guesses()
+        for cascade_size in solver.get_cascade_sizes():
+            if cascade_size:
+                stats.num_cascades += 1
+                stats.num_cascade_fields += cascade_size
+                stats.max_cascade_size = max(stats.max_cascade_size, cascade_size)
+    stats.time = time.perf_counter() - start
+    
+    return config_index, stats
+
+
+# plays num_games games per configuration in configs (list of (width, height, num_mines)) on a pool
+# of num_workers processes. Yields (config_index, SimulationStats of all games of the configuration
+# finished so far, number of finished games of all configurations) whenever a chunk of games is done
+def simulate(configs, num_games, num_workers = None, seed = 0, chunk_size = DEFAULT_CHUNK_SIZE, class_name = "ArrayGamefield"):
+    tasks = [(class_name, seed, config_index, config, first_game, min(chunk_size, num_games - first_game))
+             for config_index, config in enumerate(configs)
+             for first_game in range(0, num_games, chunk_size)]
+    totals = [SimulationStats(*config) for config in configs]
+    num_finished_games = 0
+    
+    with multiprocessing.Pool(num_workers) as pool:
+        for config_index, stats in pool.imap_unordered(play_games, tasks):
+            totals[config_index].add(stats)
+            num_finished_games += stats.num_games
+            yield config_index, totals[config_index], num_finished_games
+
+
+def _parse_configs(text):
+    configs = []
+    for config in text.split(","):
+        width, height, num_mines = (int(n) for n in config.split("x"))
+        if num_mines >= width * height:
+            raise ValueError("There cannot be more mines than fields: " + config)
+        configs.append((width, height, num_mines))
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Plays many Minesweeper games with the solver in parallel.")
+    parser.add_argument("--configs", default = "9x9x10,16x16x40,30x16x99", help = "comma separated list of WIDTHxHEIGHTxMINES")
+    parser.add_argument("--games", type = int, default = 1000, help = "number of games per configuration")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "number of worker processes")
+    parser.add_argument("--seed", type = int, default = 0, help = "base seed all game seeds are derived from")
+    parser.add_argument("--chunk-size", type = int, default = DEFAULT_CHUNK_SIZE, help = "games per task of a worker")
+    parser.add_argument("--engine", default = "ArrayGamefield", choices = sorted(GAMEFIELD_CLASSES))
+    parser.add_argument("--output", help = "write the final statistics as JSON to this file")
+    args = parser.parse_args()
+    
+    configs = _parse_configs(args.configs)
+    total_games = args.games * len(configs)
+    
+    final_stats = {}
+    start = time.perf_counter()
+    for config_index, stats, num_finished_games in simulate(configs, args.games, args.workers, args.seed, args.chunk_size, args.engine):
+        elapsed = time.perf_counter() - start
+        result = stats.to_dict()
+        print("[%6d/%d, %8.1f games/s] %4dx%-4d %6d mines: %6d games, win rate %.4f, %.1f clicks, %.2f guesses, %.3f ms/game"
+              % (num_finished_games, total_games, num_finished_games / elapsed, stats.width, stats.height, stats.num_mines,
+                 result["games"], result["win_rate"], result["clicks_per_game"], result["guesses_per_game"], result["ms_per_game"]))
+        sys.stdout.flush()
+        final_stats[config_index] = stats
+    elapsed = time.perf_counter() - start
+    
+    print("%d games in %.2f s with %d workers: %.1f games/s" % (total_games, elapsed, args.workers, total_games / elapsed))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"seed": args.seed, "workers": args.workers, "engine": args.engine, "seconds": elapsed,
+                       "games_per_second": total_games / elapsed, "configs": [final_stats[n].to_dict() for n in sorted(final_stats)]}, f, indent = 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+"""
+
+import random
+
+from probability import compute_probabilities
+
+"""
+
+Automatic player for a Gamefield (or ArrayGamefield). Does not need the GUI.
+
+Every opened field with a number gives a constraint: the closed fields around it which are not yet known
+to be mines contain exactly its number minus the known mines around it. The solver applies two
+deterministic rules to these constraints:
+ - single-field rule: a constraint without mines left makes all its fields safe, a constraint with as
+   many mines as fields makes all its fields mines
+ - subset/difference rule: for two overlapping constraints A and B, if B has exactly |B - A| mines more
+   than A, all fields of B - A are mines and all fields of A - B are safe. For a subset A of B with the
+   same number of mines this means that B - A is safe
+If nothing can be deduced, it guesses the field with the lowest estimated mine probability, or with
+exact_probabilities the lowest exact probability from probability.compute_probabilities.
+
+The constraints are kept between moves and updated only for the fields each open_field has opened (see
+Gamefield.get_last_opened_fields) and for new mines; only constraints that changed are examined again.
+Fields are identified by their index i * width + j.
+
+"""
+class Solver:
+    def __init__(self, gamefield, seed = None, exact_probabilities = False):
+        self._gamefield = gamefield
+        self._width = gamefield.width
+        self._height = gamefield.height
+        self._random = random.Random(seed)
+        self._exact_probabilities = exact_probabilities
+        
+        self._unknown = set()           # closed fields which are not known to be mines
+        self._mines = set()             # fields known to be mines, they get flagged
+        self._safe = set()              # closed fields known to be safe, still to be opened
+        self._constraints = {}          # index of an opened number -> [set of unknown fields around it, number of mines among them]
+        self._field_constraints = {}    # index of an unknown field -> set of constraints containing it
+        self._dirty = set()             # constraints which changed since they were examined
+        
+        self._is_finished = False
+        self._is_won = False
+        self._num_clicks = 0            # calls of open_field
+        self._num_guesses = 0           # clicks which were not deduced as safe
+        self._cascade_sizes = []        # number of fields opened by each click
+        
+        # take over fields which have already been opened
+        opened = []
+        for i in range(self._height):
+            for j in range(self._width):
+                if gamefield.is_open(i, j):
+                    opened.append(i * self._width + j)
+                else:
+                    self._unknown.add(i * self._width + j)
+        for k in opened:
+            self._add_constraint(k)
+        self._check_finished()
+    
+    # returns the indices of all neighbors of the field with index k
+    def _neighbors(self, k):
+        width = self._width
+        i, j = divmod(k, width)
+        
+        neighbors = []
+        for di in (-1, 0, 1):
+            if 0 <= i + di < self._height:
+                for dj in (-1, 0, 1):
+                    if (di or dj) and 0 <= j + dj < width:
+                        neighbors.append(k + di * width + dj)
+        
+        return neighbors
+    
+    # adds the constraint of the opened field with index k
+    def _add_constraint(self, k):
+        fields = set()
+        num_mines = self._gamefield.get_num_neighbouring_mines(*divmod(k, self._width))
+        for n in self._neighbors(k):
+            if n in self._unknown:
+                fields.add(n)
+            elif n in self._mines:
+                num_mines -= 1
+        
+        if not fields:
+            return
+        
+        self._constraints[k] = [fields, num_mines]
+        for n in fields:
+            self._field_constraints.setdefault(n, set()).add(k)
+        self._dirty.add(k)
+    
+    # updates the constraints for the field with index k, which has just been opened
+    def _on_field_opened(self, k):
+        self._unknown.discard(k)
+        self._safe.discard(k)
+        
+        for c in self._field_constraints.pop(k, ()):
+            self._constraints[c][0].discard(k)
+            self._dirty.add(c)
+        
+        self._add_constraint(k)
+    
+    # flags the field with index k, which is known to be a mine, and updates the constraints around it
+    def _set_mine(self, k):
+        if k not in self._unknown:
+            return
+        
+        self._unknown.discard(k)
+        self._mines.add(k)
+        self._gamefield.set_flag(*divmod(k, self._width))
+        
+        for c in self._field_constraints.pop(k, ()):
+            constraint = self._constraints[c]
+            constraint[0].discard(k)
+            constraint[1] -= 1
+            self._dirty.add(c)
+    
+    def _set_safe(self, k):
+        if k in self._unknown:
+            self._safe.add(k)
+    
+    # applies the deterministic rules to the constraint of the field with index c
+    def _examine(self, c):
+        constraint = self._constraints.get(c)
+        if constraint is None:
+            return
+        
+        fields, num_mines = constraint
+        if not fields:
+            del self._constraints[c]
+            return
+        
+        # single-field rule
+        if num_mines == 0:
+            for k in fields:
+                self._set_safe(k)
+            return
+        if num_mines == len(fields):
+            for k in list(fields):
+                self._set_mine(k)
+            return
+        
+        # subset/difference rule with all overlapping constraints
+        others = set()
+        for k in fields:
+            others |= self._field_constraints[k]
+        others.discard(c)
+        
+        for other in others:
+            other_fields, other_num_mines = self._constraints[other]
+            only_other = other_fields - fields
+            only_this = fields - other_fields
+            
+            if other_num_mines - num_mines == len(only_other):
+                mines, safe = only_other, only_this
+            elif num_mines - other_num_mines == len(only_this):
+                mines, safe = only_this, only_other
+            else:
+                continue
+            if not mines and not safe:
+                continue
+            
+            for k in safe:
+                self._set_safe(k)
+            for k in mines:
+                self._set_mine(k)
+            return                  # the constraints have changed, continue with the dirty ones
+    
+    # applies rules over the whole board: if no mines are left, every unknown field is safe, and if
+    # there are as many unknown fields as mines left, all of them are mines
+    def _examine_global(self):
+        num_mines_left = self._gamefield.num_mines - len(self._mines)
+        if num_mines_left == 0:
+            for k in self._unknown:
+                self._safe.add(k)
+        elif num_mines_left == len(self._unknown):
+            for k in list(self._unknown):
+                self._set_mine(k)
+    
+    # returns the exact mine probabilities of the fields in constraints and the probability of all
+    # other unknown fields, or None if they are too complex to compute
+    def _compute_exact_probabilities(self):
+        try:
+            return compute_probabilities(self._constraints.values(), len(self._unknown), self._gamefield.num_mines - len(self._mines))
+        except ValueError:
+            return None
+    
+    # returns the unknown field with the lowest mine probability. Without exact_probabilities, or if
+    # they cannot be computed, fields next to opened numbers get the highest mine density of their
+    # constraints and all others the average density of the mines left over the unknown fields
+    def _guess(self):
+        num_mines_left = self._gamefield.num_mines - len(self._mines)
+        default_probability = num_mines_left / len(self._unknown)
+        
+        exact_probabilities = self._compute_exact_probabilities() if self._exact_probabilities else None
+        if exact_probabilities is not None:
+            exact_probabilities, default_probability = exact_probabilities
+            
+        best_probability = 2.0
+        best_fields = []
+        for k in self._unknown:
+            constraints = self._field_constraints.get(k)
+            if exact_probabilities is not None:
+                probability = exact_probabilities.get(k, default_probability)
+            elif constraints:
+                probability = max(self._constraints[c][1] / len(self._constraints[c][0]) for c in constraints)
+            else:
+                probability = default_probability
+            
+            if probability < best_probability:
+                best_probability = probability
+                best_fields = [k]
+            elif probability == best_probability:
+                best_fields.append(k)
+        
+        return self._random.choice(sorted(best_fields))
+    
+    # opens the field with index k. Returns False if it was a mine
+    def _open(self, k):
+        self._num_clicks += 1
+        if not self._gamefield.open_field(*divmod(k, self._width)):
+            self._is_finished = True
+            return False
+        
+        width = self._width
+        opened = self._gamefield.get_last_opened_fields()
+        self._cascade_sizes.append(len(opened))
+        for i, j in opened:
+            self._on_field_opened(i * width + j)
+        
+        self._check_finished()
+        return True
+    
+    # if all safe fields are open, flags the remaining mines and finishes the game
+    def _check_finished(self):
+        gamefield = self._gamefield
+        if gamefield.get_num_closed_safe_fields() == 0:
+            for k in list(self._unknown):
+                self._set_mine(k)
+            self._is_finished = True
+            self._is_won = gamefield.is_game_won()
+    
+    # returns a field known to be safe, applying the rules to the changed constraints and to the whole
+    # board until one is found, or None if nothing can be deduced
+    def _find_safe(self):
+        while not self._safe and self._dirty:
+            self._examine(self._dirty.pop())
+        if not self._safe:
+            self._examine_global()
+        
+        return self._safe.pop() if self._safe else None
+    
+    # makes one move: opens a field known to be safe or, if there is none, guesses a field.
+    # Returns False if the game is over
+    def step(self):
+        if self._is_finished:
+            return False
+        
+        k = self._find_safe()
+        if k is None:
+            k = self._guess()
+            self._num_guesses += 1
+        
+        self._open(k)
+        return not self._is_finished
+    
+    # plays until the game is over. Returns True if the game has been won
+    def solve(self):
+        while self.step():
+            pass
+        
+        return self._is_won
+    
+    # plays until the game is over or a guess would be needed. Returns True if the game has been won,
+    # i.e. if the minefield can be solved from the fields opened so far without guessing
+    def solve_without_guessing(self):
+        while not self._is_finished:
+            k = self._find_safe()
+            if k is None:
+                return False
+            self._open(k)
+        
+        return self._is_won
+    
+    def is_finished(self):
+        return self._is_finished
+    
+    def is_won(self):
+        return self._is_won
+    
+    def get_num_clicks(self):
+        return self._num_clicks
+    
+    def get_num_guesses(self):
+        return self._num_guesses
+    
+    # number of fields opened by each click
+    def get_cascade_sizes(self):
+        return self._cascade_sizes
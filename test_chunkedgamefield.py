@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of chunkedgamefield.py, run with pytest. A ChunkedGamefield must behave like an ArrayGamefield with
+the same states, also when only one chunk fits into memory and the others are compressed on the way.
+"""
+
+import pytest
+
+from chunkedgamefield import ChunkedGamefield
+from gamefield import ArrayGamefield
+
+WIDTH = 120
+HEIGHT = 90
+NUM_MINES = 300
+CHUNK_SIZE = 16
+
+
+def _counters(gamefield):
+    return (gamefield.get_num_opened_fields(), gamefield.get_num_flagged_fields(), gamefield.get_num_correct_flags(),
+            gamefield.get_num_closed_safe_fields(), gamefield.get_num_opened_fields_by_number())
+
+
+# returns a minefield with room for a single uncompressed chunk, and one with room for all of them
+def _pair(seed):
+    return (ChunkedGamefield(WIDTH, HEIGHT, NUM_MINES, seed, chunk_size = CHUNK_SIZE, memory_budget = CHUNK_SIZE * CHUNK_SIZE),
+            ChunkedGamefield(WIDTH, HEIGHT, NUM_MINES, seed, chunk_size = CHUNK_SIZE))
+
+
+# returns the field with zero neighbouring mines closest to the middle of the minefield
+def _find_free_field(gamefield):
+    return min(((i, j) for i in range(gamefield.height) for j in range(gamefield.width)
+                if not gamefield.is_mine(i, j) and gamefield.get_num_neighbouring_mines(i, j) == 0),
+               key = lambda field: abs(field[0] - gamefield.height // 2) + abs(field[1] - gamefield.width // 2))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_cascade_across_chunks(seed):
+    small, large = _pair(seed)
+    array_gamefield = ArrayGamefield(WIDTH, HEIGHT, NUM_MINES, 0)
+    array_gamefield.set_state(WIDTH, HEIGHT, NUM_MINES, seed, large.get_states())
+    field = _find_free_field(large)
+    
+    for g in (small, large, array_gamefield):
+        assert g.open_field(*field)
+    
+    opened = sorted(large.get_last_opened_fields())
+    assert sorted(small.get_last_opened_fields()) == opened
+    assert sorted(array_gamefield.get_last_opened_fields()) == opened
+    assert len({(i // CHUNK_SIZE, j // CHUNK_SIZE) for i, j in opened}) > 1
+    
+    assert small.get_num_chunks()[0] == 1
+    assert small.get_num_chunks()[1] > 0
+    assert small.get_states() == large.get_states() == array_gamefield.get_states()
+    assert _counters(small) == _counters(large) == _counters(array_gamefield)
+
+
+def test_chord_across_chunks():
+    small, large = _pair(4)
+    field = _find_free_field(large)
+    for g in (small, large):
+        g.open_field(*field)
+        for i in range(HEIGHT):
+            for j in range(WIDTH):
+                if g.is_mine(i, j) and any(g.is_open(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                                           if 0 <= i + di < HEIGHT and 0 <= j + dj < WIDTH):
+                    g.set_flag(i, j)
+        for i in range(HEIGHT):
+            for j in range(WIDTH):
+                if g.is_open(i, j):
+                    assert g.chord_field(i, j)
+    
+    assert small.get_states() == large.get_states()
+    assert _counters(small) == _counters(large)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_set_state(seed):
+    small, large = _pair(seed)
+    field = _find_free_field(large)
+    large.open_field(*field)
+    large.set_flag(0, 0)
+    large.set_flag(HEIGHT - 1, WIDTH - 1)
+    states = large.get_states()
+    
+    small.reset(seed + 10)
+    small.set_state(WIDTH, HEIGHT, NUM_MINES, seed, states)
+    
+    assert small.get_states() == states
+    assert _counters(small) == _counters(large)
+    for i in range(0, HEIGHT, 7):
+        for j in range(WIDTH):
+            assert small.get_num_neighbouring_mines(i, j) == large.get_num_neighbouring_mines(i, j)
+    
+    small.open_field(HEIGHT - 1, 0)
+    large.open_field(HEIGHT - 1, 0)
+    assert small.get_states() == large.get_states()
+
+
+def test_set_state_needs_mines():
+    g = ChunkedGamefield(WIDTH, HEIGHT, NUM_MINES, 1, chunk_size = CHUNK_SIZE)
+    
+    with pytest.raises(ValueError):
+        g.set_state(WIDTH, HEIGHT, NUM_MINES, 1, bytearray(WIDTH * HEIGHT))
+    with pytest.raises(ValueError):
+        g.set_state(WIDTH, HEIGHT, NUM_MINES, 1, bytearray(b"\x01") * (WIDTH * HEIGHT))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of gameclock.py, run with pytest. The time is read from a fake clock which the tests advance.
+"""
+
+from gameclock import GameClock
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_new_clock_is_paused():
+    fake_clock = _FakeClock()
+    clock = GameClock(clock = fake_clock)
+    fake_clock.now += 5.0
+    
+    assert not clock.is_running()
+    assert clock.elapsed() == 0.0
+
+
+def test_pause_and_resume():
+    fake_clock = _FakeClock()
+    clock = GameClock(clock = fake_clock)
+    
+    clock.resume()
+    fake_clock.now += 1.5
+    assert clock.is_running()
+    assert clock.elapsed() == 1.5
+    
+    clock.pause()
+    fake_clock.now += 10.0
+    assert not clock.is_running()
+    assert clock.elapsed() == 1.5
+    
+    clock.resume()
+    fake_clock.now += 0.25
+    assert clock.elapsed() == 1.75
+    assert clock.elapsed_ms() == 1750
+
+
+def test_resume_and_pause_twice():
+    fake_clock = _FakeClock()
+    clock = GameClock(clock = fake_clock)
+    
+    clock.resume()
+    fake_clock.now += 1.0
+    clock.resume()
+    fake_clock.now += 1.0
+    assert clock.elapsed() == 2.0
+    
+    clock.pause()
+    fake_clock.now += 1.0
+    clock.pause()
+    assert clock.elapsed() == 2.0
+
+
+def test_reset():
+    fake_clock = _FakeClock()
+    clock = GameClock(3.0, clock = fake_clock)
+    assert clock.elapsed() == 3.0
+    
+    clock.resume()
+    fake_clock.now += 2.0
+    clock.reset(42.5)
+    fake_clock.now += 2.0
+    assert not clock.is_running()
+    assert clock.elapsed() == 42.5
+    
+    clock.reset()
+    clock.resume()
+    fake_clock.now += 0.0015
+    assert clock.elapsed_ms() == 1
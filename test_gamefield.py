@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of gamefield.py, run with pytest. Gamefield and ArrayGamefield are played side by side and must
+give the same minefields, counters and opened fields for every move.
+"""
+
+import random
+
+import pytest
+
+import gamefield as gamefield_module
+from gamefield import ArrayGamefield, Gamefield, count_neighbouring_mines, FIRST_CLICK_ANY, FIRST_CLICK_NO_GUESS, \
+    FIRST_CLICK_SAFE, FIRST_CLICK_SAFE_AREA
+from noguess import find_no_guess_seed
+from solver import Solver
+
+FIRST_CLICKS = [FIRST_CLICK_ANY, FIRST_CLICK_SAFE, FIRST_CLICK_SAFE_AREA, FIRST_CLICK_NO_GUESS]
+
+
+def _pair(width, height, num_mines, seed, first_click = FIRST_CLICK_ANY):
+    return Gamefield(width, height, num_mines, seed, first_click), ArrayGamefield(width, height, num_mines, seed, first_click)
+
+
+def _counters(gamefield):
+    return (gamefield.get_num_opened_fields(), gamefield.get_num_flagged_fields(), gamefield.get_num_correct_flags(),
+            gamefield.get_num_closed_safe_fields(), gamefield.get_num_opened_fields_by_number(), gamefield.is_game_won())
+
+
+def _assert_same(gamefield, array_gamefield):
+    assert array_gamefield.get_states() == gamefield.get_states()
+    assert _counters(array_gamefield) == _counters(gamefield)
+    assert sorted(array_gamefield.get_last_opened_fields()) == sorted(gamefield.get_last_opened_fields())
+    assert array_gamefield.get_num_last_opened_fields() == gamefield.get_num_last_opened_fields()
+
+
+def _neighbors(gamefield, i, j):
+    return [(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+            if (di or dj) and 0 <= i + di < gamefield.height and 0 <= j + dj < gamefield.width]
+
+
+# plays num_moves random moves of the given actions on both minefields and compares them after each
+def _play_random_moves(gamefield, array_gamefield, seed, actions, num_moves = 300):
+    rand = random.Random(seed)
+    
+    for _ in range(num_moves):
+        i = rand.randrange(gamefield.height)
+        j = rand.randrange(gamefield.width)
+        action = rand.choice(actions)
+        if action == "open" and (gamefield.is_flagged(i, j) or gamefield.is_mine(i, j) and gamefield.are_mines_placed()):
+            continue
+        
+        results = []
+        for g in (gamefield, array_gamefield):
+            if action == "open":
+                results.append(g.open_field(i, j))
+            elif action == "flag":
+                results.append(g.set_flag(i, j))
+            elif action == "unflag":
+                results.append(g.remove_flag(i, j))
+            else:
+                results.append(g.chord_field(i, j))
+        assert results[0] == results[1]
+        if action in ("open", "chord"):
+            _assert_same(gamefield, array_gamefield)
+        else:
+            assert array_gamefield.get_states() == gamefield.get_states()
+            assert _counters(array_gamefield) == _counters(gamefield)
+
+
+def test_same_minefield():
+    gamefield, array_gamefield = _pair(16, 9, 30, 11)
+    _assert_same(gamefield, array_gamefield)
+    
+    for cls in (Gamefield, ArrayGamefield):
+        other = cls(16, 9, 30, 12)
+        assert other.get_states() != gamefield.get_states()
+        other.reset(11)
+        assert other.get_states() == gamefield.get_states()
+    
+    for i in range(9):
+        for j in range(16):
+            assert array_gamefield.get_num_neighbouring_mines(i, j) == gamefield.get_num_neighbouring_mines(i, j)
+            assert array_gamefield.get_num_neighbouring_mines(i, j) == sum(gamefield.is_mine(*n) for n in _neighbors(gamefield, i, j))
+
+
+def test_count_neighbouring_mines():
+    width, height = 13, 7
+    rand = random.Random(1)
+    mines = bytearray(rand.random() < 0.3 for _ in range(width * height))
+    
+    counts = count_neighbouring_mines(mines, width, height)
+    
+    for i in range(height):
+        for j in range(width):
+            expected = sum(mines[(i + di) * width + j + dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                           if (di or dj) and 0 <= i + di < height and 0 <= j + dj < width)
+            assert counts[i * width + j] == expected
+
+
+# the mines are placed in bands of rows; bands of one or two rows must give the same minefield as one band
+@pytest.mark.parametrize("band_fields", [1, 20, 50])
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_mines_placed_in_bands(monkeypatch, cls, band_fields):
+    states = cls(17, 11, 60, 3).get_states()
+    
+    monkeypatch.setattr(gamefield_module, "BAND_FIELDS", band_fields)
+    g = cls(17, 11, 60, 3)
+    assert g.get_states() == states
+    assert g.num_mines == sum(g.is_mine(i, j) for i in range(11) for j in range(17)) == 60
+    for i in range(11):
+        for j in range(17):
+            assert g.get_num_neighbouring_mines(i, j) == sum(g.is_mine(*n) for n in _neighbors(g, i, j))
+    
+    g.reset(4)
+    g.set_state(17, 11, 60, 3, states)
+    assert g.get_states() == states
+    assert g.get_num_neighbouring_mines(5, 5) == sum(g.is_mine(*n) for n in _neighbors(g, 5, 5))
+
+
+# the progress is reported once per band while the mines are drawn and once per band while they are
+# counted, and an exception raised by it stops placing the mines
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_progress(monkeypatch, cls):
+    monkeypatch.setattr(gamefield_module, "BAND_FIELDS", 40)
+    reports = []
+    g = cls(20, 11, 30, 3, progress = lambda num_done, num_steps: reports.append((num_done, num_steps)))
+    
+    assert reports == [(n, 12) for n in range(1, 13)]
+    assert g.get_states() == cls(20, 11, 30, 3).get_states()
+    
+    def cancel(num_done, num_steps):
+        raise RuntimeError("cancelled")
+    
+    g.set_progress(cancel)
+    with pytest.raises(RuntimeError):
+        g.reset()
+    g.set_progress(None)
+    g.reset(3)
+    assert g.get_states() == cls(20, 11, 30, 3).get_states()
+
+
+@pytest.mark.parametrize("num_mines", [0, 1, 90, 140, 143])
+def test_num_mines(num_mines):
+    for cls in (Gamefield, ArrayGamefield):
+        g = cls(16, 9, num_mines, 5)
+        assert sum(g.is_mine(i, j) for i in range(9) for j in range(16)) == num_mines
+
+
+@pytest.mark.parametrize("first_click", FIRST_CLICKS)
+def test_same_mines_for_first_click(first_click):
+    gamefield, array_gamefield = _pair(16, 9, 30, 11, first_click)
+    _assert_same(gamefield, array_gamefield)
+    
+    for g in (gamefield, array_gamefield):
+        g.open_field(4, 7)
+    _assert_same(gamefield, array_gamefield)
+    assert gamefield.get_mine_positions() == array_gamefield.get_mine_positions()
+    assert len(gamefield.get_mine_positions()) == 30
+
+
+@pytest.mark.parametrize("first_click", [FIRST_CLICK_SAFE, FIRST_CLICK_SAFE_AREA])
+def test_first_click_is_safe(first_click):
+    for seed in range(20):
+        for g in _pair(9, 9, 40, seed, first_click):
+            assert not g.are_mines_placed()
+            assert g.open_field(0, 4)
+            assert g.are_mines_placed()
+            if first_click == FIRST_CLICK_SAFE_AREA:
+                assert not any(g.is_mine(i, j) for i, j in _neighbors(g, 0, 4))
+
+
+def test_no_guess_minefield():
+    seed, _ = find_no_guess_seed(16, 16, 40, 3)
+    assert seed is not None
+    
+    for g in _pair(16, 16, 40, seed, FIRST_CLICK_NO_GUESS):
+        assert g.are_mines_placed()
+        start = g.get_start_field()
+        assert not any(g.is_mine(i, j) for i, j in _neighbors(g, *start) + [start])
+        g.open_field(*start)
+        assert Solver(g).solve_without_guessing()
+
+
+# without a seed, a minefield with FIRST_CLICK_NO_GUESS would not be checked, so it is refused
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_no_guess_needs_seed(cls):
+    with pytest.raises(ValueError):
+        cls(16, 16, 40, first_click = FIRST_CLICK_NO_GUESS)
+    
+    g = cls(16, 16, 40, 5, FIRST_CLICK_NO_GUESS)
+    states = g.get_states()
+    with pytest.raises(ValueError):
+        g.reset()
+    with pytest.raises(ValueError):
+        g.configure(9, 9, 10)
+    with pytest.raises(ValueError):
+        g.width = 9
+    assert (g.width, g.height, g.num_mines, g.seed) == (16, 16, 40, 5)
+    assert g.get_states() == states
+    
+    g.configure(9, 9, 10, 6)
+    assert g.are_mines_placed()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_moves(seed):
+    gamefield, array_gamefield = _pair(20, 12, 35, seed)
+    _play_random_moves(gamefield, array_gamefield, seed, ["open", "flag", "flag", "unflag"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_moves_with_chord(seed):
+    gamefield, array_gamefield = _pair(20, 12, 35, seed, FIRST_CLICK_SAFE_AREA)
+    _play_random_moves(gamefield, array_gamefield, seed, ["open", "flag", "flag", "unflag", "chord"])
+
+
+# flags the mines around the first open field with a number and chords it, once with correct flags and
+# once with a wrong flag instead of one of the mines
+@pytest.mark.parametrize("is_flag_wrong", [False, True])
+def test_chord(is_flag_wrong):
+    gamefield, array_gamefield = _pair(16, 16, 40, 7, FIRST_CLICK_SAFE_AREA)
+    for g in (gamefield, array_gamefield):
+        g.open_field(8, 8)
+    
+    i, j = next((i, j) for i in range(16) for j in range(16) if gamefield.is_open(i, j)
+                and gamefield.get_num_neighbouring_mines(i, j)
+                and any(not gamefield.is_open(*n) and not gamefield.is_mine(*n) for n in _neighbors(gamefield, i, j)))
+    mines = [n for n in _neighbors(gamefield, i, j) if gamefield.is_mine(*n)]
+    flags = list(mines)
+    if is_flag_wrong:
+        flags[0] = next(n for n in _neighbors(gamefield, i, j) if not gamefield.is_open(*n) and not gamefield.is_mine(*n))
+    
+    for g in (gamefield, array_gamefield):
+        for n in flags:
+            g.set_flag(*n)
+        assert g.chord_field(i, j) != is_flag_wrong
+    _assert_same(gamefield, array_gamefield)
+    
+    assert gamefield.get_num_last_opened_fields() > 0
+    for n in _neighbors(gamefield, i, j):
+        assert gamefield.is_open(*n) or gamefield.is_flagged(*n) or gamefield.is_mine(*n)
+
+
+def test_chord_needs_all_flags():
+    gamefield, array_gamefield = _pair(16, 16, 40, 7, FIRST_CLICK_SAFE_AREA)
+    for g in (gamefield, array_gamefield):
+        g.open_field(8, 8)
+        states = g.get_states()
+        for i in range(16):
+            for j in range(16):
+                assert g.chord_field(i, j)
+        assert g.get_states() == states
+
+
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_configure(cls):
+    g = cls(10, 10, 10, 1)
+    g.configure(30, 16, 99, 5)
+    
+    assert (g.width, g.height, g.num_mines, g.seed) == (30, 16, 99, 5)
+    assert len(g.get_mine_positions()) == 99
+    assert g.get_states() == cls(30, 16, 99, 5).get_states()
+    
+    with pytest.raises(ValueError):
+        g.configure(3, 3, 9)
+    assert (g.width, g.height, g.num_mines) == (30, 16, 99)
+
+
+# the storage of the fields is reused as far as it reaches, and the minefields stay the same as new ones
+def test_storage_is_reused():
+    array_gamefield = ArrayGamefield(30, 16, 99, 1)
+    cells = array_gamefield._cells
+    for width, height, num_mines in [(30, 16, 99), (9, 9, 10), (16, 16, 40), (40, 20, 150)]:
+        array_gamefield.configure(width, height, num_mines, 2)
+        assert array_gamefield._cells is cells
+        assert array_gamefield.get_states() == ArrayGamefield(width, height, num_mines, 2).get_states()
+    
+    gamefield = Gamefield(16, 16, 40, 1)
+    fields = {id(field) for row in gamefield._field for field in row}
+    gamefield.open_field(3, 3)
+    gamefield.configure(12, 20, 30, 2)
+    assert {id(field) for row in gamefield._field for field in row} <= fields
+    assert gamefield.get_states() == Gamefield(12, 20, 30, 2).get_states()
+    assert [[field.coordinates for field in row] for row in gamefield._field] == [[(i, j) for j in range(12)] for i in range(20)]
+    for i, j in [(0, 0), (5, 11), (19, 6)]:
+        assert sorted(n.coordinates for n in gamefield.get_field(i, j).neighbors) == sorted(_neighbors(gamefield, i, j))
+        assert gamefield.get_num_neighbouring_mines(i, j) == sum(gamefield.is_mine(*n) for n in _neighbors(gamefield, i, j))
+
+
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_snapshot_and_restore(cls):
+    g = cls(12, 10, 20, 4)
+    g.open_field(5, 5)
+    g.set_flag(0, 0)
+    snapshot = g.snapshot()
+    states = g.get_states()
+    counters = _counters(g)
+    
+    g.reset(9)
+    g.restore(snapshot)
+    
+    assert g.get_states() == states
+    assert _counters(g) == counters
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of movelog.py, run with pytest
+"""
+
+import random
+
+import pytest
+
+from gamefield import ArrayGamefield, Gamefield, FIRST_CLICK_ANY, FIRST_CLICK_SAFE_AREA
+from movelog import MoveLog, apply_move, replay
+
+
+# plays num_moves random moves on gamefield, which is recorded into a log at path
+def _play(gamefield, path, num_moves = 200):
+    log = MoveLog.record(gamefield, path)
+    rand = random.Random(gamefield.seed)
+    for _ in range(num_moves):
+        i = rand.randrange(gamefield.height)
+        j = rand.randrange(gamefield.width)
+        move = rand.choice([gamefield.open_field, gamefield.set_flag, gamefield.remove_flag, gamefield.chord_field])
+        if move == gamefield.open_field and gamefield.is_mine(i, j) and gamefield.are_mines_placed():
+            continue
+        move(i, j)
+    log.close()
+    return log
+
+
+@pytest.mark.parametrize("first_click", [FIRST_CLICK_ANY, FIRST_CLICK_SAFE_AREA])
+@pytest.mark.parametrize("gamefield_class", [Gamefield, ArrayGamefield])
+def test_replay(tmp_path, first_click, gamefield_class):
+    gamefield = ArrayGamefield(24, 14, 50, 8, first_click)
+    path = tmp_path / "game.log"
+    log = _play(gamefield, path)
+    
+    read_log = MoveLog.read(path)
+    assert read_log.moves == [(float("%.6f" % t), action, i, j) for t, action, i, j in log.moves]
+    assert (read_log.width, read_log.height, read_log.num_mines, read_log.seed, read_log.first_click) == (24, 14, 50, 8, first_click)
+    
+    replayed = replay(read_log, gamefield_class = gamefield_class)
+    assert replayed.get_states() == gamefield.get_states()
+    assert replayed.get_num_opened_fields() == gamefield.get_num_opened_fields()
+    assert replayed.get_num_correct_flags() == gamefield.get_num_correct_flags()
+
+
+def test_replay_is_deterministic(tmp_path):
+    log = _play(ArrayGamefield(24, 14, 50, 3, FIRST_CLICK_SAFE_AREA), tmp_path / "game.log")
+    
+    first = replay(log, 120)
+    second = replay(log, 120)
+    
+    assert first.get_states() == second.get_states()
+    
+    stepped = replay(log, 100)
+    for move in log.moves[100:120]:
+        apply_move(stepped, move)
+    assert stepped.get_states() == first.get_states()
+
+
+def test_read_ignores_cut_off_line(tmp_path):
+    path = tmp_path / "game.log"
+    log = _play(ArrayGamefield(10, 10, 10, 1), path, 20)
+    with open(path, "a") as f:
+        f.write("12.5 o 3")
+    
+    assert len(MoveLog.read(path).moves) == len(log.moves)
+
+
+def test_read_invalid_log(tmp_path):
+    path = tmp_path / "game.log"
+    _play(ArrayGamefield(10, 10, 10, 1), path, 5)
+    with open(path, "a") as f:
+        f.write("12.5 x 3 4\n")
+    
+    with pytest.raises(ValueError):
+        MoveLog.read(path)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of probability.py, run with pytest. The exact probabilities are compared with the fractions of all
+distributions of the mines over the closed fields which fit the opened numbers, found by enumerating them.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from gamefield import ArrayGamefield, FIRST_CLICK_SAFE_AREA
+from probability import compute_probabilities, get_mine_probabilities
+
+
+def _neighbors(gamefield, i, j):
+    return [(i + di, j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+            if (di or dj) and 0 <= i + di < gamefield.height and 0 <= j + dj < gamefield.width]
+
+
+# returns the probabilities of the closed fields of gamefield by enumerating all distributions of the
+# mines (and of the mines not flagged, if flags are trusted)
+def _enumerate_probabilities(gamefield, trust_flags = False):
+    fields = [(i, j) for i in range(gamefield.height) for j in range(gamefield.width)]
+    flagged = {field for field in fields if trust_flags and gamefield.is_flagged(*field)}
+    closed = [field for field in fields if not gamefield.is_open(*field) and field not in flagged]
+    opened = [field for field in fields if gamefield.is_open(*field)]
+    
+    num_solutions = 0
+    num_mines = dict.fromkeys(closed, 0)
+    for mines in itertools.combinations(closed, gamefield.num_mines - len(flagged)):
+        mines = set(mines) | flagged
+        if all(sum(n in mines for n in _neighbors(gamefield, *field)) == gamefield.get_num_neighbouring_mines(*field)
+               for field in opened):
+            num_solutions += 1
+            for field in mines - flagged:
+                num_mines[field] += 1
+    
+    return {field: count / num_solutions for field, count in num_mines.items()}
+
+
+# opens the start field and then num_moves random safe fields
+def _play(seed, num_moves, width = 6, height = 4, num_mines = 6):
+    g = ArrayGamefield(width, height, num_mines, seed, FIRST_CLICK_SAFE_AREA)
+    g.open_field(height // 2, width // 2)
+    rand = random.Random(seed)
+    for _ in range(num_moves):
+        safe = [(i, j) for i in range(height) for j in range(width) if not g.is_open(i, j) and not g.is_mine(i, j)]
+        if not safe:
+            break
+        g.open_field(*rand.choice(safe))
+    return g
+
+
+@pytest.mark.parametrize("num_moves", [0, 1, 3])
+@pytest.mark.parametrize("seed", range(8))
+def test_same_as_enumeration(seed, num_moves):
+    g = _play(seed, num_moves)
+    if g.is_game_won():
+        return
+    
+    probabilities = get_mine_probabilities(g)
+    expected = _enumerate_probabilities(g)
+    
+    assert probabilities.keys() == expected.keys()
+    for field, probability in expected.items():
+        assert probabilities[field] == pytest.approx(probability, abs = 1e-9)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_same_as_enumeration_with_flags(seed):
+    g = _play(seed, 1)
+    mines = [(i, j) for i in range(g.height) for j in range(g.width) if g.is_mine(i, j)]
+    g.set_flag(*mines[0])
+    
+    probabilities = get_mine_probabilities(g, trust_flags = True)
+    expected = _enumerate_probabilities(g, trust_flags = True)
+    
+    assert probabilities.keys() == expected.keys()
+    for field, probability in expected.items():
+        assert probabilities[field] == pytest.approx(probability, abs = 1e-9)
+
+
+def test_compute_probabilities():
+    # a and b share one mine, c and d are in no constraint and share the other mine
+    probabilities, interior_probability = compute_probabilities([(["a", "b"], 1)], 4, 2)
+    
+    assert probabilities == pytest.approx({"a": 0.5, "b": 0.5})
+    assert interior_probability == pytest.approx(0.5)
+    
+    # the 1-2-1 pattern forces both outer fields to be mines and the middle one to be safe
+    probabilities, interior_probability = compute_probabilities([(["a", "b"], 1), (["a", "b", "c"], 2), (["b", "c"], 1)], 3, 2)
+    
+    assert probabilities == {"a": 1, "b": 0, "c": 1}
+
+
+def test_contradiction():
+    with pytest.raises(ValueError):
+        compute_probabilities([(["a", "b"], 2), (["b"], 0)], 2, 2)
+    with pytest.raises(ValueError):
+        compute_probabilities([(["a", "b"], 1)], 3, 3)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of savegame.py, run with pytest
+"""
+
+import pytest
+
+import savegame
+from chunkedgamefield import ChunkedGamefield
+from gamefield import ArrayGamefield, Gamefield, FIRST_CLICK_SAFE
+
+
+def _played_gamefield(gamefield_class = ArrayGamefield):
+    gamefield = gamefield_class(17, 11, 30, 5, FIRST_CLICK_SAFE)
+    gamefield.open_field(5, 8)
+    gamefield.set_flag(0, 0)
+    gamefield.set_flag(10, 16)
+    return gamefield
+
+
+def _assert_same_state(gamefield, other):
+    assert (other.width, other.height, other.num_mines, other.seed, other.first_click) == \
+           (gamefield.width, gamefield.height, gamefield.num_mines, gamefield.seed, gamefield.first_click)
+    assert other.get_states() == gamefield.get_states()
+    assert other.get_num_opened_fields() == gamefield.get_num_opened_fields()
+    assert other.get_num_flagged_fields() == gamefield.get_num_flagged_fields()
+    assert other.get_num_correct_flags() == gamefield.get_num_correct_flags()
+
+
+@pytest.mark.parametrize("num_fields", [1, 7, 8, 9, 63, 64, 65, 1000])
+def test_pack_states_round_trip(num_fields):
+    states = bytes((k * 5 + k // 3) % 8 for k in range(num_fields))
+    bitmaps = savegame.pack_states(states)
+    
+    assert [len(bitmap) for bitmap in bitmaps] == [(num_fields + 7) // 8] * 3
+    assert savegame.unpack_states(bitmaps, num_fields) == states
+
+
+@pytest.mark.parametrize("gamefield_class", [Gamefield, ArrayGamefield])
+def test_save_and_load(tmp_path, gamefield_class):
+    gamefield = _played_gamefield(gamefield_class)
+    path = tmp_path / "game.msw"
+    savegame.save(path, gamefield, 12.5)
+    
+    loaded, elapsed_time = savegame.load(path)
+    
+    assert elapsed_time == 12.5
+    _assert_same_state(gamefield, loaded)
+
+
+def test_load_into_gamefield(tmp_path):
+    gamefield = _played_gamefield()
+    path = tmp_path / "game.msw"
+    savegame.save(path, gamefield)
+    
+    other = Gamefield(3, 3, 1)
+    assert savegame.load(path, other)[0] is other
+    _assert_same_state(gamefield, other)
+
+
+# offsets of the number of mines and of the number of opened fields in the header
+@pytest.mark.parametrize("offset", [16, 36])
+def test_load_corrupt_file(tmp_path, offset):
+    data = bytearray(savegame.to_bytes(_played_gamefield()))
+    data[offset] += 1
+    path = tmp_path / "corrupt.msw"
+    path.write_bytes(data)
+    
+    with pytest.raises(ValueError):
+        savegame.load(path)
+
+
+def test_load_truncated_file(tmp_path):
+    path = tmp_path / "truncated.msw"
+    path.write_bytes(savegame.to_bytes(_played_gamefield())[:-1])
+    
+    with pytest.raises(ValueError):
+        savegame.load(path)
+
+
+def test_chunked_gamefield_is_rejected():
+    gamefield = ChunkedGamefield(100, 100, 500, 1)
+    data = savegame.to_bytes(_played_gamefield())
+    
+    with pytest.raises(TypeError):
+        savegame.to_bytes(gamefield)
+    with pytest.raises(TypeError):
+        savegame.from_bytes(data, gamefield)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of simulate.py, run with pytest. The results of the games only depend on the seeds, not on the
+class of the minefield, the chunks of games or the number of workers.
+"""
+
+import pytest
+
+from simulate import play_games, simulate, SimulationStats
+
+CONFIG = (9, 9, 10)
+
+
+# returns the results of stats without the time, which differs between runs
+def _results(stats):
+    results = stats.to_dict()
+    del results["ms_per_game"]
+    return results
+
+
+def test_same_seeds_same_results():
+    config_index, stats = play_games(("ArrayGamefield", 3, 0, CONFIG, 0, 40))
+    _, other_stats = play_games(("ArrayGamefield", 3, 0, CONFIG, 0, 40))
+    
+    assert config_index == 0
+    assert stats.num_games == 40
+    assert _results(other_stats) == _results(stats)
+    
+    _, other_seed_stats = play_games(("ArrayGamefield", 4, 0, CONFIG, 0, 40))
+    assert _results(other_seed_stats) != _results(stats)
+
+
+def test_same_results_for_both_classes():
+    _, stats = play_games(("ArrayGamefield", 5, 0, CONFIG, 0, 30))
+    _, other_stats = play_games(("Gamefield", 5, 0, CONFIG, 0, 30))
+    
+    assert _results(other_stats) == _results(stats)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 40])
+def test_same_results_for_chunks(chunk_size):
+    _, stats = play_games(("ArrayGamefield", 1, 0, CONFIG, 0, 40))
+    
+    totals = SimulationStats(*CONFIG)
+    for first_game in range(0, 40, chunk_size):
+        totals.add(play_games(("ArrayGamefield", 1, 0, CONFIG, first_game, min(chunk_size, 40 - first_game)))[1])
+    assert _results(totals) == _results(stats)
+    
+    *_, (config_index, pool_totals, num_finished_games) = simulate([CONFIG], 40, num_workers = 2, seed = 1, chunk_size = chunk_size)
+    assert config_index == 0
+    assert num_finished_games == 40
+    assert _results(pool_totals) == _results(stats)
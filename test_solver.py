@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026
+
+Tests of solver.py, run with pytest. The solver must never flag a safe field and, as long as it does not
+guess, never open a mine.
+"""
+
+import pytest
+
+from gamefield import ArrayGamefield, Gamefield, FIRST_CLICK_SAFE_AREA
+from solver import Solver
+
+
+# asserts that every flagged field is a mine and that no mine is open
+def _assert_consistent(gamefield):
+    for i in range(gamefield.height):
+        for j in range(gamefield.width):
+            if gamefield.is_flagged(i, j):
+                assert gamefield.is_mine(i, j)
+            if gamefield.is_open(i, j):
+                assert not gamefield.is_mine(i, j)
+
+
+# the 1-2-1 pattern: the subset rule finds both mines below the ones and the safe field below the two
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+def test_one_two_one(cls):
+    g = cls(3, 2, 1, 0)
+    g.set_state(3, 2, 2, 0, bytearray([2, 2, 2, 1, 0, 1]))
+    solver = Solver(g)
+    
+    assert solver.solve_without_guessing()
+    assert solver.get_num_guesses() == 0
+    assert g.is_open(1, 1)
+    assert g.is_flagged(1, 0) and g.is_flagged(1, 2)
+    _assert_consistent(g)
+
+
+# without guessing the solver only opens fields it has deduced as safe, so it never hits a mine
+@pytest.mark.parametrize("cls", [Gamefield, ArrayGamefield])
+@pytest.mark.parametrize("seed", range(30))
+def test_solve_without_guessing(cls, seed):
+    g = cls(16, 16, 40, seed, FIRST_CLICK_SAFE_AREA)
+    g.open_field(8, 8)
+    solver = Solver(g)
+    
+    is_won = solver.solve_without_guessing()
+    
+    assert solver.get_num_guesses() == 0
+    assert is_won == g.is_game_won()
+    assert is_won or not solver.is_finished()
+    _assert_consistent(g)
+
+
+# guesses may hit a mine, but flags are only set on deduced mines
+@pytest.mark.parametrize("seed", range(30))
+def test_solve_never_flags_safe_field(seed):
+    g = ArrayGamefield(16, 16, 40, seed)
+    solver = Solver(g, seed = seed)
+    
+    is_won = solver.solve()
+    
+    assert solver.is_finished()
+    assert is_won == g.is_game_won()
+    for i in range(16):
+        for j in range(16):
+            if g.is_flagged(i, j):
+                assert g.is_mine(i, j)
+            if g.is_open(i, j) and g.is_mine(i, j):
+                assert not is_won
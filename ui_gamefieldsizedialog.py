@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'GamefieldsizeDialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(178, 131)
+        Dialog.setModal(True)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.formLayout = QtWidgets.QFormLayout()
+        self.formLayout.setObjectName("formLayout")
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label)
+        self.heightSpinBox = QtWidgets.QSpinBox(Dialog)
+        self.heightSpinBox.setMinimum(10)
+        self.heightSpinBox.setMaximum(1000)
+        self.heightSpinBox.setProperty("value", 20)
+        self.heightSpinBox.setObjectName("heightSpinBox")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.heightSpinBox)
+        self.label_2 = QtWidgets.QLabel(Dialog)
+        self.label_2.setObjectName("label_2")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_2)
+        self.widthSpinBox = QtWidgets.QSpinBox(Dialog)
+        self.widthSpinBox.setMinimum(10)
+        self.widthSpinBox.setMaximum(1000)
+        self.widthSpinBox.setProperty("value", 20)
+        self.widthSpinBox.setObjectName("widthSpinBox")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.widthSpinBox)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setObjectName("label_3")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_3)
+        self.minesSpinBox = QtWidgets.QSpinBox(Dialog)
+        self.minesSpinBox.setMinimum(1)
+        self.minesSpinBox.setMaximum(999999)
+        self.minesSpinBox.setProperty("value", 50)
+        self.minesSpinBox.setObjectName("minesSpinBox")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.minesSpinBox)
+        self.verticalLayout.addLayout(self.formLayout)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem)
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.cancelButton = QtWidgets.QPushButton(Dialog)
+        self.cancelButton.setObjectName("cancelButton")
+        self.horizontalLayout.addWidget(self.cancelButton)
+        self.applyButton = QtWidgets.QPushButton(Dialog)
+        self.applyButton.setObjectName("applyButton")
+        self.horizontalLayout.addWidget(self.applyButton)
+        self.verticalLayout_2.addLayout(self.horizontalLayout)
+        self.verticalLayout.addLayout(self.verticalLayout_2)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Spielfeldgröße"))
+        self.label.setText(_translate("Dialog", "Höhe:"))
+        self.label_2.setText(_translate("Dialog", "Breite:"))
+        self.label_3.setText(_translate("Dialog", "Minen:"))
+        self.cancelButton.setText(_translate("Dialog", "Abbrechen"))
+        self.applyButton.setText(_translate("Dialog", "Anwenden"))
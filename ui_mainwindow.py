@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'MainWindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(781, 611)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setMaximumSize(QtCore.QSize(800, 16777215))
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.leftCounter = Counter(self.centralwidget)
+        self.leftCounter.setObjectName("leftCounter")
+        self.horizontalLayout.addWidget(self.leftCounter)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.smileyButton = QtWidgets.QPushButton(self.centralwidget)
+        self.smileyButton.setMinimumSize(QtCore.QSize(26, 26))
+        self.smileyButton.setMaximumSize(QtCore.QSize(26, 26))
+        self.smileyButton.setText("")
+        self.smileyButton.setIconSize(QtCore.QSize(26, 26))
+        self.smileyButton.setCheckable(False)
+        self.smileyButton.setFlat(False)
+        self.smileyButton.setObjectName("smileyButton")
+        self.horizontalLayout.addWidget(self.smileyButton)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.rightCounter = Counter(self.centralwidget)
+        self.rightCounter.setObjectName("rightCounter")
+        self.horizontalLayout.addWidget(self.rightCounter)
+        self.verticalLayout_3.addLayout(self.horizontalLayout)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout_3.addItem(spacerItem2)
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.layout_minefield = QtWidgets.QGridLayout()
+        self.layout_minefield.setSizeConstraint(QtWidgets.QLayout.SetMinAndMaxSize)
+        self.layout_minefield.setSpacing(0)
+        self.layout_minefield.setObjectName("layout_minefield")
+        self.verticalLayout.addLayout(self.layout_minefield)
+        self.verticalLayout_3.addLayout(self.verticalLayout)
+        self.verticalLayout_2.addLayout(self.verticalLayout_3)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setEnabled(True)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 781, 21))
+        self.menubar.setNativeMenuBar(True)
+        self.menubar.setObjectName("menubar")
+        self.menuTools = QtWidgets.QMenu(self.menubar)
+        self.menuTools.setObjectName("menuTools")
+        MainWindow.setMenuBar(self.menubar)
+        self.actionSolver = QtWidgets.QAction(MainWindow)
+        self.actionSolver.setObjectName("actionSolver")
+        self.actionm = QtWidgets.QAction(MainWindow)
+        self.actionm.setObjectName("actionm")
+        self.actionClose = QtWidgets.QAction(MainWindow)
+        self.actionClose.setObjectName("actionClose")
+        self.actionGamefieldsize = QtWidgets.QAction(MainWindow)
+        self.actionGamefieldsize.setObjectName("actionGamefieldsize")
+        self.actionNoGuess = QtWidgets.QAction(MainWindow)
+        self.actionNoGuess.setCheckable(True)
+        self.actionNoGuess.setObjectName("actionNoGuess")
+        self.actionSave = QtWidgets.QAction(MainWindow)
+        self.actionSave.setObjectName("actionSave")
+        self.actionLoad = QtWidgets.QAction(MainWindow)
+        self.actionLoad.setObjectName("actionLoad")
+        self.actionSaveMoves = QtWidgets.QAction(MainWindow)
+        self.actionSaveMoves.setObjectName("actionSaveMoves")
+        self.actionReplay = QtWidgets.QAction(MainWindow)
+        self.actionReplay.setObjectName("actionReplay")
+        self.menuTools.addAction(self.actionGamefieldsize)
+        self.menuTools.addAction(self.actionNoGuess)
+        self.menuTools.addAction(self.actionSave)
+        self.menuTools.addAction(self.actionLoad)
+        self.menuTools.addAction(self.actionSaveMoves)
+        self.menuTools.addAction(self.actionReplay)
+        self.menuTools.addAction(self.actionClose)
+        self.menubar.addAction(self.menuTools.menuAction())
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Minesweeper"))
+        self.menuTools.setTitle(_translate("MainWindow", "Spiel"))
+        self.actionSolver.setText(_translate("MainWindow", "Solver"))
+        self.actionm.setText(_translate("MainWindow", "m"))
+        self.actionClose.setText(_translate("MainWindow", "Beenden"))
+        self.actionGamefieldsize.setText(_translate("MainWindow", "Spielfeldgröße"))
+        self.actionNoGuess.setText(_translate("MainWindow", "Ohne Raten"))
+        self.actionSave.setText(_translate("MainWindow", "Speichern"))
+        self.actionLoad.setText(_translate("MainWindow", "Laden"))
+        self.actionSaveMoves.setText(_translate("MainWindow", "Aufzeichnung speichern"))
+        self.actionReplay.setText(_translate("MainWindow", "Aufzeichnung abspielen"))
+from counter import Counter